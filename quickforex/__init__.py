@@ -1,11 +1,17 @@
+from typing import Any
+
 from quickforex.providers import (
     ProviderBase,
+    AsyncProviderBase,
     ProviderMetadata,
     SettingFieldDescription,
-    ExchangeRateHostProvider,
 )
 from quickforex.errors import QuickForexError
+from quickforex.deadline import DeadlineExceededError
 from quickforex.domain import CurrencyPair, DateRange
+from quickforex.rate_series import RateSeries
+from quickforex.numeric import NumericMode
+from quickforex.planner import CostModel
 from quickforex.api import (
     Api,
     get_latest_rates,
@@ -13,32 +19,77 @@ from quickforex.api import (
     get_historical_rates,
     get_historical_rate,
     get_rates_time_series,
+    get_rates_at,
+    iter_rates_time_series,
+    convert_many,
     get_default_provider_type,
     get_installed_provider,
     install_provider,
     install_provider_with_id,
 )
+from quickforex.async_api import AsyncApi
 
 
 __version__ = "0.1.3"
 
 
+# Imported on first access (see quickforex.providers)
+_LAZY_PROVIDER_EXPORTS = {
+    "ExchangeRateHostProvider",
+    "AsyncExchangeRateHostProvider",
+    "CachingProvider",
+    "SqliteStoreProvider",
+    "BatchingProvider",
+    "RoutingProvider",
+    "DummyProvider",
+    "AsyncDummyProvider",
+}
+
+
 __all__ = [
     "Api",
+    "AsyncApi",
     "get_latest_rates",
     "get_latest_rate",
     "get_historical_rates",
     "get_historical_rate",
     "get_rates_time_series",
+    "get_rates_at",
+    "iter_rates_time_series",
+    "convert_many",
     "get_default_provider_type",
     "get_installed_provider",
     "install_provider",
     "install_provider_with_id",
     "CurrencyPair",
     "DateRange",
+    "RateSeries",
+    "NumericMode",
+    "CostModel",
     "ProviderBase",
+    "AsyncProviderBase",
     "ProviderMetadata",
     "SettingFieldDescription",
     "ExchangeRateHostProvider",
+    "AsyncExchangeRateHostProvider",
+    "CachingProvider",
+    "SqliteStoreProvider",
+    "BatchingProvider",
+    "RoutingProvider",
+    "DummyProvider",
+    "AsyncDummyProvider",
     "QuickForexError",
+    "DeadlineExceededError",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_PROVIDER_EXPORTS:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    import quickforex.providers
+
+    return getattr(quickforex.providers, name)
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
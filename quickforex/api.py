@@ -1,24 +1,36 @@
-from typing import Iterable, Union, Optional, Any, Type
+from typing import Iterable, Iterator, Union, Optional, Any, Type
 from datetime import date
 from decimal import Decimal
+import threading
 
 from quickforex.providers.base import ProviderBase
-from quickforex.providers.exchangerate_host import ExchangeRateHostProvider
 from quickforex.providers.provider_metadata import ProviderMetadata
 from quickforex.providers import factory as providers_factory
-from quickforex.domain import CurrencyPairType, CurrencyPair, DateRange
+from quickforex.deadline import deadline_scope
+from quickforex.domain import CurrencyPairType, CurrencyPair, DateRange, SymbolType
+from quickforex import conversion
+from quickforex import planner
+from quickforex import time_series
 from quickforex.utils import (
     parse_currency_pairs_args,
     parse_currency_pair_args,
     parse_date_range_kwargs,
 )
 
-_DEFAULT_PROVIDER: ProviderBase = ExchangeRateHostProvider
-_INSTALLED_PROVIDER: ProviderBase = _DEFAULT_PROVIDER()
+# The default provider is only created when it is first used
+_INSTALLED_PROVIDER: Optional[ProviderBase] = None
+_INSTALLED_PROVIDER_LOCK = threading.Lock()
 
 
 def _provider() -> ProviderBase:
-    return _INSTALLED_PROVIDER
+    global _INSTALLED_PROVIDER
+    provider = _INSTALLED_PROVIDER
+    if provider is not None:
+        return provider
+    with _INSTALLED_PROVIDER_LOCK:
+        if _INSTALLED_PROVIDER is None:
+            _INSTALLED_PROVIDER = get_default_provider_type()()
+        return _INSTALLED_PROVIDER
 
 
 def _create_provider(**kwargs) -> ProviderBase:
@@ -57,7 +69,9 @@ class Api(object):
         """
         self._provider = _create_provider(**kwargs)
 
-    def get_latest_rate(self, *currency_pair_args: CurrencyPairType) -> Decimal:
+    def get_latest_rate(
+        self, *currency_pair_args: CurrencyPairType, timeout: Optional[float] = None
+    ) -> Decimal:
         """Retrieve the last available rate for the given currency pair
 
         Examples:
@@ -73,14 +87,19 @@ class Api(object):
             - Two str arguments "<domestic>", "<foreign>": "EUR", "USD"
             - Single tuple[str, str] argument ("<domestic>", "<foreign>"): ("EUR", "USD")
             - Single quickforex.CurrencyPair argument: quickforex.CurrencyPair("EUR", "USD")
+        :param timeout: Overall time budget (in seconds) shared by all the requests sent to the provider. A
+            quickforex.DeadlineExceededError is raised when it is exceeded (default: no time limit).
         :return: Last exchange rate for the provided currency pair.
         """
-        return self._provider.get_latest_rate(
-            currency_pair=parse_currency_pair_args(*currency_pair_args)
-        )
+        with deadline_scope(timeout):
+            return self._provider.get_latest_rate(
+                currency_pair=parse_currency_pair_args(*currency_pair_args)
+            )
 
     def get_latest_rates(
-        self, *currency_pairs_args: Union[Iterable[CurrencyPairType], CurrencyPairType]
+        self,
+        *currency_pairs_args: Union[Iterable[CurrencyPairType], CurrencyPairType],
+        timeout: Optional[float] = None
     ) -> dict[CurrencyPair, Decimal]:
         """Retrieve the last available rate for each given currency pair
 
@@ -100,14 +119,20 @@ class Api(object):
             - tuple[str, str] ("<domestic>", "<foreign>"): ("EUR", "USD")
             - quickforex.CurrencyPair: quickforex.CurrencyPair("EUR", "USD")
             - An iterable (list, set) with any of the previous argument type.
+        :param timeout: Overall time budget (in seconds) shared by all the requests sent to the provider. A
+            quickforex.DeadlineExceededError is raised when it is exceeded (default: no time limit).
         :return: Last exchange rate for each provided currency pair.
         """
-        return self._provider.get_latest_rates(
-            currency_pairs=parse_currency_pairs_args(*currency_pairs_args)
-        )
+        with deadline_scope(timeout):
+            return self._provider.get_latest_rates(
+                currency_pairs=parse_currency_pairs_args(*currency_pairs_args)
+            )
 
     def get_historical_rate(
-        self, *currency_pair_args: CurrencyPairType, as_of: date
+        self,
+        *currency_pair_args: CurrencyPairType,
+        as_of: date,
+        timeout: Optional[float] = None
     ) -> Decimal:
         """Retrieve the exchange rate for the given currency pair at a given historical date.
 
@@ -126,16 +151,20 @@ class Api(object):
             - Single tuple[str, str] argument ("<domestic>", "<foreign>"): ("EUR", "USD")
             - Single quickforex.CurrencyPair argument: quickforex.CurrencyPair("EUR", "USD")
         :param as_of: Historical date
+        :param timeout: Overall time budget (in seconds) shared by all the requests sent to the provider. A
+            quickforex.DeadlineExceededError is raised when it is exceeded (default: no time limit).
         :return: Historical exchange rate for the provided currency pair.
         """
-        return self._provider.get_historical_rate(
-            currency_pair=parse_currency_pair_args(*currency_pair_args), as_of=as_of
-        )
+        with deadline_scope(timeout):
+            return self._provider.get_historical_rate(
+                currency_pair=parse_currency_pair_args(*currency_pair_args), as_of=as_of
+            )
 
     def get_historical_rates(
         self,
         *currency_pairs_args: Union[Iterable[CurrencyPairType], CurrencyPairType],
-        as_of: date
+        as_of: date,
+        timeout: Optional[float] = None
     ) -> dict[CurrencyPair, Decimal]:
         """Retrieve the exchange rate for the given currency pair at a given historical date.
         :param currency_pairs_args: List of currency pairs. Each individual argument can be:
@@ -145,15 +174,20 @@ class Api(object):
             - quickforex.CurrencyPair: quickforex.CurrencyPair("EUR", "USD")
             - An iterable (list, set) with any of the previous argument type.
         :param as_of: Historical date
+        :param timeout: Overall time budget (in seconds) shared by all the requests sent to the provider. A
+            quickforex.DeadlineExceededError is raised when it is exceeded (default: no time limit).
         :return: Historical exchange rate for each provided currency pair.
         """
-        return self._provider.get_historical_rates(
-            currency_pairs=parse_currency_pairs_args(*currency_pairs_args), as_of=as_of
-        )
+        with deadline_scope(timeout):
+            return self._provider.get_historical_rates(
+                currency_pairs=parse_currency_pairs_args(*currency_pairs_args),
+                as_of=as_of,
+            )
 
     def get_rates_time_series(
         self,
         *currency_pairs_args: Union[Iterable[CurrencyPairType], CurrencyPairType],
+        timeout: Optional[float] = None,
         **date_range_kwargs: Union[DateRange, date]
     ) -> dict[CurrencyPair, dict[date, Decimal]]:
         """Retrieve the historical rates for one or more currency pairs between two dates.
@@ -181,19 +215,133 @@ class Api(object):
         :param date_range_kwargs: Date range, can be either:
             - Single 'date_range' (type: quickforex.DateRange) argument
             - Both 'start_date' (type: datetime.date) and 'end_date' (type: datetime.date) arguments
+        :param timeout: Overall time budget (in seconds) shared by all the requests sent to the provider. A
+            quickforex.DeadlineExceededError is raised when it is exceeded (default: no time limit).
         :return: Historical exchange rate for each provided currency pair for the provided date range.
         """
-        return self._provider.get_rates_time_series(
-            currency_pairs=parse_currency_pairs_args(*currency_pairs_args),
-            date_range=parse_date_range_kwargs(**date_range_kwargs),
+        with deadline_scope(timeout):
+            return self._provider.get_rates_time_series(
+                currency_pairs=parse_currency_pairs_args(*currency_pairs_args),
+                date_range=parse_date_range_kwargs(**date_range_kwargs),
+            )
+
+    def get_rates_at(
+        self,
+        points: Iterable[tuple[CurrencyPairType, date]],
+        cost_model: Optional[planner.CostModel] = None,
+        timeout: Optional[float] = None,
+    ) -> dict[tuple[CurrencyPairType, date], Decimal]:
+        """Retrieve the historical rates of a batch of (currency pair, date) points. The points are
+        retrieved with as few upstream requests as possible: dates close to each other are retrieved
+        with time series requests when this is cheaper (according to the cost model) than one
+        historical rates request per date.
+
+        Examples:
+
+            api.get_rates_at([
+                ("EUR/USD", date(year=2021, month=1, day=4)),
+                ("EUR/GBP", date(year=2021, month=1, day=6)),
+                (CurrencyPair("USD", "JPY"), date(year=2020, month=6, day=1)),
+            ])
+
+        :param points: (currency pair, date) points. Each currency pair can be in any format accepted
+            by get_latest_rate (when passed as a single argument).
+        :param cost_model: Relative cost of the requests and of their payload (see
+            quickforex.planner.CostModel)
+        :param timeout: Overall time budget (in seconds) shared by all the requests sent to the provider. A
+            quickforex.DeadlineExceededError is raised when it is exceeded (default: no time limit).
+        :return: Historical exchange rate of each provided point (keyed by the points as provided)
+        """
+        points = {
+            point: (parse_currency_pair_args(point[0]), point[1]) for point in points
+        }
+        with deadline_scope(timeout):
+            rates = planner.get_rates_at(self._provider, points.values(), cost_model)
+        return {point: rates[parsed_point] for point, parsed_point in points.items()}
+
+    def iter_rates_time_series(
+        self,
+        *currency_pairs_args: Union[Iterable[CurrencyPairType], CurrencyPairType],
+        chunk_days: int = time_series.DEFAULT_CHUNK_DAYS,
+        records: bool = False,
+        **date_range_kwargs: Union[DateRange, date]
+    ) -> Union[Iterator[time_series.RatesBlock], Iterator[time_series.RateRecord]]:
+        """Retrieve the historical rates for one or more currency pairs between two dates, chunk by
+        chunk, so that long histories can be consumed without holding them in memory.
+
+        Examples:
+
+            for block in api.iter_rates_time_series(
+                "EUR/USD", "EUR/GBP",
+                start_date=date(year=2000, month=1, day=1),
+                end_date=date(year=2021, month=1, day=1)
+            ):
+                ...  # block: {CurrencyPair("EUR", "USD"): {date(2000, 1, 1): ..., ...}, ...}
+
+            for pair, dt, rate in api.iter_rates_time_series(
+                "EUR/USD", date_range=DateRange(...), records=True
+            ):
+                ...
+
+        :param currency_pairs_args: List of currency pairs (see get_rates_time_series)
+        :param chunk_days: Number of days of each chunk
+        :param records: When set, (currency pair, date, rate) records are yielded instead of a
+            time series block per chunk
+        :param date_range_kwargs: Date range (see get_rates_time_series)
+        :return: Iterator over the time series of each chunk (in chronological order), or over the
+            records of each chunk
+        """
+        blocks = time_series.iter_rates_time_series(
+            self._provider,
+            parse_currency_pairs_args(*currency_pairs_args),
+            parse_date_range_kwargs(**date_range_kwargs),
+            chunk_days,
         )
+        return time_series.iter_rate_records(blocks) if records else blocks
+
+    def convert_many(
+        self,
+        amounts: Any,
+        currencies: Any,
+        dates: Any,
+        target: SymbolType,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """Convert many amounts (each in its own currency and at its own date) to a target currency.
+        The rates are retrieved with a single time series request and the conversion is vectorized
+        (requires the 'numpy' package). Amounts dated on a day without rate (weekends, holidays) are
+        converted with the last rate available before that day.
+
+        Examples:
+
+            api.convert_many(
+                [100.0, 25.5, 12.0],
+                ["USD", "GBP", "EUR"],
+                [date(2021, 1, 4), date(2021, 1, 5), date(2021, 2, 1)],
+                target="EUR"
+            )
+
+        :param amounts: Amounts (numpy array or sequence of numbers)
+        :param currencies: Currency of each amount (numpy array or sequence of str)
+        :param dates: Date of each amount (numpy datetime64 array or sequence of datetime.date)
+        :param target: Currency to which amounts are converted
+        :param timeout: Overall time budget (in seconds) shared by all the requests sent to the provider. A
+            quickforex.DeadlineExceededError is raised when it is exceeded (default: no time limit).
+        :return: numpy array (float64) of the converted amounts
+        """
+        with deadline_scope(timeout):
+            return conversion.convert_many(
+                self._provider, amounts, currencies, dates, target
+            )
 
     @property
     def provider_metadata(self) -> ProviderMetadata:
         return ProviderMetadata.from_provider_type(self._provider)
 
 
-def get_latest_rate(*currency_pair_args: CurrencyPair) -> Decimal:
+def get_latest_rate(
+    *currency_pair_args: CurrencyPair, timeout: Optional[float] = None
+) -> Decimal:
     """Retrieve the last available rate for the given currency pair
 
     Examples:
@@ -209,13 +357,16 @@ def get_latest_rate(*currency_pair_args: CurrencyPair) -> Decimal:
         - Two str arguments "<domestic>", "<foreign>": "EUR", "USD"
         - Single tuple[str, str] argument ("<domestic>", "<foreign>"): ("EUR", "USD")
         - Single quickforex.CurrencyPair argument: quickforex.CurrencyPair("EUR", "USD")
+    :param timeout: Overall time budget (in seconds) shared by all the requests sent to the provider. A
+        quickforex.DeadlineExceededError is raised when it is exceeded (default: no time limit).
     :return: Last exchange rate for the provided currency pair.
     """
-    return Api().get_latest_rate(*currency_pair_args)
+    return Api().get_latest_rate(*currency_pair_args, timeout=timeout)
 
 
 def get_latest_rates(
-    *currency_pairs_args: Union[Iterable[CurrencyPairType], CurrencyPairType]
+    *currency_pairs_args: Union[Iterable[CurrencyPairType], CurrencyPairType],
+    timeout: Optional[float] = None
 ) -> dict[CurrencyPair, Decimal]:
     """Retrieve the last available rate for each given currency pair
 
@@ -235,12 +386,16 @@ def get_latest_rates(
         - tuple[str, str] ("<domestic>", "<foreign>"): ("EUR", "USD")
         - quickforex.CurrencyPair: quickforex.CurrencyPair("EUR", "USD")
         - An iterable (list, set) with any of the previous argument type.
+    :param timeout: Overall time budget (in seconds) shared by all the requests sent to the provider. A
+        quickforex.DeadlineExceededError is raised when it is exceeded (default: no time limit).
     :return: Last exchange rate for each provided currency pair.
     """
-    return Api().get_latest_rates(*currency_pairs_args)
+    return Api().get_latest_rates(*currency_pairs_args, timeout=timeout)
 
 
-def get_historical_rate(*currency_pair_args: CurrencyPairType, as_of: date) -> Decimal:
+def get_historical_rate(
+    *currency_pair_args: CurrencyPairType, as_of: date, timeout: Optional[float] = None
+) -> Decimal:
     """Retrieve the last available rate for the given currency pair
     :param currency_pair_args: Currency pair in either format:
         - Single str argument "<domestic>/<foreign>": "EUR/USD"
@@ -248,25 +403,33 @@ def get_historical_rate(*currency_pair_args: CurrencyPairType, as_of: date) -> D
         - Single tuple[str, str] argument ("<domestic>", "<foreign>"): ("EUR", "USD")
         - Single quickforex.CurrencyPair argument: quickforex.CurrencyPair("EUR", "USD")
     :param as_of: Historical date
+    :param timeout: Overall time budget (in seconds) shared by all the requests sent to the provider. A
+        quickforex.DeadlineExceededError is raised when it is exceeded (default: no time limit).
     :return: Historical exchange rate for the provided currency pair.
     """
-    return Api().get_historical_rate(*currency_pair_args, as_of=as_of)
+    return Api().get_historical_rate(*currency_pair_args, as_of=as_of, timeout=timeout)
 
 
 def get_historical_rates(
     *currency_pairs_args: Union[Iterable[CurrencyPairType], CurrencyPairType],
-    as_of: date
+    as_of: date,
+    timeout: Optional[float] = None
 ) -> dict[CurrencyPair, Decimal]:
     """
     :param currency_pairs_args:
     :param as_of: Historical date
+    :param timeout: Overall time budget (in seconds) shared by all the requests sent to the provider. A
+        quickforex.DeadlineExceededError is raised when it is exceeded (default: no time limit).
     :return: Historical exchange rate for each provided currency pair.
     """
-    return Api().get_historical_rates(*currency_pairs_args, as_of=as_of)
+    return Api().get_historical_rates(
+        *currency_pairs_args, as_of=as_of, timeout=timeout
+    )
 
 
 def get_rates_time_series(
     *currency_pairs_args: Union[Iterable[CurrencyPairType], CurrencyPairType],
+    timeout: Optional[float] = None,
     **date_range_kwargs: Union[DateRange, date]
 ) -> dict[CurrencyPair, dict[date, Decimal]]:
     """Retrieve the historical rates for one or more currency pairs between two dates.
@@ -279,9 +442,71 @@ def get_rates_time_series(
     :param date_range_kwargs: Date range, can either be:
         - Single 'date_range' (type: quickforex.DateRange) argument
         - Both 'start_date' (type: datetime.date) and 'end_date' (type: datetime.date) arguments
+    :param timeout: Overall time budget (in seconds) shared by all the requests sent to the provider. A
+        quickforex.DeadlineExceededError is raised when it is exceeded (default: no time limit).
     :return: Historical exchange rate for each provided currency pair for the provided date range.
     """
-    return Api().get_rates_time_series(*currency_pairs_args, **date_range_kwargs)
+    return Api().get_rates_time_series(
+        *currency_pairs_args, timeout=timeout, **date_range_kwargs
+    )
+
+
+def get_rates_at(
+    points: Iterable[tuple[CurrencyPairType, date]],
+    cost_model: Optional[planner.CostModel] = None,
+    timeout: Optional[float] = None,
+) -> dict[tuple[CurrencyPairType, date], Decimal]:
+    """Retrieve the historical rates of a batch of (currency pair, date) points, with as few upstream
+    requests as possible.
+    :param points: (currency pair, date) points
+    :param cost_model: Relative cost of the requests and of their payload (see quickforex.planner.CostModel)
+    :param timeout: Overall time budget (in seconds) shared by all the requests sent to the provider. A
+        quickforex.DeadlineExceededError is raised when it is exceeded (default: no time limit).
+    :return: Historical exchange rate of each provided point (keyed by the points as provided)
+    """
+    return Api().get_rates_at(points, cost_model=cost_model, timeout=timeout)
+
+
+def iter_rates_time_series(
+    *currency_pairs_args: Union[Iterable[CurrencyPairType], CurrencyPairType],
+    chunk_days: int = time_series.DEFAULT_CHUNK_DAYS,
+    records: bool = False,
+    **date_range_kwargs: Union[DateRange, date]
+) -> Union[Iterator[time_series.RatesBlock], Iterator[time_series.RateRecord]]:
+    """Retrieve the historical rates for one or more currency pairs between two dates, chunk by chunk.
+    :param currency_pairs_args: List of currency pairs (see get_rates_time_series)
+    :param chunk_days: Number of days of each chunk
+    :param records: When set, (currency pair, date, rate) records are yielded instead of a time series
+        block per chunk
+    :param date_range_kwargs: Date range (see get_rates_time_series)
+    :return: Iterator over the time series of each chunk (in chronological order), or over the records
+        of each chunk
+    """
+    return Api().iter_rates_time_series(
+        *currency_pairs_args,
+        chunk_days=chunk_days,
+        records=records,
+        **date_range_kwargs
+    )
+
+
+def convert_many(
+    amounts: Any,
+    currencies: Any,
+    dates: Any,
+    target: SymbolType,
+    timeout: Optional[float] = None,
+) -> Any:
+    """Convert many amounts (each in its own currency and at its own date) to a target currency.
+    :param amounts: Amounts (numpy array or sequence of numbers)
+    :param currencies: Currency of each amount (numpy array or sequence of str)
+    :param dates: Date of each amount (numpy datetime64 array or sequence of datetime.date)
+    :param target: Currency to which amounts are converted
+    :param timeout: Overall time budget (in seconds) shared by all the requests sent to the provider. A
+        quickforex.DeadlineExceededError is raised when it is exceeded (default: no time limit).
+    :return: numpy array (float64) of the converted amounts
+    """
+    return Api().convert_many(amounts, currencies, dates, target, timeout=timeout)
 
 
 def install_provider(provider: ProviderBase) -> None:
@@ -291,7 +516,8 @@ def install_provider(provider: ProviderBase) -> None:
     :param provider: Installed provider.
     """
     global _INSTALLED_PROVIDER
-    _INSTALLED_PROVIDER = provider
+    with _INSTALLED_PROVIDER_LOCK:
+        _INSTALLED_PROVIDER = provider
 
 
 def install_provider_with_id(
@@ -319,7 +545,7 @@ def get_installed_provider() -> ProviderBase:
 
     :return: Currently installed provider
     """
-    return _INSTALLED_PROVIDER
+    return _provider()
 
 
 def get_default_provider_type() -> Type[ProviderBase]:
@@ -327,4 +553,4 @@ def get_default_provider_type() -> Type[ProviderBase]:
 
     :return: Type of provider used by default
     """
-    return _DEFAULT_PROVIDER
+    return providers_factory.get_provider_type(providers_factory.DEFAULT_PROVIDER_ID)
@@ -0,0 +1,242 @@
+from typing import Any, AsyncIterator, Iterable, Union, Optional
+from datetime import date
+from decimal import Decimal
+
+from quickforex.providers.base import AsyncProviderBase
+from quickforex.providers.provider_metadata import ProviderMetadata
+from quickforex.providers import factory as providers_factory
+from quickforex.deadline import deadline_scope
+from quickforex import conversion, planner, time_series
+from quickforex.domain import CurrencyPairType, CurrencyPair, DateRange, SymbolType
+from quickforex.utils import (
+    parse_currency_pairs_args,
+    parse_currency_pair_args,
+    parse_date_range_kwargs,
+)
+
+
+def _create_async_provider(**kwargs) -> AsyncProviderBase:
+    if "provider_id" in kwargs:
+        settings_overrides = {
+            field: value for field, value in kwargs.items() if field != "provider_id"
+        }
+        settings_overrides = settings_overrides if len(settings_overrides) > 0 else None
+        return providers_factory.create_async_provider(
+            provider_id=kwargs["provider_id"], settings_overrides=settings_overrides
+        )
+    elif "provider" in kwargs:
+        return kwargs["provider"]
+    return providers_factory.get_async_provider_type(
+        providers_factory.DEFAULT_PROVIDER_ID
+    )()
+
+
+class AsyncApi(object):
+    def __init__(self, **kwargs):
+        """QuickForex asynchronous API. All the methods mirror the ones exposed by quickforex.Api, but must be
+            awaited. Concurrent calls share the connections pool of the underlying provider.
+
+        Examples:
+
+            async with AsyncApi() as api:
+                rate = await api.get_latest_rate("EUR/USD")
+
+            api = AsyncApi(provider_id="exchangerate.host", source="ecb")
+            # Use a provider instance created from its identifier (and optional provider-specific settings overrides)
+
+            api = AsyncApi(provider=existing_async_provider_instance)
+            # Use a specific provider instance (which is not closed by the API)
+
+        :param kwargs: Either:
+            - provider (existing asynchronous provider instance) argument
+            - provider_id as well as any additional provider-specific settings
+            - No argument (use the default provider)
+        """
+        self._owns_provider = "provider" not in kwargs
+        self._provider = _create_async_provider(**kwargs)
+
+    async def get_latest_rate(
+        self, *currency_pair_args: CurrencyPairType, timeout: Optional[float] = None
+    ) -> Decimal:
+        """Retrieve the last available rate for the given currency pair (see quickforex.Api.get_latest_rate)
+
+        :param currency_pair_args: Currency pair, in any format accepted by quickforex.Api.get_latest_rate.
+        :param timeout: Overall time budget (in seconds) shared by all the requests sent to the provider.
+        :return: Last exchange rate for the provided currency pair.
+        """
+        with deadline_scope(timeout):
+            return await self._provider.get_latest_rate(
+                currency_pair=parse_currency_pair_args(*currency_pair_args)
+            )
+
+    async def get_latest_rates(
+        self,
+        *currency_pairs_args: Union[Iterable[CurrencyPairType], CurrencyPairType],
+        timeout: Optional[float] = None
+    ) -> dict[CurrencyPair, Decimal]:
+        """Retrieve the last available rate for each given currency pair (see quickforex.Api.get_latest_rates)
+
+        :param currency_pairs_args: List of currency pairs, in any format accepted by
+            quickforex.Api.get_latest_rates.
+        :param timeout: Overall time budget (in seconds) shared by all the requests sent to the provider.
+        :return: Last exchange rate for each provided currency pair.
+        """
+        with deadline_scope(timeout):
+            return await self._provider.get_latest_rates(
+                currency_pairs=parse_currency_pairs_args(*currency_pairs_args)
+            )
+
+    async def get_historical_rate(
+        self,
+        *currency_pair_args: CurrencyPairType,
+        as_of: date,
+        timeout: Optional[float] = None
+    ) -> Decimal:
+        """Retrieve the exchange rate for the given currency pair at a given historical date
+            (see quickforex.Api.get_historical_rate)
+
+        :param currency_pair_args: Currency pair, in any format accepted by quickforex.Api.get_historical_rate.
+        :param as_of: Historical date
+        :param timeout: Overall time budget (in seconds) shared by all the requests sent to the provider.
+        :return: Historical exchange rate for the provided currency pair.
+        """
+        with deadline_scope(timeout):
+            return await self._provider.get_historical_rate(
+                currency_pair=parse_currency_pair_args(*currency_pair_args), as_of=as_of
+            )
+
+    async def get_historical_rates(
+        self,
+        *currency_pairs_args: Union[Iterable[CurrencyPairType], CurrencyPairType],
+        as_of: date,
+        timeout: Optional[float] = None
+    ) -> dict[CurrencyPair, Decimal]:
+        """Retrieve the exchange rate for the given currency pairs at a given historical date
+            (see quickforex.Api.get_historical_rates)
+
+        :param currency_pairs_args: List of currency pairs, in any format accepted by
+            quickforex.Api.get_historical_rates.
+        :param as_of: Historical date
+        :param timeout: Overall time budget (in seconds) shared by all the requests sent to the provider.
+        :return: Historical exchange rate for each provided currency pair.
+        """
+        with deadline_scope(timeout):
+            return await self._provider.get_historical_rates(
+                currency_pairs=parse_currency_pairs_args(*currency_pairs_args),
+                as_of=as_of,
+            )
+
+    async def get_rates_time_series(
+        self,
+        *currency_pairs_args: Union[Iterable[CurrencyPairType], CurrencyPairType],
+        timeout: Optional[float] = None,
+        **date_range_kwargs: Union[DateRange, date]
+    ) -> dict[CurrencyPair, dict[date, Decimal]]:
+        """Retrieve the historical rates for one or more currency pairs between two dates
+            (see quickforex.Api.get_rates_time_series)
+
+        :param currency_pairs_args: List of currency pairs, in any format accepted by
+            quickforex.Api.get_rates_time_series.
+        :param date_range_kwargs: Date range, can be either:
+            - Single 'date_range' (type: quickforex.DateRange) argument
+            - Both 'start_date' (type: datetime.date) and 'end_date' (type: datetime.date) arguments
+        :param timeout: Overall time budget (in seconds) shared by all the requests sent to the provider.
+        :return: Historical exchange rate for each provided currency pair for the provided date range.
+        """
+        with deadline_scope(timeout):
+            return await self._provider.get_rates_time_series(
+                currency_pairs=parse_currency_pairs_args(*currency_pairs_args),
+                date_range=parse_date_range_kwargs(**date_range_kwargs),
+            )
+
+    async def get_rates_at(
+        self,
+        points: Iterable[tuple[CurrencyPairType, date]],
+        cost_model: Optional[planner.CostModel] = None,
+        timeout: Optional[float] = None,
+    ) -> dict[tuple[CurrencyPairType, date], Decimal]:
+        """Retrieve the historical rates of a batch of (currency pair, date) points, with as few
+            upstream requests as possible (see quickforex.Api.get_rates_at)
+
+        :param points: (currency pair, date) points, in any format accepted by
+            quickforex.Api.get_rates_at.
+        :param cost_model: Relative cost of the requests and of their payload (see
+            quickforex.planner.CostModel)
+        :param timeout: Overall time budget (in seconds) shared by all the requests sent to the provider.
+        :return: Historical exchange rate of each provided point (keyed by the points as provided)
+        """
+        points = {
+            point: (parse_currency_pair_args(point[0]), point[1]) for point in points
+        }
+        with deadline_scope(timeout):
+            rates = await planner.aget_rates_at(
+                self._provider, points.values(), cost_model
+            )
+        return {point: rates[parsed_point] for point, parsed_point in points.items()}
+
+    def iter_rates_time_series(
+        self,
+        *currency_pairs_args: Union[Iterable[CurrencyPairType], CurrencyPairType],
+        chunk_days: int = time_series.DEFAULT_CHUNK_DAYS,
+        records: bool = False,
+        **date_range_kwargs: Union[DateRange, date]
+    ) -> Union[
+        AsyncIterator[time_series.RatesBlock], AsyncIterator[time_series.RateRecord]
+    ]:
+        """Retrieve the historical rates for one or more currency pairs between two dates, chunk by
+            chunk (see quickforex.Api.iter_rates_time_series). Must be iterated with 'async for'.
+
+        :param currency_pairs_args: List of currency pairs, in any format accepted by
+            quickforex.Api.get_rates_time_series.
+        :param chunk_days: Number of days of each chunk
+        :param records: When set, (currency pair, date, rate) records are yielded instead of a
+            time series block per chunk
+        :param date_range_kwargs: Date range (see quickforex.Api.get_rates_time_series)
+        :return: Asynchronous iterator over the time series of each chunk, or over the records of
+            each chunk
+        """
+        blocks = time_series.aiter_rates_time_series(
+            self._provider,
+            parse_currency_pairs_args(*currency_pairs_args),
+            parse_date_range_kwargs(**date_range_kwargs),
+            chunk_days,
+        )
+        return time_series.aiter_rate_records(blocks) if records else blocks
+
+    async def convert_many(
+        self,
+        amounts: Any,
+        currencies: Any,
+        dates: Any,
+        target: SymbolType,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """Convert many amounts (each in its own currency and at its own date) to a target currency
+            (see quickforex.Api.convert_many)
+
+        :param amounts: Amounts (numpy array or sequence of numbers)
+        :param currencies: Currency of each amount (numpy array or sequence of str)
+        :param dates: Date of each amount (numpy datetime64 array or sequence of datetime.date)
+        :param target: Currency to which amounts are converted
+        :param timeout: Overall time budget (in seconds) shared by all the requests sent to the provider.
+        :return: numpy array (float64) of the converted amounts
+        """
+        with deadline_scope(timeout):
+            return await conversion.aconvert_many(
+                self._provider, amounts, currencies, dates, target
+            )
+
+    @property
+    def provider_metadata(self) -> ProviderMetadata:
+        return ProviderMetadata.from_provider_type(self._provider)
+
+    async def close(self) -> None:
+        """Release the resources held by the provider, unless it was provided by the caller."""
+        if self._owns_provider:
+            await self._provider.close()
+
+    async def __aenter__(self) -> "AsyncApi":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
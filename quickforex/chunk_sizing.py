@@ -0,0 +1,145 @@
+from typing import Optional
+import math
+import threading
+
+
+class ChunkSizer(object):
+    def __init__(
+        self,
+        max_days: int = 366,
+        request_overhead: float = 0.3,
+        byte_latency: float = 1e-6,
+        rate_size: float = 20.0,
+        request_cost: float = 0.05,
+        decay: float = 0.95,
+    ):
+        """Choose the number of days of the time series requests from the latency and payload
+        size of the previous requests.
+
+        The latency of a request is modelled as request_overhead + byte_latency * payload_size, and
+        the payload size as rate_size * rates_count. Both models start from the provided estimates
+        and are fitted (with exponentially decaying weights) on the observed requests. The chunk
+        size minimizes the estimated time to download a date range (given the maximum number of
+        concurrent requests), plus request_cost for each request sent.
+
+        :param max_days: Maximum number of days of a request (limit of the provider)
+        :param request_overhead: Initial estimate of the fixed latency of a request (in seconds)
+        :param byte_latency: Initial estimate of the latency per payload byte (in seconds)
+        :param rate_size: Initial estimate of the payload size per rate (in bytes)
+        :param request_cost: Cost (in seconds) charged for each request, so that requests are not
+            split for negligible gains
+        :param decay: Weight of the previous observations after each new observation
+        """
+        self._max_days = max_days
+        self._request_cost = request_cost
+        self._decay = decay
+        self._lock = threading.Lock()
+        # Weighted sums of the (payload size, latency) observations, seeded with two pseudo
+        # observations matching the initial estimates
+        self._weight = 0.0
+        self._size_sum = 0.0
+        self._latency_sum = 0.0
+        self._size_square_sum = 0.0
+        self._size_latency_sum = 0.0
+        for size in [0.0, 1e6]:
+            self._add_observation(size, request_overhead + byte_latency * size)
+        self._rate_size = rate_size
+
+    @property
+    def max_days(self) -> int:
+        return self._max_days
+
+    def _add_observation(self, size: float, latency: float) -> None:
+        self._weight += 1.0
+        self._size_sum += size
+        self._latency_sum += latency
+        self._size_square_sum += size * size
+        self._size_latency_sum += size * latency
+
+    def observe(self, rates_count: int, size: int, latency: float) -> None:
+        """
+        :param rates_count: Number of rates requested
+        :param size: Size of the response payload (in bytes)
+        :param latency: Time (in seconds) to receive the response
+        """
+        with self._lock:
+            for attribute in [
+                "_weight",
+                "_size_sum",
+                "_latency_sum",
+                "_size_square_sum",
+                "_size_latency_sum",
+            ]:
+                setattr(self, attribute, getattr(self, attribute) * self._decay)
+            self._add_observation(float(size), latency)
+            if rates_count > 0:
+                self._rate_size = self._decay * self._rate_size + (1 - self._decay) * (
+                    size / rates_count
+                )
+
+    def latency_model(self) -> tuple[float, float]:
+        """
+        :return: Estimated fixed latency of a request (in seconds), and latency per rate (in
+            seconds)
+        """
+        with self._lock:
+            mean_size = self._size_sum / self._weight
+            mean_latency = self._latency_sum / self._weight
+            size_variance = self._size_square_sum / self._weight - mean_size**2
+            covariance = (
+                self._size_latency_sum / self._weight - mean_size * mean_latency
+            )
+            byte_latency = (
+                max(covariance / size_variance, 0.0) if size_variance > 0 else 0.0
+            )
+            overhead = max(mean_latency - byte_latency * mean_size, 0.0)
+            return overhead, byte_latency * self._rate_size
+
+    def estimated_cost(
+        self,
+        days: int,
+        symbols_count: int,
+        chunks_count: int,
+        requests_per_chunk: int = 1,
+        max_concurrency: int = 1,
+    ) -> float:
+        overhead, rate_latency = self.latency_model()
+        chunk_days = math.ceil(days / chunks_count)
+        requests_count = chunks_count * requests_per_chunk
+        waves = math.ceil(requests_count / max(max_concurrency, 1))
+        return (
+            waves * (overhead + rate_latency * symbols_count * chunk_days)
+            + self._request_cost * requests_count
+        )
+
+    def chunk_days(
+        self,
+        days: int,
+        symbols_count: int,
+        requests_per_chunk: int = 1,
+        max_concurrency: int = 1,
+        max_chunks: Optional[int] = None,
+    ) -> int:
+        """
+        :param days: Number of days of the requested date range
+        :param symbols_count: Number of symbols requested by each request
+        :param requests_per_chunk: Number of requests sent for each chunk (one per base currency)
+        :param max_concurrency: Maximum number of requests sent concurrently
+        :param max_chunks: Maximum number of chunks considered (default: 8 waves of requests)
+        :return: Number of days of each chunk
+        """
+        if days <= 1:
+            return 1
+        min_chunks = math.ceil(days / self._max_days)
+        max_chunks = min(days, max_chunks or min_chunks + 8 * max(max_concurrency, 1))
+        best_chunks = min(
+            range(min_chunks, max(max_chunks, min_chunks) + 1),
+            key=lambda chunks_count: self.estimated_cost(
+                days,
+                symbols_count,
+                chunks_count,
+                requests_per_chunk,
+                max_concurrency,
+            ),
+        )
+        return math.ceil(days / best_chunks)
@@ -1,4 +1,4 @@
-from typing import Protocol, Any
+from typing import Protocol, Any, Mapping, Optional, Union
 from collections import defaultdict
 from argparse import ArgumentParser, ArgumentTypeError
 from datetime import date, datetime
@@ -8,11 +8,12 @@ import json
 import sys
 
 from quickforex.providers.factory import ProviderMetadata
-from quickforex.providers.base import ProviderBase
-from quickforex.providers.exchangerate_host import ExchangeRateHostProvider
+from quickforex.providers.base import ProviderBase, rates_format
 from quickforex.providers.dummy import DummyProvider
 from quickforex.providers import factory as providers_factory
 from quickforex.domain import CurrencyPair, DateRange
+from quickforex.numeric import NumericMode, RateType
+from quickforex.rate_series import RateSeries
 
 DATE_FORMAT = "%Y-%m-%d"
 DATE_FORMAT_HUMAN = "yyyy-mm-dd, 2021-12-31"
@@ -52,9 +53,35 @@ class Formatter(Protocol):
         ...
 
 
+def _json_rate(rate: RateType, decimal_places: Optional[int]) -> float:
+    """
+    :param rate: Rate
+    :param decimal_places: Scale of the rate (10^decimal_places) when it is a INT64 rate, None otherwise
+    """
+    if decimal_places is not None:
+        return rate / 10**decimal_places
+    return rate if isinstance(rate, (int, float)) else float(rate)
+
+
+def _int64_decimal_places(provider: ProviderBase) -> Optional[int]:
+    """
+    :return: Scale of the rates returned by the provider when they are INT64 rates, None otherwise
+    """
+    numeric_mode, decimal_places = rates_format(provider)
+    return decimal_places if numeric_mode is NumericMode.INT64 else None
+
+
 class JSONFormatter(Formatter):
-    def __init__(self, pretty: bool = False):
+    def __init__(
+        self, pretty: bool = False, int64_decimal_places: Optional[int] = None
+    ):
+        """
+        :param pretty: Indent the output
+        :param int64_decimal_places: When set, rates are INT64 rates scaled by 10^int64_decimal_places
+            (the scale of the rates time series is read from the series themselves)
+        """
         self._pretty = pretty
+        self._int64_decimal_places = int64_decimal_places
 
     def _json_dumps(self, data: Any) -> str:
         return json.dumps(data, indent=4 if self._pretty else 0, sort_keys=True)
@@ -62,9 +89,18 @@ class JSONFormatter(Formatter):
     def format_rates(self, rates: dict[CurrencyPair, Decimal]) -> str:
         output: dict[str, dict[str, float]] = defaultdict(dict)
         for pair, rate in rates.items():
-            output[pair.domestic][pair.foreign] = float(rate)
+            output[pair.domestic][pair.foreign] = _json_rate(
+                rate, self._int64_decimal_places
+            )
         return self._json_dumps(output)
 
+    def _series_decimal_places(self, series: Mapping[date, RateType]) -> Optional[int]:
+        if isinstance(series, RateSeries):
+            if series.numeric_mode is NumericMode.INT64:
+                return series.decimal_places
+            return None
+        return self._int64_decimal_places
+
     def format_rates_time_series(
         self, time_series: dict[CurrencyPair, dict[date, Decimal]]
     ) -> str:
@@ -72,10 +108,11 @@ class JSONFormatter(Formatter):
             lambda: defaultdict(dict)
         )
         for pair, series in time_series.items():
+            decimal_places = self._series_decimal_places(series)
             for dt, rate in series.items():
-                output[pair.domestic][pair.foreign][dt.strftime(DATE_FORMAT)] = float(
-                    rate
-                )
+                output[pair.domestic][pair.foreign][
+                    dt.strftime(DATE_FORMAT)
+                ] = _json_rate(rate, decimal_places)
         return self._json_dumps(output)
 
     def format_providers(self, providers: list[ProviderMetadata]) -> str:
@@ -109,10 +146,16 @@ class JSONFormatter(Formatter):
 
 class FormatterFactory(object):
     @staticmethod
-    def create(output_format: OutputFormat) -> Formatter:
+    def create(
+        output_format: OutputFormat, int64_decimal_places: Optional[int] = None
+    ) -> Formatter:
         return {
-            OutputFormat.JSON: lambda: JSONFormatter(pretty=False),
-            OutputFormat.JSON_PRETTY: lambda: JSONFormatter(pretty=True),
+            OutputFormat.JSON: lambda: JSONFormatter(
+                pretty=False, int64_decimal_places=int64_decimal_places
+            ),
+            OutputFormat.JSON_PRETTY: lambda: JSONFormatter(
+                pretty=True, int64_decimal_places=int64_decimal_places
+            ),
         }[output_format]()
 
 
@@ -193,13 +236,12 @@ def create_parser() -> ArgumentParser:
         default=OutputFormat.JSON_PRETTY,
         help="Output format (default: JSON)",
     ),
-    default_provider = ExchangeRateHostProvider
     parser.add_argument(
         "--provider",
-        default=ExchangeRateHostProvider(),
+        default=None,
         type=create_provider,
         help=(
-            f"Provider used to fetch exchange rates (default: {default_provider.identifier})."
+            f"Provider used to fetch exchange rates (default: {providers_factory.DEFAULT_PROVIDER_ID})."
             f" The list of available providers can be found by running 'quickforex providers'."
             f" Additional settings can be provided with this syntax:"
             f" quickforex --provider {PROVIDER_SETTINGS_HUMAN}"
@@ -305,10 +347,18 @@ def command_line_entrypoint(args: list[str]):
     settings = parser.parse_args(args)
     if not settings.mode:
         parser.error("Please select a mode")
-    output_formatter = FormatterFactory.create(settings.format)
     if settings.mode == "providers":
-        return providers_entrypoint(output_formatter)
+        return providers_entrypoint(FormatterFactory.create(settings.format))
     currency_pairs = parse_currency_pairs(settings.currency_pairs)
+    # The default provider is only created when it is used
+    provider = settings.provider
+    if provider is None:
+        provider = providers_factory.create_provider(
+            providers_factory.DEFAULT_PROVIDER_ID
+        )
+    output_formatter = FormatterFactory.create(
+        settings.format, _int64_decimal_places(provider)
+    )
     mode_entrypoint = {
         "latest": latest_mode_entrypoint,
         "history": hist_mode_entrypoint,
@@ -317,7 +367,7 @@ def command_line_entrypoint(args: list[str]):
     return mode_entrypoint(
         settings=settings,
         currency_pairs=currency_pairs,
-        provider=settings.provider,
+        provider=provider,
         output_formatter=output_formatter,
     )
 
@@ -0,0 +1,203 @@
+from typing import (
+    Any,
+    Callable,
+    TypeVar,
+    Optional,
+    Awaitable,
+    Iterable,
+    Iterator,
+    AsyncIterator,
+    Hashable,
+)
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+import contextvars
+import itertools
+import threading
+
+from quickforex.deadline import DeadlineExceededError, current_deadline
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class BoundedExecutor(object):
+    def __init__(self, max_workers: int, thread_name_prefix: str = "quickforex"):
+        """Thread pool (created on first use) running at most max_workers tasks concurrently.
+
+        :param max_workers: Maximum number of tasks running concurrently. Tasks run in the
+            calling thread when this is 1 or less.
+        :param thread_name_prefix: Prefix of the worker threads names
+        """
+        self._max_workers = max_workers
+        self._thread_name_prefix = thread_name_prefix
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix=self._thread_name_prefix,
+                )
+            return self._executor
+
+    def map(self, fn: Callable[[T], R], items: Iterable[T]) -> list[R]:
+        """Apply fn to every item. Results are returned in the order of the items and the first
+        error (in the order of the items) is raised once all the tasks are done. Tasks run in a
+        copy of the caller context (so that context variables, such as deadlines, are inherited).
+        """
+        items = list(items)
+        if self._max_workers <= 1 or len(items) <= 1:
+            return [fn(item) for item in items]
+        executor = self._get_executor()
+        futures = [
+            executor.submit(contextvars.copy_context().run, fn, item) for item in items
+        ]
+        for future in futures:
+            future.exception()
+        return [future.result() for future in futures]
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+class _Call(object):
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight(object):
+    def __init__(self):
+        """Coalesces concurrent calls sharing the same key: while a call is in flight, callers
+        asking for the same key wait for it and share its result (or error) instead of running
+        their own call.
+        """
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Run fn, unless a call with the same key is already in flight, in which case wait for
+        that call (at most until the deadline of the current operation) and share its outcome.
+        A caller sharing a call which exceeded its own (shorter) deadline runs the call again.
+        """
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+            if leader:
+                return self._run(key, call, fn)
+            deadline = current_deadline()
+            if not call.done.wait(deadline.remaining if deadline else None):
+                raise DeadlineExceededError(deadline.timeout)
+            if isinstance(call.error, DeadlineExceededError) and not (
+                deadline and deadline.expired
+            ):
+                continue
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+    def _run(self, key: Hashable, call: _Call, fn: Callable[[], T]) -> T:
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+async def gather_bounded(
+    awaitables: Iterable[Awaitable[T]], max_concurrency: int
+) -> list[T]:
+    """Await all the provided awaitables, at most max_concurrency at a time. Results are returned
+    in the order of the awaitables.
+    """
+    import asyncio
+
+    semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+
+    async def run(awaitable: Awaitable[T]) -> T:
+        async with semaphore:
+            return await awaitable
+
+    return list(await asyncio.gather(*(run(awaitable) for awaitable in awaitables)))
+
+
+def iter_prefetched(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    max_ahead: int,
+    thread_name_prefix: str = "quickforex-prefetch",
+) -> Iterator[R]:
+    """Apply fn to every item in background threads, at most max_ahead items ahead of the consumer
+    (so that at most max_ahead results are held at any time). Results are yielded in the order of
+    the items, and the tasks which did not start yet are cancelled when the iterator is closed.
+    Tasks run in a copy of the caller context.
+    """
+    items = iter(items)
+    if max_ahead < 1:
+        yield from (fn(item) for item in items)
+        return
+    with ThreadPoolExecutor(
+        max_ahead, thread_name_prefix=thread_name_prefix
+    ) as executor:
+
+        def submit(item: T):
+            return executor.submit(contextvars.copy_context().run, fn, item)
+
+        pending = deque(submit(item) for item in itertools.islice(items, max_ahead))
+        try:
+            while pending:
+                result = pending.popleft().result()
+                pending.extend(submit(item) for item in itertools.islice(items, 1))
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+async def aiter_prefetched(
+    fn: Callable[[T], Awaitable[R]], items: Iterable[T], max_ahead: int
+) -> AsyncIterator[R]:
+    """Asynchronous counterpart of iter_prefetched: await fn(item) for every item, at most
+    max_ahead items ahead of the consumer.
+    """
+    import asyncio
+
+    items = iter(items)
+    pending = deque(
+        asyncio.ensure_future(fn(item))
+        for item in itertools.islice(items, max(max_ahead, 1))
+    )
+    try:
+        while pending:
+            result = await pending.popleft()
+            pending.extend(
+                asyncio.ensure_future(fn(item)) for item in itertools.islice(items, 1)
+            )
+            yield result
+    finally:
+        for task in pending:
+            task.cancel()
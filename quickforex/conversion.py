@@ -0,0 +1,200 @@
+from typing import Any, Mapping, Optional
+from datetime import date
+
+from quickforex.domain import CurrencyPair, DateRange, SymbolType
+from quickforex.errors import QuickForexError
+from quickforex.logger import get_module_logger
+from quickforex.providers.base import ProviderBase, AsyncProviderBase
+from quickforex.rate_series import RateSeries
+from quickforex.numeric import NumericMode, RateType
+
+
+logger = get_module_logger(__name__)
+
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+# Number of days before the first amount for which rates are retrieved, so that amounts dated on
+# days without rate can be converted with an earlier rate
+MISSING_RATE_LOOKBACK_DAYS = 7
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise QuickForexError(
+            "converting amounts in batch requires the 'numpy' package"
+            " (hint: pip install quickforex[numpy])"
+        )
+    return numpy
+
+
+def _to_ordinals(np, dates: Any):
+    dates = np.asarray(dates)
+    if dates.dtype.kind == "M":
+        return dates.astype("datetime64[D]").astype("int64") + _EPOCH_ORDINAL
+    return np.fromiter(
+        (dt.toordinal() for dt in dates), dtype="int64", count=len(dates)
+    )
+
+
+def _as_rate_series(
+    series: Mapping[date, RateType], date_range: DateRange
+) -> RateSeries:
+    if isinstance(series, RateSeries) and series.date_range == date_range:
+        return series
+    return RateSeries.from_rates(date_range, series)
+
+
+def _series_table(np, series: Mapping[date, RateType], date_range: DateRange):
+    series = _as_rate_series(series, date_range)
+    table = series.to_numpy()
+    if series.numeric_mode is NumericMode.INT64:
+        table = np.where(
+            np.frombuffer(series.mask, dtype="uint8") != 0,
+            table / 10**series.decimal_places,
+            np.nan,
+        )
+    return table
+
+
+def _fill_forward(np, table):
+    """Replace the NaN of each row of the table by the last non-NaN value before it (NaN are kept
+    when there is no such value)."""
+    columns = np.arange(table.shape[1])
+    index = np.where(np.isnan(table), 0, columns)
+    np.maximum.accumulate(index, axis=1, out=index)
+    return np.take_along_axis(table, index, axis=1)
+
+
+class Conversion(object):
+    def __init__(self, amounts: Any, currencies: Any, dates: Any, target: SymbolType):
+        """Conversion of amounts to a target currency, using the rate of the date of each amount.
+        The rates of all the currency pairs are retrieved with a single time series request
+        (currency_pairs over date_range), which result is passed to convert().
+
+        Amounts dated on a day without rate (weekends, holidays) are converted with the last rate
+        available before that day. The requested date range starts MISSING_RATE_LOOKBACK_DAYS
+        days before the first amount so that such a rate is available for the first days.
+
+        :param amounts: Amounts (numpy array or sequence of numbers)
+        :param currencies: Currency of each amount (numpy array or sequence of str)
+        :param dates: Date of each amount (numpy datetime64 array or sequence of datetime.date)
+        :param target: Currency to which amounts are converted
+        """
+        np = _import_numpy()
+        self._np = np
+        self._amounts = np.asarray(amounts, dtype="float64")
+        self._currencies = np.asarray(currencies)
+        self._ordinals = _to_ordinals(np, dates)
+        if not (len(self._amounts) == len(self._currencies) == len(self._ordinals)):
+            raise ValueError(
+                f"amounts, currencies and dates must have the same length"
+                f" (got {len(self._amounts)}, {len(self._currencies)}"
+                f" and {len(self._ordinals)})"
+            )
+        self._target = target
+        self._symbols: list[SymbolType] = []
+        self._symbol_indices = np.zeros(0, dtype="int64")
+        if len(self._amounts) > 0:
+            symbols, self._symbol_indices = np.unique(
+                self._currencies, return_inverse=True
+            )
+            self._symbols = [str(symbol) for symbol in symbols]
+        self.currency_pairs = {
+            CurrencyPair(symbol, target) for symbol in self._symbols if symbol != target
+        }
+        self.date_range: Optional[DateRange] = None
+        if self.currency_pairs:
+            converted = np.array(
+                [symbol != target for symbol in self._symbols], dtype=bool
+            )[self._symbol_indices]
+            self.date_range = DateRange(
+                date.fromordinal(
+                    int(self._ordinals[converted].min()) - MISSING_RATE_LOOKBACK_DAYS
+                ),
+                date.fromordinal(int(self._ordinals[converted].max())),
+            )
+
+    def convert(self, series: Mapping[CurrencyPair, Mapping[date, RateType]]):
+        """
+        :param series: Rates time series of the currency pairs (over the date range)
+        :return: numpy array of converted amounts (float64)
+        """
+        np = self._np
+        if self.date_range is None:
+            # No amount to convert, or amounts only in the target currency
+            return self._amounts.copy()
+        start_ordinal = self.date_range.start_date.toordinal()
+        table = np.full((len(self._symbols), len(self.date_range)), np.nan)
+        for index, symbol in enumerate(self._symbols):
+            pair_series = series.get(CurrencyPair(symbol, self._target))
+            if symbol == self._target:
+                table[index] = 1.0
+            elif pair_series is not None:
+                table[index] = _series_table(np, pair_series, self.date_range)
+        # Amounts in the target currency may be dated outside of the date range (which only
+        # covers the converted amounts), their rate is 1.0 on any day of the range
+        columns = np.clip(self._ordinals - start_ordinal, 0, len(self.date_range) - 1)
+        rates = _fill_forward(np, table)[self._symbol_indices, columns]
+        missing_rows = np.flatnonzero(np.isnan(rates))
+        if len(missing_rows) > 0:
+            row = int(missing_rows[0])
+            raise QuickForexError(
+                f"no rate available to convert {len(missing_rows)} amount(s), first is row {row}"
+                f" ({self._currencies[row]} on {date.fromordinal(int(self._ordinals[row]))})"
+            )
+        return self._amounts * rates
+
+
+def convert_many(
+    provider: ProviderBase,
+    amounts: Any,
+    currencies: Any,
+    dates: Any,
+    target: SymbolType,
+):
+    """Convert amounts to a target currency, using the rate of the date of each amount (see
+    Conversion).
+
+    :param provider: Provider used to retrieve the rates time series
+    :param amounts: Amounts (numpy array or sequence of numbers)
+    :param currencies: Currency of each amount (numpy array or sequence of str)
+    :param dates: Date of each amount (numpy datetime64 array or sequence of datetime.date)
+    :param target: Currency to which amounts are converted
+    :return: numpy array of converted amounts (float64)
+    """
+    conversion = Conversion(amounts, currencies, dates, target)
+    if not conversion.currency_pairs:
+        return conversion.convert({})
+    logger.debug(
+        f"fetching {len(conversion.currency_pairs)} currency pair(s)"
+        f" over {conversion.date_range}"
+    )
+    return conversion.convert(
+        provider.get_rates_time_series(conversion.currency_pairs, conversion.date_range)
+    )
+
+
+async def aconvert_many(
+    provider: AsyncProviderBase,
+    amounts: Any,
+    currencies: Any,
+    dates: Any,
+    target: SymbolType,
+):
+    """Asynchronous counterpart of convert_many"""
+    conversion = Conversion(amounts, currencies, dates, target)
+    if not conversion.currency_pairs:
+        return conversion.convert({})
+    logger.debug(
+        f"fetching {len(conversion.currency_pairs)} currency pair(s)"
+        f" over {conversion.date_range}"
+    )
+    return conversion.convert(
+        await provider.get_rates_time_series(
+            conversion.currency_pairs, conversion.date_range
+        )
+    )
@@ -0,0 +1,68 @@
+from typing import Optional, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+import time
+
+from quickforex.errors import QuickForexError
+
+
+class DeadlineExceededError(QuickForexError):
+    def __init__(self, timeout: float):
+        super().__init__(f"operation did not complete within {timeout:.3f}s")
+
+
+class Deadline(object):
+    def __init__(self, timeout: float):
+        """Point in time after which the current operation is abandoned.
+
+        :param timeout: Time budget (in seconds) from now
+        """
+        self._timeout = timeout
+        self._expires_at = time.monotonic() + timeout
+
+    @property
+    def timeout(self) -> float:
+        return self._timeout
+
+    @property
+    def remaining(self) -> float:
+        return max(self._expires_at - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining <= 0.0
+
+    def check(self) -> None:
+        if self.expired:
+            raise DeadlineExceededError(self._timeout)
+
+
+_CURRENT_DEADLINE: ContextVar[Optional[Deadline]] = ContextVar(
+    "quickforex_deadline", default=None
+)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Retrieve the deadline applying to the current operation (if any)."""
+    return _CURRENT_DEADLINE.get()
+
+
+@contextmanager
+def deadline_scope(timeout: Optional[float]) -> Iterator[Optional[Deadline]]:
+    """Apply a deadline to all the requests sent from the enclosed block (including requests sent
+    from worker threads and tasks spawned by quickforex). Nested scopes can only shorten the deadline.
+
+    :param timeout: Time budget (in seconds), no deadline is applied when None
+    """
+    outer_deadline = current_deadline()
+    if timeout is None:
+        yield outer_deadline
+        return
+    deadline = Deadline(timeout)
+    if outer_deadline is not None and outer_deadline.remaining < deadline.remaining:
+        deadline = outer_deadline
+    token = _CURRENT_DEADLINE.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _CURRENT_DEADLINE.reset(token)
@@ -1,73 +1,153 @@
 from typing import Tuple, Union, Iterator
 from dataclasses import dataclass
 from datetime import date, timedelta
+import functools
 
 
 SymbolType = str
 
 
-@dataclass(frozen=True)
-class CurrencyPair:
+PARSED_CURRENCY_PAIRS_CACHE_SIZE = 16384
+MAX_INTERNED_CURRENCY_PAIRS = 16384
+
+
+_INTERNED_CURRENCY_PAIRS: dict[tuple[SymbolType, SymbolType], "CurrencyPair"] = {}
+
+
+@dataclass(frozen=True, init=False, eq=False)
+class CurrencyPair(object):
     HUMAN_READABLE_STR_FORMAT = (
         "'<domestic>/<foreign>' [EUR/USD] or '<domestic:3><foreign:3>': [JPYUSD]"
     )
 
+    __slots__ = ("domestic", "foreign", "_hash")
+
     domestic: SymbolType
     foreign: SymbolType
 
-    def reversed(self) -> "CurrencyPair":
-        return CurrencyPair(domestic=self.foreign, foreign=self.domestic)
-
-    def __post_init__(self) -> None:
-        if not isinstance(self.domestic, SymbolType):
+    def __new__(cls, domestic: SymbolType, foreign: SymbolType) -> "CurrencyPair":
+        """Immutable currency pair. Currency pairs are interned (up to MAX_INTERNED_CURRENCY_PAIRS
+        distinct pairs): the same instance is returned for the same (domestic, foreign) currencies,
+        which saves memory and makes most comparisons identity checks. Currency pairs are still
+        compared and hashed by value.
+        """
+        currency_pair = _INTERNED_CURRENCY_PAIRS.get((domestic, foreign))
+        if currency_pair is not None and type(currency_pair) is cls:
+            return currency_pair
+        if not isinstance(domestic, SymbolType):
             raise TypeError(
-                f"invalid currency pair: domestic currency ({self.domestic})"
-                f" has unexpected type {type(self.domestic).__name__}, expected {SymbolType.__name__}"
+                f"invalid currency pair: domestic currency ({domestic})"
+                f" has unexpected type {type(domestic).__name__}, expected {SymbolType.__name__}"
             )
-        if not isinstance(self.foreign, SymbolType):
+        if not isinstance(foreign, SymbolType):
             raise TypeError(
-                f"invalid currency pair: domestic currency ({self.foreign})"
-                f" has unexpected type {type(self.foreign).__name__}, expected {SymbolType.__name__}"
+                f"invalid currency pair: domestic currency ({foreign})"
+                f" has unexpected type {type(foreign).__name__}, expected {SymbolType.__name__}"
             )
-        if not self.domestic or not self.foreign:
+        if not domestic or not foreign:
             raise ValueError(
-                f"invalid currency pair {self}: domestic and foreign currency must both be defined"
+                f"invalid currency pair {cls.__name__}(domestic={domestic!r}, foreign={foreign!r}):"
+                f" domestic and foreign currency must both be defined"
             )
+        currency_pair = super().__new__(cls)
+        _set_domestic(currency_pair, domestic)
+        _set_foreign(currency_pair, foreign)
+        _set_hash(currency_pair, hash((domestic, foreign)))
+        if (
+            cls is not CurrencyPair
+            or len(_INTERNED_CURRENCY_PAIRS) >= MAX_INTERNED_CURRENCY_PAIRS
+        ):
+            return currency_pair
+        # setdefault is atomic: concurrent constructions of a pair return the same instance
+        return _INTERNED_CURRENCY_PAIRS.setdefault((domestic, foreign), currency_pair)
+
+    @staticmethod
+    def interned(domestic: SymbolType, foreign: SymbolType) -> "CurrencyPair":
+        """Canonical instance of a currency pair, for trusted callers (the arguments are only
+        validated when the currency pair does not exist yet).
+        """
+        return _INTERNED_CURRENCY_PAIRS.get((domestic, foreign)) or CurrencyPair(
+            domestic, foreign
+        )
+
+    def reversed(self) -> "CurrencyPair":
+        return CurrencyPair.interned(self.foreign, self.domestic)
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.domestic == other.domestic and self.foreign == other.foreign
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __reduce__(self):
+        return type(self), (self.domestic, self.foreign)
 
     @staticmethod
     def parse(pair_str: str) -> "CurrencyPair":
-        parse_error = f"{pair_str} is not a valid currency pair. Expected {CurrencyPair.HUMAN_READABLE_STR_FORMAT}."
-        if "/" in pair_str:
-            items = pair_str.split("/")
-            if len(items) != 2:
-                raise ValueError(parse_error)
-            return CurrencyPair(items[0], items[1])
-        else:
-            if len(pair_str) != 6:
-                raise ValueError(parse_error)
-            return CurrencyPair(pair_str[0:3], pair_str[3:6])
-
-
-@dataclass(frozen=True)
-class DateRange:
+        """
+        :param pair_str: Currency pair string (parsed strings are memoized, the same currency pair
+            instance is returned for the same string)
+        """
+        return _parse_currency_pair(pair_str)
+
+
+@functools.lru_cache(maxsize=PARSED_CURRENCY_PAIRS_CACHE_SIZE)
+def _parse_currency_pair(pair_str: str) -> CurrencyPair:
+    parse_error = f"{pair_str} is not a valid currency pair. Expected {CurrencyPair.HUMAN_READABLE_STR_FORMAT}."
+    if "/" in pair_str:
+        items = pair_str.split("/")
+        if len(items) != 2:
+            raise ValueError(parse_error)
+        return CurrencyPair(items[0], items[1])
+    else:
+        if len(pair_str) != 6:
+            raise ValueError(parse_error)
+        return CurrencyPair(pair_str[0:3], pair_str[3:6])
+
+
+@dataclass(frozen=True, eq=False)
+class DateRange(object):
+    __slots__ = ("start_date", "end_date")
+
     start_date: date
     end_date: date
 
-    def __post_init__(self) -> None:
-        if not isinstance(self.start_date, date):
+    def __init__(self, start_date: date, end_date: date) -> None:
+        """Immutable range of dates (both start and end dates are included)."""
+        if not isinstance(start_date, date):
             raise TypeError(
-                f"start date ({self.start_date}) has unexpected type {type(self.start_date).__name__},"
+                f"start date ({start_date}) has unexpected type {type(start_date).__name__},"
                 f" expected date instead"
             )
-        if not isinstance(self.start_date, date):
-            raise ValueError(
-                f"end date ({self.end_date}) has unexpected type {type(self.end_date).__name__},"
+        if not isinstance(end_date, date):
+            raise TypeError(
+                f"end date ({end_date}) has unexpected type {type(end_date).__name__},"
                 f" expected date instead"
             )
-        if self.start_date > self.end_date:
+        if start_date > end_date:
             raise ValueError(
-                f"Invalid date range {self}: start date must be before or the same as end date"
+                f"Invalid date range DateRange(start_date={start_date!r}, end_date={end_date!r}):"
+                f" start date must be before or the same as end date"
             )
+        _set_start_date(self, start_date)
+        _set_end_date(self, end_date)
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.start_date == other.start_date and self.end_date == other.end_date
+
+    def __hash__(self) -> int:
+        return hash((self.start_date, self.end_date))
+
+    def __reduce__(self):
+        return type(self), (self.start_date, self.end_date)
 
     def __len__(self) -> int:
         return (self.end_date - self.start_date).days + 1
@@ -86,6 +166,27 @@ class DateRange:
             yield current_date
             current_date += timedelta(days=1)
 
+    def chunks(self, days: int) -> Iterator["DateRange"]:
+        """
+        :param days: Number of days of each chunk
+        :return: Consecutive date ranges of (at most) the provided number of days covering this range
+        """
+        if days < 1:
+            raise ValueError(f"invalid chunk size: {days} days")
+        current_date = self.start_date
+        while current_date <= self.end_date:
+            chunk_end_date = min(current_date + timedelta(days=days - 1), self.end_date)
+            yield DateRange(current_date, chunk_end_date)
+            current_date = chunk_end_date + timedelta(days=1)
+
+
+# Slot descriptors, used to set the fields of the (immutable) instances when they are created
+_set_domestic = CurrencyPair.__dict__["domestic"].__set__
+_set_foreign = CurrencyPair.__dict__["foreign"].__set__
+_set_hash = CurrencyPair.__dict__["_hash"].__set__
+_set_start_date = DateRange.__dict__["start_date"].__set__
+_set_end_date = DateRange.__dict__["end_date"].__set__
+
 
 DateRangeType = Union[DateRange, Tuple[date, date]]
 
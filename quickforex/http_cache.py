@@ -0,0 +1,119 @@
+from typing import Any, Optional
+from pathlib import Path
+import threading
+import tempfile
+import hashlib
+import math
+import json
+import time
+import os
+
+from quickforex.logger import get_module_logger
+
+
+logger = get_module_logger(__name__)
+
+
+NEVER_EXPIRES = math.inf
+
+
+def make_cache_key(resource_url: str, params: Optional[dict[str, Any]]) -> str:
+    """Content address of a request: digest of the resource URL and (sorted) query parameters."""
+    normalized_params = sorted((str(k), str(v)) for k, v in (params or {}).items())
+    raw_key = json.dumps([resource_url, normalized_params])
+    return hashlib.sha256(raw_key.encode()).hexdigest()
+
+
+class DiskCache(object):
+    def __init__(self, directory: str, max_size_bytes: int = 256 * 1024 * 1024):
+        """Persistent cache of decoded response payloads, stored as one JSON file per entry.
+
+        :param directory: Cache directory (created if it does not exist)
+        :param max_size_bytes: When the cache grows beyond this size, the least recently used
+            entries are evicted.
+        """
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._max_size_bytes = max_size_bytes
+        self._lock = threading.Lock()
+        self._size_bytes = sum(path.stat().st_size for path in self._entries())
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size_bytes
+
+    def _entries(self) -> list[Path]:
+        return list(self._directory.glob("*/*.json"))
+
+    def _entry_path(self, key: str) -> Path:
+        return self._directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        :param key: Cache key
+        :return: Cached payload, None if there is no (or only an expired) entry for this key
+        """
+        path = self._entry_path(key)
+        try:
+            with path.open() as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry["expires_at"] is not None and entry["expires_at"] < time.time():
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry["payload"]
+
+    def put(self, key: str, payload: Any, ttl: float = NEVER_EXPIRES) -> None:
+        """
+        :param key: Cache key
+        :param payload: JSON-serializable payload
+        :param ttl: Time to live (in seconds) of the entry, the entry never expires when set to NEVER_EXPIRES
+        """
+        expires_at = None if ttl == NEVER_EXPIRES else time.time() + ttl
+        data = json.dumps({"expires_at": expires_at, "payload": payload}).encode()
+        path = self._entry_path(key)
+        path.parent.mkdir(exist_ok=True)
+        with self._lock:
+            previous_size = path.stat().st_size if path.exists() else 0
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            self._size_bytes += len(data) - previous_size
+            if self._size_bytes > self._max_size_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        self._size_bytes = sum(size for _, size, _ in entries)
+        target_size = self._max_size_bytes * 0.9
+        for _, size, path in entries:
+            if self._size_bytes <= target_size:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            self._size_bytes -= size
+        logger.debug(f"evicted cache entries, cache size is now {self._size_bytes}B")
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in self._entries():
+                path.unlink()
+            self._size_bytes = 0
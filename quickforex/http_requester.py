@@ -1,17 +1,279 @@
-from typing import Any, Optional
+from typing import Any, Awaitable, Callable, Iterator, Optional
+from dataclasses import dataclass
+from collections import deque
+from concurrent import futures
+import contextvars
+import threading
+import asyncio
+import logging
+import time
 import json
 
 import requests
+import urllib3
+from requests.adapters import HTTPAdapter
 
+from quickforex.http_cache import DiskCache, make_cache_key
+from quickforex.concurrency import SingleFlight
+from quickforex.deadline import Deadline, DeadlineExceededError, current_deadline
+from quickforex.errors import QuickForexError
 from quickforex.logger import get_module_logger
+from quickforex.json_stream import StreamedObjectParser
 
 
 logger = get_module_logger(__name__)
 
 
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+ResponseObserver = Callable[[str, Optional[dict[str, str]], int, float], None]
+
+
+@dataclass(frozen=True)
+class SessionSettings:
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    pool_block: bool = False
+    keep_alive: bool = True
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+
+
+@dataclass(frozen=True)
+class HedgingPolicy:
+    percentile: float = 0.95
+    min_samples: int = 20
+    window: int = 200
+
+
+class HttpSession(object):
+    def __init__(self, settings: Optional[SessionSettings] = None):
+        """Pool of keep-alive HTTP connections.
+
+        :param settings: Pool settings:
+            - pool_connections: number of hosts for which a connection pool is kept
+            - pool_maxsize: maximum number of connections kept alive per host
+            - pool_block: when set, never open more than pool_maxsize connections to the same
+                host (callers wait for a connection to be released instead)
+            - keep_alive: when unset, connections are closed after each request
+            - connect_timeout: maximum time (in seconds) to establish a connection
+            - read_timeout: maximum time (in seconds) to wait for the server between two bytes
+        """
+        self._settings = settings or SessionSettings()
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self._settings.pool_connections,
+            pool_maxsize=self._settings.pool_maxsize,
+            pool_block=self._settings.pool_block,
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        if not self._settings.keep_alive:
+            self._session.headers["Connection"] = "close"
+
+    @property
+    def settings(self) -> SessionSettings:
+        return self._settings
+
+    def get(
+        self,
+        url: str,
+        params: Optional[dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        """
+        :param url: Resource URL
+        :param params: Query parameters
+        :param timeout: When provided, connect and read timeouts are capped to this value (in seconds)
+        :param stream: When set, the response body is not downloaded before returning (see
+            requests.Response.iter_content). The response must be closed by the caller.
+        :return: Response
+        """
+        connect_timeout = self._settings.connect_timeout
+        read_timeout = self._settings.read_timeout
+        if timeout is not None:
+            connect_timeout = min(connect_timeout, timeout)
+            read_timeout = min(read_timeout, timeout)
+        return self._session.get(
+            url,
+            params=params,
+            timeout=(connect_timeout, read_timeout),
+            stream=stream,
+        )
+
+    def close(self) -> None:
+        self._session.close()
+
+    def __enter__(self) -> "HttpSession":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+_SHARED_SESSIONS: dict[SessionSettings, HttpSession] = {}
+_SHARED_SESSIONS_LOCK = threading.Lock()
+
+
+def get_shared_session(settings: Optional[SessionSettings] = None) -> HttpSession:
+    """Retrieve the session shared by all requesters configured with the same settings.
+
+    :param settings: Pool settings (default settings if not provided)
+    :return: Shared session
+    """
+    settings = settings or SessionSettings()
+    with _SHARED_SESSIONS_LOCK:
+        if settings not in _SHARED_SESSIONS:
+            _SHARED_SESSIONS[settings] = HttpSession(settings)
+        return _SHARED_SESSIONS[settings]
+
+
+def close_shared_sessions() -> None:
+    """Close all the shared sessions (new sessions are created on demand afterwards)."""
+    with _SHARED_SESSIONS_LOCK:
+        for session in _SHARED_SESSIONS.values():
+            session.close()
+        _SHARED_SESSIONS.clear()
+
+
+class LatencyTracker(object):
+    def __init__(self, window: int):
+        """Keep track of the latency of the last `window` requests."""
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float) -> None:
+        with self._lock:
+            self._samples.append(latency)
+
+    def percentile(self, percentile: float, min_samples: int = 1) -> Optional[float]:
+        """
+        :param percentile: Percentile, between 0 and 1
+        :param min_samples: Minimum number of samples required to compute the percentile
+        :return: Latency percentile (in seconds), None when there are not enough samples
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples or len(samples) < min_samples:
+            return None
+        index = min(int(percentile * len(samples)), len(samples) - 1)
+        return samples[index]
+
+
+def _log_response(response_payload: Any) -> None:
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"received response {json.dumps(response_payload)}")
+
+
+def _notify_response_observers(
+    observers: list[ResponseObserver],
+    endpoint: str,
+    params: Optional[dict[str, str]],
+    size: int,
+    latency: float,
+) -> None:
+    for observer in observers:
+        try:
+            observer(endpoint, params, size, latency)
+        except Exception as e:
+            logger.warning(f"response observer failed: {e}")
+
+
+def _iter_received_chunks(response: requests.Response) -> Iterator[bytes]:
+    """Iterate over the chunks of a streamed response body as soon as they are received (rather than
+    once STREAM_CHUNK_SIZE bytes are received, as requests.Response.iter_content does)."""
+    raw = response.raw
+    if not hasattr(raw, "read1"):
+        # urllib3 < 2.0
+        yield from response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+        return
+    try:
+        while True:
+            chunk = raw.read1(STREAM_CHUNK_SIZE, decode_content=True)
+            if not chunk:
+                return
+            yield chunk
+    except urllib3.exceptions.ProtocolError as e:
+        raise requests.exceptions.ChunkedEncodingError(e)
+    except urllib3.exceptions.DecodeError as e:
+        raise requests.exceptions.ContentDecodingError(e)
+    except urllib3.exceptions.ReadTimeoutError as e:
+        raise requests.exceptions.ConnectionError(e)
+
+
+def _iter_body(
+    response: requests.Response, deadline: Optional[Deadline]
+) -> Iterator[bytes]:
+    """Iterate over the chunks of a streamed response body, checking the deadline between chunks:
+    the timeout passed to the session only bounds the connection and each socket read, so a server
+    trickling its response could otherwise hold the request past the deadline.
+    """
+    try:
+        for chunk in _iter_received_chunks(response):
+            if deadline is not None:
+                deadline.check()
+            yield chunk
+    except requests.RequestException:
+        if deadline is not None and deadline.expired:
+            raise DeadlineExceededError(deadline.timeout)
+        raise
+
+
 class HttpRequesterBase(object):
-    def __init__(self, api_url: str):
+    json_decoder = json.JSONDecoder()
+
+    def __init__(
+        self,
+        api_url: str,
+        session: Optional[HttpSession] = None,
+        hedging: Optional[HedgingPolicy] = None,
+        cache: Optional[DiskCache] = None,
+        coalesce: bool = True,
+    ):
+        """
+        :param api_url: Base URL of the API
+        :param session: Session used to send requests. When not provided, the requester owns a
+            dedicated session which is released by close().
+        :param hedging: When provided, a duplicate request is sent when a request did not complete
+            after the configured latency percentile (computed over the last requests), and the
+            first response received is used.
+        :param cache: When provided, successful responses are stored in this cache for the time to
+            live returned by response_cache_ttl_hook, and served from it until they expire.
+        :param coalesce: When enabled, concurrent identical requests (same endpoint and parameters)
+            are coalesced: a single request is sent and its response payload (or error) is shared
+            by all the callers.
+        """
         self._api_url = api_url
+        self._owns_session = session is None
+        self._session = session or HttpSession()
+        self._hedging = hedging
+        self._cache = cache
+        self._singleflight = SingleFlight() if coalesce else None
+        self._latency = LatencyTracker(hedging.window if hedging else 200)
+        self._hedging_executor: Optional[futures.ThreadPoolExecutor] = None
+        self._hedging_executor_lock = threading.Lock()
+        self._response_observers: list[ResponseObserver] = []
+
+    @property
+    def session(self) -> HttpSession:
+        return self._session
+
+    @property
+    def latency(self) -> LatencyTracker:
+        return self._latency
+
+    def add_response_observer(self, observer: ResponseObserver) -> None:
+        """
+        :param observer: Called with the endpoint, the query parameters, the payload size (in bytes)
+            and the latency (in seconds) of each response received from the API (responses served
+            from the cache or shared with coalesced requests are not observed)
+        """
+        self._response_observers.append(observer)
+
+    def response_decode_hook(self, content: bytes) -> Any:
+        return self.json_decoder.decode(content.decode("utf-8"))
 
     def response_check_hook(self, response_payload: Any) -> None:
         pass
@@ -19,17 +281,353 @@ class HttpRequesterBase(object):
     def response_transform_hook(self, response_payload: Any) -> Any:
         return response_payload
 
+    def response_cache_ttl_hook(
+        self, endpoint: str, params: Optional[dict[str, str]]
+    ) -> Optional[float]:
+        """
+        :return: Time to live (in seconds) of the cached response to this request (NEVER_EXPIRES for
+            immutable responses), None if the response must not be cached.
+        """
+        return None
+
     def _handle_response(self, response: requests.Response) -> Any:
         response.raise_for_status()
-        response_payload = response.json()
-        logger.debug(f"received response {json.dumps(response_payload)}")
+        response_payload = self.response_decode_hook(response.content)
+        _log_response(response_payload)
         self.response_check_hook(response_payload)
-        return self.response_transform_hook(response_payload)
+        return response_payload
+
+    def _send(
+        self, resource_url: str, params: Optional[dict[str, str]], stream: bool = False
+    ) -> requests.Response:
+        deadline = current_deadline()
+        if deadline is not None:
+            deadline.check()
+        start = time.monotonic()
+        try:
+            response = self._session.get(
+                resource_url,
+                params=params,
+                timeout=deadline.remaining if deadline else None,
+                stream=True,
+            )
+        except requests.Timeout:
+            if deadline is not None and deadline.expired:
+                raise DeadlineExceededError(deadline.timeout)
+            raise
+        if not stream:
+            with response:
+                # Same as requests.Response.content, with the deadline checked between chunks
+                response._content = b"".join(_iter_body(response, deadline))
+        self._latency.record(time.monotonic() - start)
+        return response
+
+    def _get_hedging_executor(self) -> futures.ThreadPoolExecutor:
+        with self._hedging_executor_lock:
+            if self._hedging_executor is None:
+                self._hedging_executor = futures.ThreadPoolExecutor(
+                    thread_name_prefix="quickforex-hedging"
+                )
+            return self._hedging_executor
+
+    def _send_hedged(
+        self, resource_url: str, params: Optional[dict[str, str]], hedge_after: float
+    ) -> requests.Response:
+        executor = self._get_hedging_executor()
+        pending = {
+            executor.submit(
+                contextvars.copy_context().run, self._send, resource_url, params
+            )
+        }
+        done, pending = futures.wait(pending, timeout=hedge_after)
+        if not done:
+            logger.debug(
+                f"request to {resource_url} did not complete after {hedge_after:.3f}s,"
+                f" sending hedged request"
+            )
+            pending.add(
+                executor.submit(
+                    contextvars.copy_context().run, self._send, resource_url, params
+                )
+            )
+        while True:
+            for future in done:
+                if future.exception() is None or not pending:
+                    return future.result()
+            done, pending = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
 
     def get(self, endpoint: str, params: Optional[dict[str, str]] = None) -> Any:
         resource_url = f"{self._api_url}/{endpoint}"
         logger.debug(
             f"sending request to {resource_url} with params={json.dumps(params)}"
         )
-        response = requests.get(resource_url, params=params)
-        return self._handle_response(response)
+        cache_ttl = (
+            self.response_cache_ttl_hook(endpoint, params) if self._cache else None
+        )
+        request_key = (
+            make_cache_key(resource_url, params)
+            if cache_ttl or self._singleflight
+            else None
+        )
+        if cache_ttl:
+            response_payload = self._cache.get(request_key)
+            if response_payload is not None:
+                logger.debug(f"serving response to {resource_url} from cache")
+                return self.response_transform_hook(response_payload)
+        if self._singleflight is None:
+            response_payload = self._fetch(
+                endpoint, resource_url, params, request_key, cache_ttl
+            )
+        else:
+            response_payload = self._singleflight.do(
+                request_key,
+                lambda: self._fetch(
+                    endpoint, resource_url, params, request_key, cache_ttl
+                ),
+            )
+        return self.response_transform_hook(response_payload)
+
+    def _fetch(
+        self,
+        endpoint: str,
+        resource_url: str,
+        params: Optional[dict[str, str]],
+        request_key: Optional[str],
+        cache_ttl: Optional[float],
+    ) -> Any:
+        hedge_after = (
+            self._latency.percentile(
+                self._hedging.percentile, self._hedging.min_samples
+            )
+            if self._hedging
+            else None
+        )
+        start = time.monotonic()
+        if hedge_after is None:
+            response = self._send(resource_url, params)
+        else:
+            response = self._send_hedged(resource_url, params, hedge_after)
+        response_payload = self._handle_response(response)
+        _notify_response_observers(
+            self._response_observers,
+            endpoint,
+            params,
+            len(response.content),
+            time.monotonic() - start,
+        )
+        if cache_ttl:
+            self._cache.put(request_key, response_payload, ttl=cache_ttl)
+        return response_payload
+
+    def get_streamed(
+        self,
+        endpoint: str,
+        params: Optional[dict[str, str]],
+        stream_key: str,
+        on_entry: Callable[[str, Any], None],
+    ) -> Any:
+        """Send a request and parse its (JSON object) response payload while it is received.
+
+        The members of the stream_key object of the payload are passed to on_entry as soon as they
+        are parsed, so the payload is never held in memory as a whole. Streamed requests are
+        neither hedged nor coalesced. Cacheable responses are not streamed: they are retrieved with
+        get() and their members are passed to on_entry afterwards.
+
+        :param endpoint: API endpoint
+        :param params: Query parameters
+        :param stream_key: Key of the (top level) object which members are streamed
+        :param on_entry: Called with the key and the value of each streamed member
+        :return: Response payload, without the stream_key member
+        """
+        if self._cache and self.response_cache_ttl_hook(endpoint, params):
+            response_payload = dict(self.get(endpoint, params))
+            for key, value in response_payload.pop(stream_key, {}).items():
+                on_entry(key, value)
+            return response_payload
+        resource_url = f"{self._api_url}/{endpoint}"
+        logger.debug(
+            f"sending streamed request to {resource_url} with params={json.dumps(params)}"
+        )
+        start = time.monotonic()
+        size = 0
+        with self._send(resource_url, params, stream=True) as response:
+            response.raise_for_status()
+            parser = StreamedObjectParser(stream_key, on_entry, self.json_decoder)
+            for chunk in _iter_body(response, current_deadline()):
+                size += len(chunk)
+                parser.feed(chunk)
+            response_payload = parser.close()
+        _notify_response_observers(
+            self._response_observers,
+            endpoint,
+            params,
+            size,
+            time.monotonic() - start,
+        )
+        _log_response(response_payload)
+        self.response_check_hook(response_payload)
+        return self.response_transform_hook(response_payload)
+
+    def close(self) -> None:
+        with self._hedging_executor_lock:
+            if self._hedging_executor is not None:
+                self._hedging_executor.shutdown(wait=False)
+                self._hedging_executor = None
+        if self._owns_session:
+            self._session.close()
+
+    def __enter__(self) -> "HttpRequesterBase":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+def _import_aiohttp():
+    try:
+        import aiohttp
+    except ImportError:
+        raise QuickForexError(
+            "the asynchronous API requires the 'aiohttp' package"
+            " (hint: pip install quickforex[async])"
+        )
+    return aiohttp
+
+
+class AsyncHttpRequesterBase(object):
+    json_decoder = json.JSONDecoder()
+
+    def __init__(self, api_url: str, settings: Optional[SessionSettings] = None):
+        """Asynchronous counterpart of HttpRequesterBase, backed by an aiohttp session.
+
+        The underlying session is bound to the event loop running the first request and is
+        released by close().
+
+        :param api_url: Base URL of the API
+        :param settings: Pool settings (pool_maxsize is the maximum number of connections per host)
+        """
+        self._api_url = api_url
+        self._settings = settings or SessionSettings()
+        self._session = None
+        self._response_observers: list[ResponseObserver] = []
+
+    def add_response_observer(self, observer: ResponseObserver) -> None:
+        """See HttpRequesterBase.add_response_observer"""
+        self._response_observers.append(observer)
+
+    def response_decode_hook(self, content: bytes) -> Any:
+        return self.json_decoder.decode(content.decode("utf-8"))
+
+    def response_check_hook(self, response_payload: Any) -> None:
+        pass
+
+    def response_transform_hook(self, response_payload: Any) -> Any:
+        return response_payload
+
+    def _get_session(self):
+        if self._session is None:
+            aiohttp = _import_aiohttp()
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self._settings.pool_connections * self._settings.pool_maxsize,
+                    limit_per_host=self._settings.pool_maxsize,
+                    force_close=not self._settings.keep_alive,
+                ),
+                timeout=aiohttp.ClientTimeout(
+                    sock_connect=self._settings.connect_timeout,
+                    sock_read=self._settings.read_timeout,
+                ),
+            )
+        return self._session
+
+    async def _fetch(
+        self, endpoint: str, resource_url: str, params: dict[str, str]
+    ) -> Any:
+        start = time.monotonic()
+        async with self._get_session().get(resource_url, params=params) as response:
+            response.raise_for_status()
+            content = await response.read()
+        _notify_response_observers(
+            self._response_observers,
+            endpoint,
+            params,
+            len(content),
+            time.monotonic() - start,
+        )
+        return self.response_decode_hook(content)
+
+    async def _fetch_streamed(
+        self,
+        endpoint: str,
+        resource_url: str,
+        params: dict[str, str],
+        parser: StreamedObjectParser,
+    ) -> Any:
+        start = time.monotonic()
+        size = 0
+        async with self._get_session().get(resource_url, params=params) as response:
+            response.raise_for_status()
+            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                size += len(chunk)
+                parser.feed(chunk)
+        _notify_response_observers(
+            self._response_observers,
+            endpoint,
+            params,
+            size,
+            time.monotonic() - start,
+        )
+        return parser.close()
+
+    async def get(self, endpoint: str, params: Optional[dict[str, str]] = None) -> Any:
+        resource_url = f"{self._api_url}/{endpoint}"
+        logger.debug(
+            f"sending request to {resource_url} with params={json.dumps(params)}"
+        )
+        params = {key: str(value) for key, value in (params or {}).items()}
+        return await self._request(lambda: self._fetch(endpoint, resource_url, params))
+
+    async def get_streamed(
+        self,
+        endpoint: str,
+        params: Optional[dict[str, str]],
+        stream_key: str,
+        on_entry: Callable[[str, Any], None],
+    ) -> Any:
+        """Asynchronous counterpart of HttpRequesterBase.get_streamed"""
+        resource_url = f"{self._api_url}/{endpoint}"
+        logger.debug(
+            f"sending streamed request to {resource_url} with params={json.dumps(params)}"
+        )
+        params = {key: str(value) for key, value in (params or {}).items()}
+        parser = StreamedObjectParser(stream_key, on_entry, self.json_decoder)
+        return await self._request(
+            lambda: self._fetch_streamed(endpoint, resource_url, params, parser)
+        )
+
+    async def _request(self, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        deadline = current_deadline()
+        if deadline is not None:
+            deadline.check()
+        try:
+            response_payload = await asyncio.wait_for(
+                fetch(), timeout=deadline.remaining if deadline else None
+            )
+        except asyncio.TimeoutError:
+            if deadline is not None and deadline.expired:
+                raise DeadlineExceededError(deadline.timeout)
+            raise
+        _log_response(response_payload)
+        self.response_check_hook(response_payload)
+        return self.response_transform_hook(response_payload)
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> "AsyncHttpRequesterBase":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
@@ -0,0 +1,270 @@
+from typing import Any, Callable, Optional
+import codecs
+import json
+import re
+
+
+_WHITESPACE = " \t\n\r"
+
+# Characters which can end (or change the nesting of) a value being scanned
+_STRING_SPECIAL = re.compile(r'["\\]')
+_CONTAINER_SPECIAL = re.compile(r'["{}\[\]]')
+_SCALAR_END = re.compile(r"[,:}\]\s]")
+
+_OBJECT_START = 0
+_KEY = 1
+_FIRST_KEY = 2
+_COLON = 3
+_VALUE = 4
+_NEXT = 5
+_DONE = 6
+
+
+class _ValueScanner(object):
+    def __init__(self):
+        """Finds the end of a JSON value received in chunks, without decoding it.
+
+        The scan state (nesting depth, position in a string) is kept between calls, so that each
+        character of the value is scanned once whatever the number of chunks it spans.
+        """
+        self._started = False
+        self._scalar = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    @property
+    def scalar(self) -> bool:
+        return self._scalar
+
+    def scan(self, text: str, pos: int) -> int:
+        """
+        :param text: Text containing the value (first call) or its continuation (next calls)
+        :param pos: Position from which text is scanned (start of the value on the first call)
+        :return: Position following the end of the value in text, or -1 if the value continues
+        """
+        if not self._started:
+            self._started = True
+            char = text[pos]
+            if char == '"':
+                self._in_string = True
+                pos += 1
+            elif char in "{[":
+                self._depth = 1
+                pos += 1
+            else:
+                self._scalar = True
+        if self._scalar:
+            # Numbers and literals end with the first delimiter (or with the document)
+            match = _SCALAR_END.search(text, pos)
+            return match.start() if match else -1
+        while True:
+            if self._in_string:
+                if self._escaped:
+                    if pos >= len(text):
+                        return -1
+                    pos += 1
+                    self._escaped = False
+                match = _STRING_SPECIAL.search(text, pos)
+                if match is None:
+                    return -1
+                pos = match.end()
+                if match.group() == "\\":
+                    self._escaped = True
+                    continue
+                self._in_string = False
+                if self._depth == 0:
+                    return pos
+                continue
+            match = _CONTAINER_SPECIAL.search(text, pos)
+            if match is None:
+                return -1
+            pos = match.end()
+            char = match.group()
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    return pos
+
+
+class StreamedObjectParser(object):
+    def __init__(
+        self,
+        stream_key: str,
+        on_entry: Callable[[str, Any], None],
+        decoder: Optional[json.JSONDecoder] = None,
+    ):
+        """Incremental parser of a JSON object received in chunks.
+
+        The members of the object found under stream_key (at the top level) are passed to on_entry
+        as soon as they are parsed and are not kept by the parser: only the current chunk and the
+        member being parsed are held in memory. The other top level members are kept and returned
+        by close().
+
+        :param stream_key: Key of the top level member which members are streamed
+        :param on_entry: Called with the key and the (decoded) value of each streamed member
+        :param decoder: JSON decoder used to decode the values (default decoder if not provided)
+        """
+        self._stream_key = stream_key
+        self._on_entry = on_entry
+        self._decoder = decoder or json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._state = _OBJECT_START
+        self._streaming = False
+        self._key: Optional[str] = None
+        self._payload: dict[str, Any] = {}
+        # Value spanning several chunks: its chunks are kept aside (and the value is decoded) only
+        # until its end is found by the scanner, instead of being decoded again with each chunk.
+        self._scanner: Optional[_ValueScanner] = None
+        self._pending: list[str] = []
+        self._value_end: Optional[int] = None
+
+    def feed(self, data: bytes) -> None:
+        """
+        :param data: Next chunk of the UTF-8 encoded document
+        """
+        if self._append(self._text_decoder.decode(data), final=False):
+            self._parse(final=False)
+
+    def close(self) -> dict[str, Any]:
+        """
+        :return: Top level members of the object, except the streamed one
+        """
+        self._append(self._text_decoder.decode(b"", final=True), final=True)
+        self._parse(final=True)
+        if self._state != _DONE or self._buffer[self._pos :].strip(_WHITESPACE):
+            raise json.JSONDecodeError(
+                "truncated or invalid JSON object", self._buffer, self._pos
+            )
+        return self._payload
+
+    def _append(self, text: str, final: bool) -> bool:
+        if self._scanner is None:
+            self._buffer = self._buffer[self._pos :] + text
+            self._pos = 0
+            return True
+        end = self._scanner.scan(text, 0)
+        self._pending.append(text)
+        if end < 0:
+            if not final:
+                return False
+            if not self._scanner.scalar:
+                self._buffer = "".join(self._pending)
+                raise json.JSONDecodeError("truncated JSON value", self._buffer, 0)
+            end = len(text)
+        self._buffer = "".join(self._pending)
+        self._pos = 0
+        self._value_end = len(self._buffer) - len(text) + end
+        self._scanner = None
+        self._pending = []
+        return True
+
+    def _next_char(self) -> Optional[str]:
+        while self._pos < len(self._buffer):
+            char = self._buffer[self._pos]
+            if char not in _WHITESPACE:
+                return char
+            self._pos += 1
+        return None
+
+    def _decode(self, final: bool) -> tuple[bool, Any]:
+        value_end, self._value_end = self._value_end, None
+        if value_end is None:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # A number is complete only when followed by a delimiter ('1.' is decoded as 1)
+                if (
+                    final
+                    or self._buffer[end - 1] in '"}]'
+                    or _SCALAR_END.match(self._buffer, end)
+                ):
+                    self._pos = end
+                    return True, value
+            except json.JSONDecodeError:
+                if final:
+                    raise
+            # The value could be continued in the next chunk: its end is scanned only once
+            scanner = _ValueScanner()
+            value_end = scanner.scan(self._buffer, self._pos)
+            if value_end < 0:
+                self._scanner = scanner
+                self._pending = [self._buffer[self._pos :]]
+                self._pos = len(self._buffer)
+                return False, None
+        value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        if end != value_end:
+            raise json.JSONDecodeError("invalid JSON value", self._buffer, end)
+        self._pos = end
+        return True, value
+
+    def _unexpected(self, char: str, expected: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(
+            f"expected {expected}, found '{char}'", self._buffer, self._pos
+        )
+
+    def _parse(self, final: bool) -> None:
+        while self._state != _DONE:
+            char = self._next_char()
+            if char is None:
+                return
+            if self._state == _OBJECT_START:
+                if char != "{":
+                    raise self._unexpected(char, "'{'")
+                self._pos += 1
+                self._state = _FIRST_KEY
+            elif self._state in (_KEY, _FIRST_KEY):
+                if char == "}" and self._state == _FIRST_KEY:
+                    self._pos += 1
+                    self._end_object()
+                    continue
+                if char != '"':
+                    raise self._unexpected(char, "key")
+                complete, self._key = self._decode(final)
+                if not complete:
+                    return
+                self._state = _COLON
+            elif self._state == _COLON:
+                if char != ":":
+                    raise self._unexpected(char, "':'")
+                self._pos += 1
+                self._state = _VALUE
+            elif self._state == _VALUE:
+                if (
+                    not self._streaming
+                    and self._key == self._stream_key
+                    and char == "{"
+                ):
+                    self._pos += 1
+                    self._streaming = True
+                    self._state = _FIRST_KEY
+                    continue
+                complete, value = self._decode(final)
+                if not complete:
+                    return
+                if self._streaming:
+                    self._on_entry(self._key, value)
+                else:
+                    self._payload[self._key] = value
+                self._state = _NEXT
+            elif self._state == _NEXT:
+                self._pos += 1
+                if char == ",":
+                    self._state = _KEY
+                elif char == "}":
+                    self._end_object()
+                else:
+                    self._pos -= 1
+                    raise self._unexpected(char, "',' or '}'")
+
+    def _end_object(self) -> None:
+        if self._streaming:
+            self._streaming = False
+            self._state = _NEXT
+        else:
+            self._state = _DONE
@@ -0,0 +1,57 @@
+from typing import Any, Optional, Hashable
+from collections import OrderedDict
+import threading
+import time
+
+
+class LruCache(object):
+    def __init__(self, max_entries: int):
+        """Thread-safe in-memory cache with per-entry time to live and least recently used eviction.
+
+        :param max_entries: Maximum number of entries, the least recently used entry is evicted
+            when an entry is added to a full cache.
+        """
+        self._max_entries = max_entries
+        self._entries: OrderedDict[
+            Hashable, tuple[Any, Optional[float]]
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_entries(self) -> int:
+        return self._max_entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        :param key: Entry key
+        :param value: Entry value
+        :param ttl: Time to live of the entry (in seconds), the entry never expires when None
+        """
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,125 @@
+from typing import Callable, Union
+from decimal import Decimal
+import enum
+
+from quickforex.errors import QuickForexError
+
+
+RateType = Union[Decimal, float, int]
+
+
+class NumericMode(enum.Enum):
+    DECIMAL = "decimal"
+    FLOAT = "float"
+    INT64 = "int64"
+
+    @staticmethod
+    def parse(mode_str: str) -> "NumericMode":
+        try:
+            return NumericMode(mode_str.strip().lower())
+        except ValueError:
+            raise QuickForexError(
+                f"unexpected numeric mode '{mode_str}'"
+                f" (expected one of: {', '.join(mode.value for mode in NumericMode)})"
+            )
+
+    @staticmethod
+    def of(rate: RateType) -> "NumericMode":
+        """
+        :return: Numeric mode producing rates of the same type as the provided rate
+        """
+        if isinstance(rate, int):
+            return NumericMode.INT64
+        if isinstance(rate, float):
+            return NumericMode.FLOAT
+        return NumericMode.DECIMAL
+
+
+def rate_converter(
+    numeric_mode: NumericMode, decimal_places: int
+) -> Callable[[Union[float, Decimal]], RateType]:
+    """
+    :param numeric_mode: Numeric mode:
+        - DECIMAL: rates are decimal.Decimal
+        - FLOAT: rates are float
+        - INT64: rates are int, scaled by 10^decimal_places (fixed-point)
+    :param decimal_places: Number of decimal places of the rates
+    :return: Function converting a rate to the representation of the numeric mode
+    """
+    if numeric_mode is NumericMode.FLOAT:
+        return float
+    if numeric_mode is NumericMode.INT64:
+        scale = 10**decimal_places
+        return lambda rate: rate if isinstance(rate, int) else round(rate * scale)
+    return Decimal
+
+
+def decimal_rate(
+    rate: RateType, numeric_mode: NumericMode, decimal_places: int
+) -> Decimal:
+    """Inverse of rate_converter.
+
+    :param rate: Rate in the representation of the numeric mode
+    :param numeric_mode: Numeric mode of the rate
+    :param decimal_places: Number of decimal places of the rates (scale of INT64 rates)
+    :return: Unscaled decimal rate (floats are converted from their shortest decimal literal)
+    """
+    if numeric_mode is NumericMode.INT64 and isinstance(rate, int):
+        return Decimal(rate).scaleb(-decimal_places)
+    if isinstance(rate, float):
+        return Decimal(repr(rate))
+    return Decimal(rate)
+
+
+def _scaled_int_parser(decimal_places: int) -> Callable[[Union[str, float, int]], int]:
+    scale = 10**decimal_places
+    padding = ["0" * count for count in range(decimal_places + 1)]
+
+    def parse(rate: Union[str, float, int]) -> int:
+        if isinstance(rate, str):
+            integral, _, fraction = rate.partition(".")
+            missing_places = decimal_places - len(fraction)
+            if missing_places >= 0:
+                try:
+                    return int(integral + fraction + padding[missing_places])
+                except ValueError:  # Exponent notation
+                    pass
+            return round(Decimal(rate).scaleb(decimal_places))
+        if isinstance(rate, int):
+            return rate * scale
+        return round(rate * scale)
+
+    return parse
+
+
+def rate_parser(
+    numeric_mode: NumericMode, decimal_places: int
+) -> Callable[[Union[str, float, int]], RateType]:
+    """Unlike rate_converter, the parsed rates are never in the representation of the numeric mode
+    already (integers are not considered scaled).
+
+    :param numeric_mode: Numeric mode
+    :param decimal_places: Number of decimal places of the rates
+    :return: Function parsing a rate decoded from a JSON payload (number literal, or number) to the
+        representation of the numeric mode. Number literals are parsed without going through float.
+    """
+    if numeric_mode is NumericMode.FLOAT:
+        return float
+    if numeric_mode is NumericMode.INT64:
+        return _scaled_int_parser(decimal_places)
+    return lambda rate: Decimal(rate if isinstance(rate, str) else str(rate))
+
+
+def buffer_value_parser(
+    numeric_mode: NumericMode, decimal_places: int
+) -> Callable[[Union[str, float, int]], Union[float, int]]:
+    """
+    :param numeric_mode: Numeric mode
+    :param decimal_places: Number of decimal places of the rates
+    :return: Function parsing a rate decoded from a JSON payload to the value stored in the buffer
+        of a rates series (see RateSeriesBuilder.set_value). DECIMAL rates are stored as doubles,
+        which the series converts back to their shortest decimal literal when they are read.
+    """
+    if numeric_mode is NumericMode.INT64:
+        return _scaled_int_parser(decimal_places)
+    return float
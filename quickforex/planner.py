@@ -0,0 +1,297 @@
+from typing import Optional, Iterable
+from dataclasses import dataclass
+from collections import defaultdict
+from datetime import date
+
+from quickforex.concurrency import BoundedExecutor, gather_bounded
+from quickforex.domain import CurrencyPair, DateRange, SymbolType
+from quickforex.errors import QuickForexError
+from quickforex.logger import get_module_logger
+from quickforex.numeric import RateType
+from quickforex.providers.base import ProviderBase, AsyncProviderBase
+
+
+logger = get_module_logger(__name__)
+
+
+RatePoint = tuple[CurrencyPair, date]
+
+
+@dataclass(frozen=True)
+class CostModel:
+    """Relative cost of the requests sent to a provider: each request costs request_cost, plus
+    rate_cost for each rate of its response payload.
+    """
+
+    request_cost: float = 1.0
+    rate_cost: float = 0.002
+    max_window_days: int = 365
+
+    def historical_cost(self, symbols_count: int) -> float:
+        return self.request_cost + self.rate_cost * symbols_count
+
+    def time_series_cost(self, symbols_count: int, days: int) -> float:
+        return self.request_cost + self.rate_cost * symbols_count * days
+
+
+@dataclass(frozen=True)
+class PlannedRequest:
+    currency_pairs: frozenset[CurrencyPair]
+    date_range: DateRange
+
+    @property
+    def is_time_series(self) -> bool:
+        return self.date_range.start_date != self.date_range.end_date
+
+    def cost(self, cost_model: CostModel) -> float:
+        if self.is_time_series:
+            return cost_model.time_series_cost(
+                len(self.currency_pairs), len(self.date_range)
+            )
+        return cost_model.historical_cost(len(self.currency_pairs))
+
+
+def _plan_base_currency(
+    domestic_currency: SymbolType,
+    symbols_by_date: dict[date, set[SymbolType]],
+    cost_model: CostModel,
+) -> list[PlannedRequest]:
+    dates = sorted(symbols_by_date)
+    # best_costs[i]: cost of the cheapest plan covering the first i dates, the last request of
+    # this plan covers the dates from best_starts[i] to i - 1
+    best_costs = [0.0] + [float("inf")] * len(dates)
+    best_starts = [0] * (len(dates) + 1)
+    for end in range(1, len(dates) + 1):
+        symbols: set[SymbolType] = set()
+        for start in range(end - 1, -1, -1):
+            days = (dates[end - 1] - dates[start]).days + 1
+            if start < end - 1 and days > cost_model.max_window_days:
+                break
+            symbols |= symbols_by_date[dates[start]]
+            if start == end - 1:
+                cost = cost_model.historical_cost(len(symbols))
+            else:
+                cost = cost_model.time_series_cost(len(symbols), days)
+            if best_costs[start] + cost < best_costs[end]:
+                best_costs[end] = best_costs[start] + cost
+                best_starts[end] = start
+    requests: list[PlannedRequest] = []
+    end = len(dates)
+    while end > 0:
+        start = best_starts[end]
+        requests.append(
+            PlannedRequest(
+                currency_pairs=frozenset(
+                    CurrencyPair.interned(domestic_currency, symbol)
+                    for dt in dates[start:end]
+                    for symbol in symbols_by_date[dt]
+                ),
+                date_range=DateRange(dates[start], dates[end - 1]),
+            )
+        )
+        end = start
+    return requests[::-1]
+
+
+def plan_requests(
+    points: Iterable[RatePoint], cost_model: Optional[CostModel] = None
+) -> list[PlannedRequest]:
+    """Plan the cheapest set of requests (according to the cost model) retrieving the rates of
+    the provided points. Points are grouped by base (domestic) currency, and the dates of each base
+    currency are covered either by historical rates requests (one per date) or by time series
+    requests over windows of consecutive dates (which also retrieve the dates in between).
+
+    :param points: Currency pairs and dates for which the rates are needed
+    :param cost_model: Cost model (default cost model if not provided)
+    :return: Planned requests
+    """
+    cost_model = cost_model or CostModel()
+    symbols_by_date: dict[SymbolType, dict[date, set[SymbolType]]] = defaultdict(
+        lambda: defaultdict(set)
+    )
+    for currency_pair, dt in points:
+        symbols_by_date[currency_pair.domestic][dt].add(currency_pair.foreign)
+    return [
+        request
+        for domestic_currency in sorted(symbols_by_date)
+        for request in _plan_base_currency(
+            domestic_currency, symbols_by_date[domestic_currency], cost_model
+        )
+    ]
+
+
+def _execute_request(
+    provider: ProviderBase, request: PlannedRequest
+) -> dict[RatePoint, RateType]:
+    if not request.is_time_series:
+        as_of = request.date_range.start_date
+        return {
+            (pair, as_of): rate
+            for pair, rate in provider.get_historical_rates(
+                request.currency_pairs, as_of
+            ).items()
+        }
+    return {
+        (pair, dt): rate
+        for pair, series in provider.get_rates_time_series(
+            request.currency_pairs, request.date_range
+        ).items()
+        for dt, rate in series.items()
+    }
+
+
+async def _aexecute_request(
+    provider: AsyncProviderBase, request: PlannedRequest
+) -> dict[RatePoint, RateType]:
+    if not request.is_time_series:
+        as_of = request.date_range.start_date
+        return {
+            (pair, as_of): rate
+            for pair, rate in (
+                await provider.get_historical_rates(request.currency_pairs, as_of)
+            ).items()
+        }
+    return {
+        (pair, dt): rate
+        for pair, series in (
+            await provider.get_rates_time_series(
+                request.currency_pairs, request.date_range
+            )
+        ).items()
+        for dt, rate in series.items()
+    }
+
+
+def _merge_responses(
+    responses: Iterable[dict[RatePoint, RateType]]
+) -> dict[RatePoint, RateType]:
+    rates: dict[RatePoint, RateType] = {}
+    for response in responses:
+        rates.update(response)
+    return rates
+
+
+def _fallback_requests(
+    points: set[RatePoint],
+    requests: list[PlannedRequest],
+    rates: dict[RatePoint, RateType],
+) -> list[PlannedRequest]:
+    """Time series have no rate for some days (weekends, holidays), unlike historical rates
+    requests (which return the last available rate): the points missing from the time series
+    responses are requested again with historical rates requests, so that merging dates into time
+    series requests does not change the rates.
+
+    :return: Historical rates requests retrieving the points missing from the time series responses
+    """
+    historical_points = {
+        (pair, request.date_range.start_date)
+        for request in requests
+        if not request.is_time_series
+        for pair in request.currency_pairs
+    }
+    pairs_by_date: dict[date, set[CurrencyPair]] = defaultdict(set)
+    for pair, dt in points:
+        if (pair, dt) not in rates and (pair, dt) not in historical_points:
+            pairs_by_date[dt].add(pair)
+    return [
+        PlannedRequest(currency_pairs=frozenset(pairs), date_range=DateRange(dt, dt))
+        for dt, pairs in sorted(pairs_by_date.items())
+    ]
+
+
+def _select_points(
+    points: set[RatePoint], rates: dict[RatePoint, RateType]
+) -> dict[RatePoint, RateType]:
+    missing_points = [point for point in points if point not in rates]
+    if missing_points:
+        raise QuickForexError(
+            f"no rate available for {len(missing_points)} point(s): "
+            + ", ".join(
+                f"{pair.domestic}/{pair.foreign} on {dt}"
+                for pair, dt in sorted(
+                    missing_points,
+                    key=lambda point: (point[0].domestic, point[0].foreign, point[1]),
+                )[:10]
+            )
+        )
+    return {point: rates[point] for point in points}
+
+
+def get_rates_at(
+    provider: ProviderBase,
+    points: Iterable[RatePoint],
+    cost_model: Optional[CostModel] = None,
+    max_concurrent_requests: int = 4,
+) -> dict[RatePoint, RateType]:
+    """Retrieve the rates of a batch of (currency pair, date) points with the requests planned by
+    plan_requests. The rates are the same as the historical rates of each point.
+
+    :param provider: Provider
+    :param points: Currency pairs and dates for which the rates are needed
+    :param cost_model: Cost model (default cost model if not provided)
+    :param max_concurrent_requests: Maximum number of planned requests sent concurrently
+    :return: Rate of each point
+    """
+    points = set(points)
+    requests = plan_requests(points, cost_model)
+    logger.debug(f"retrieving {len(points)} rate(s) with {len(requests)} request(s)")
+    executor = BoundedExecutor(
+        max_concurrent_requests, thread_name_prefix="quickforex-planner"
+    )
+    try:
+        rates = _merge_responses(
+            executor.map(lambda request: _execute_request(provider, request), requests)
+        )
+        fallback_requests = _fallback_requests(points, requests, rates)
+        if fallback_requests:
+            logger.debug(
+                f"retrieving the points missing from the time series with"
+                f" {len(fallback_requests)} request(s)"
+            )
+            rates.update(
+                _merge_responses(
+                    executor.map(
+                        lambda request: _execute_request(provider, request),
+                        fallback_requests,
+                    )
+                )
+            )
+    finally:
+        executor.shutdown()
+    return _select_points(points, rates)
+
+
+async def aget_rates_at(
+    provider: AsyncProviderBase,
+    points: Iterable[RatePoint],
+    cost_model: Optional[CostModel] = None,
+    max_concurrent_requests: int = 4,
+) -> dict[RatePoint, RateType]:
+    """Asynchronous counterpart of get_rates_at"""
+    points = set(points)
+    requests = plan_requests(points, cost_model)
+    logger.debug(f"retrieving {len(points)} rate(s) with {len(requests)} request(s)")
+    rates = _merge_responses(
+        await gather_bounded(
+            (_aexecute_request(provider, request) for request in requests),
+            max_concurrency=max_concurrent_requests,
+        )
+    )
+    fallback_requests = _fallback_requests(points, requests, rates)
+    if fallback_requests:
+        logger.debug(
+            f"retrieving the points missing from the time series with"
+            f" {len(fallback_requests)} request(s)"
+        )
+        rates.update(
+            _merge_responses(
+                await gather_bounded(
+                    (
+                        _aexecute_request(provider, request)
+                        for request in fallback_requests
+                    ),
+                    max_concurrency=max_concurrent_requests,
+                )
+            )
+        )
+    return _select_points(points, rates)
@@ -1,15 +1,46 @@
-from quickforex.providers.base import ProviderBase
+from typing import Any
+import importlib
+
+from quickforex.providers.base import ProviderBase, AsyncProviderBase
 from quickforex.providers.provider_metadata import (
     ProviderMetadata,
     SettingFieldDescription,
 )
-from quickforex.providers.exchangerate_host import ExchangeRateHostProvider
-from quickforex.providers.dummy import DummyProvider
+
+# Providers are imported on first access, so that importing quickforex does not import the
+# dependencies of every provider (such as requests)
+_LAZY_EXPORTS = {
+    "ExchangeRateHostProvider": "quickforex.providers.exchangerate_host",
+    "AsyncExchangeRateHostProvider": "quickforex.providers.exchangerate_host",
+    "DummyProvider": "quickforex.providers.dummy",
+    "AsyncDummyProvider": "quickforex.providers.dummy",
+    "CachingProvider": "quickforex.providers.caching",
+    "SqliteStoreProvider": "quickforex.providers.sqlite_store",
+    "BatchingProvider": "quickforex.providers.batching",
+    "RoutingProvider": "quickforex.providers.routing",
+}
 
 __all__ = [
     "ProviderBase",
+    "AsyncProviderBase",
     "ExchangeRateHostProvider",
+    "AsyncExchangeRateHostProvider",
     "DummyProvider",
+    "AsyncDummyProvider",
+    "CachingProvider",
+    "SqliteStoreProvider",
+    "BatchingProvider",
+    "RoutingProvider",
     "ProviderMetadata",
     "SettingFieldDescription",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    return getattr(importlib.import_module(_LAZY_EXPORTS[name]), name)
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
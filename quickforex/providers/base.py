@@ -1,8 +1,13 @@
-from typing import Protocol, Iterable, runtime_checkable
+from typing import Any, Protocol, Iterable, runtime_checkable
 from datetime import date
 from decimal import Decimal
 
 from quickforex.domain import CurrencyPair, DateRange
+from quickforex.numeric import NumericMode
+
+
+# Number of decimal places assumed for the rates of providers without decimal_places setting
+DEFAULT_DECIMAL_PLACES = 6
 
 
 @runtime_checkable
@@ -53,3 +58,75 @@ class ProviderBase(Protocol):
         :return:
         """
         ...
+
+
+@runtime_checkable
+class AsyncProviderBase(Protocol):
+    identifier: str
+
+    async def get_latest_rates(
+        self, currency_pairs: Iterable[CurrencyPair]
+    ) -> dict[CurrencyPair, Decimal]:
+        """
+        :param currency_pairs: Currency pairs for which to retrieve the exchange rates
+        :return: Last exchange rate for each provided currency pair.
+        """
+        ...
+
+    async def get_latest_rate(self, currency_pair: CurrencyPair) -> Decimal:
+        """
+        :param currency_pair:
+        :return: Last exchange rate for the provided currency pair.
+        """
+        ...
+
+    async def get_historical_rates(
+        self, currency_pairs: Iterable[CurrencyPair], as_of: date
+    ) -> dict[CurrencyPair, Decimal]:
+        """
+        :param currency_pairs:
+        :param as_of:
+        :return: Historical exchange rate for each provided currency pair.
+        """
+        ...
+
+    async def get_historical_rate(
+        self, currency_pair: CurrencyPair, as_of: date
+    ) -> Decimal:
+        """
+        :param currency_pair:
+        :param as_of:
+        :return: Historical exchange rate for the provided currency pair.
+        """
+        ...
+
+    async def get_rates_time_series(
+        self, currency_pairs: Iterable[CurrencyPair], date_range: DateRange
+    ) -> dict[CurrencyPair, dict[date, Decimal]]:
+        """
+        :param currency_pairs: Currency pairs for which to retrieve the exchange rates.
+        :param date_range: Date range over which the exchange rates should be retrieved.
+        :return:
+        """
+        ...
+
+    async def close(self) -> None:
+        """Release the resources (connections) held by the provider."""
+        ...
+
+
+def rates_format(provider: Any) -> tuple[NumericMode, int]:
+    """
+    :param provider: Provider, possibly wrapping other providers
+    :return: Numeric mode and number of decimal places of the rates returned by the provider, read
+        from the settings of the provider or of the (first) provider it wraps. DECIMAL rates are
+        assumed when no provider has a numeric mode setting.
+    """
+    while provider is not None:
+        settings = getattr(provider, "settings", None)
+        numeric_mode = getattr(settings, "numeric", None)
+        if isinstance(numeric_mode, NumericMode):
+            return numeric_mode, settings.decimal_places
+        wrapped = getattr(provider, "providers", None)
+        provider = wrapped[0] if wrapped else getattr(provider, "provider", None)
+    return NumericMode.DECIMAL, DEFAULT_DECIMAL_PLACES
@@ -0,0 +1,180 @@
+from typing import Iterable, Optional
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+import threading
+
+from quickforex.domain import CurrencyPair, DateRange
+from quickforex.deadline import DeadlineExceededError, current_deadline
+from quickforex.logger import get_module_logger
+from quickforex.providers.factory import registered_provider, create_wrapped_provider
+from quickforex.providers.base import ProviderBase
+
+
+logger = get_module_logger(__name__)
+
+
+@dataclass
+class Settings:
+    provider_id: str = "exchangerate.host"
+    window: float = 0.005
+    max_batch_size: int = 100
+
+
+class _Batch(object):
+    def __init__(self):
+        self.currency_pairs: set[CurrencyPair] = set()
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.rates: dict[CurrencyPair, Decimal] = {}
+        self.errors: dict[CurrencyPair, BaseException] = {}
+
+    def fail(
+        self, currency_pairs: Iterable[CurrencyPair], error: BaseException
+    ) -> None:
+        for pair in currency_pairs:
+            self.errors[pair] = error
+
+
+@registered_provider
+class BatchingProvider(ProviderBase):
+    """Provider batching the single currency pair lookups sent to another provider"""
+
+    identifier = "batching"
+
+    def __init__(
+        self,
+        provider: Optional[ProviderBase] = None,
+        settings: Optional[Settings] = None,
+    ):
+        """Single currency pair lookups (get_latest_rate and get_historical_rate) received within a
+        short window are sent to the wrapped provider as a single multiple currency pairs lookup (one
+        per as of date). A failed batch is retried by the lookup which sent it, on behalf of all the
+        lookups of the batch (see _retry_halves).
+        Other lookups are passed through.
+
+        :param provider: Wrapped provider (created from the provider_id setting when not provided)
+        :param settings: Batching settings:
+            - provider_id: identifier of the wrapped provider
+            - window: time (in seconds) during which lookups are collected before the batch is sent
+            - max_batch_size: a batch is sent as soon as it contains this many currency pairs
+        """
+        self._settings = settings or Settings()
+        self._provider = create_wrapped_provider(
+            self.identifier, provider, self._settings.provider_id
+        )
+        self._batches: dict[Optional[date], _Batch] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def provider(self) -> ProviderBase:
+        return self._provider
+
+    def _fetch(
+        self, currency_pairs: set[CurrencyPair], as_of: Optional[date]
+    ) -> dict[CurrencyPair, Decimal]:
+        if as_of is None:
+            return self._provider.get_latest_rates(currency_pairs)
+        return self._provider.get_historical_rates(currency_pairs, as_of)
+
+    def _get_rate(self, currency_pair: CurrencyPair, as_of: Optional[date]) -> Decimal:
+        while True:
+            with self._lock:
+                batch = self._batches.get(as_of)
+                leader = batch is None
+                if leader:
+                    batch = self._batches[as_of] = _Batch()
+                batch.currency_pairs.add(currency_pair)
+                if len(batch.currency_pairs) >= self._settings.max_batch_size:
+                    self._batches.pop(as_of, None)
+                    batch.full.set()
+            if leader:
+                self._send(batch, as_of)
+            else:
+                deadline = current_deadline()
+                if not batch.done.wait(deadline.remaining if deadline else None):
+                    raise DeadlineExceededError(deadline.timeout)
+                # A batch exceeding the (shorter) deadline of the lookup which sent it is sent again
+                if isinstance(
+                    batch.errors.get(currency_pair), DeadlineExceededError
+                ) and not (deadline and deadline.expired):
+                    continue
+            error = batch.errors.get(currency_pair)
+            if error is not None:
+                raise error
+            return batch.rates[currency_pair]
+
+    def _send(self, batch: _Batch, as_of: Optional[date]) -> None:
+        batch.full.wait(self._settings.window)
+        with self._lock:
+            if self._batches.get(as_of) is batch:
+                del self._batches[as_of]
+        currency_pairs = sorted(
+            batch.currency_pairs, key=lambda pair: (pair.domestic, pair.foreign)
+        )
+        try:
+            logger.debug(f"sending batch of {len(currency_pairs)} currency pairs")
+            batch.rates.update(self._fetch(set(currency_pairs), as_of))
+        except Exception as e:
+            self._retry_halves(batch, currency_pairs, as_of, e)
+        except BaseException as e:
+            batch.fail(currency_pairs, e)
+        finally:
+            batch.done.set()
+
+    def _retry_halves(
+        self,
+        batch: _Batch,
+        currency_pairs: list[CurrencyPair],
+        as_of: Optional[date],
+        error: Exception,
+    ) -> None:
+        """Retry a failed lookup in two halves, so that a currency pair making the lookups fail (e.g.
+        an unknown currency) does not fail the other pairs of its batch. The half which fails alone
+        is retried the same way, down to the currency pair causing the failure. When both halves
+        fail, the failure is not caused by a single currency pair and is not retried any further.
+        """
+        if len(currency_pairs) == 1 or isinstance(error, DeadlineExceededError):
+            batch.fail(currency_pairs, error)
+            return
+        logger.debug(
+            f"lookup of {len(currency_pairs)} currency pairs failed ({error}),"
+            f" retrying in two halves"
+        )
+        middle = len(currency_pairs) // 2
+        halves = [currency_pairs[:middle], currency_pairs[middle:]]
+        errors: list[Optional[Exception]] = []
+        for half in halves:
+            try:
+                batch.rates.update(self._fetch(set(half), as_of))
+                errors.append(None)
+            except Exception as e:
+                errors.append(e)
+        for half, half_error in zip(halves, errors):
+            if half_error is None:
+                continue
+            if all(errors):
+                batch.fail(half, half_error)
+            else:
+                self._retry_halves(batch, half, as_of, half_error)
+
+    def get_latest_rates(
+        self, currency_pairs: Iterable[CurrencyPair]
+    ) -> dict[CurrencyPair, Decimal]:
+        return self._provider.get_latest_rates(currency_pairs)
+
+    def get_latest_rate(self, currency_pair: CurrencyPair) -> Decimal:
+        return self._get_rate(currency_pair, None)
+
+    def get_historical_rates(
+        self, currency_pairs: Iterable[CurrencyPair], as_of: date
+    ) -> dict[CurrencyPair, Decimal]:
+        return self._provider.get_historical_rates(currency_pairs, as_of)
+
+    def get_historical_rate(self, currency_pair: CurrencyPair, as_of: date) -> Decimal:
+        return self._get_rate(currency_pair, as_of)
+
+    def get_rates_time_series(
+        self, currency_pairs: Iterable[CurrencyPair], date_range: DateRange
+    ) -> dict[CurrencyPair, dict[date, Decimal]]:
+        return self._provider.get_rates_time_series(currency_pairs, date_range)
@@ -0,0 +1,361 @@
+from typing import Callable, Iterable, Mapping, Optional
+from dataclasses import dataclass
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+import threading
+import time
+
+from quickforex.domain import CurrencyPair, DateRange
+from quickforex.logger import get_module_logger
+from quickforex.memory_cache import LruCache
+from quickforex.numeric import RateType, decimal_rate
+from quickforex.rate_series import RateSeries, RateSeriesBuilder
+from quickforex.providers.factory import registered_provider, create_wrapped_provider
+from quickforex.providers.base import ProviderBase
+
+
+logger = get_module_logger(__name__)
+
+
+@dataclass
+class Settings:
+    provider_id: str = "exchangerate.host"
+    max_entries: int = 100_000
+    max_series_entries: int = 10_000
+    latest_ttl: float = 60.0
+    historical_ttl: Optional[float] = None
+    hot_set_size: int = 0
+    refresh_interval: float = 30.0
+
+
+@dataclass(frozen=True)
+class _SeriesBlock:
+    """Time series of a currency pair over a fetched date range: the days of the range without
+    rate (weekends, holidays) are known to have no rate, and are not fetched again.
+    """
+
+    series: RateSeries
+    expires_at: Optional[float]
+
+    def expired(self, now: float) -> bool:
+        return self.expires_at is not None and self.expires_at <= now
+
+
+def _block_series(date_range: DateRange, rates: Mapping[date, RateType]) -> RateSeries:
+    if isinstance(rates, RateSeries) and rates.date_range == date_range:
+        return rates
+    return RateSeries.from_rates(date_range, rates)
+
+
+def _overlap(date_range: DateRange, other: DateRange) -> Optional[DateRange]:
+    start_date = max(date_range.start_date, other.start_date)
+    end_date = min(date_range.end_date, other.end_date)
+    return DateRange(start_date, end_date) if start_date <= end_date else None
+
+
+def _uncovered_ranges(
+    date_range: DateRange, covered_ranges: Iterable[DateRange]
+) -> list[DateRange]:
+    """
+    :return: Contiguous sub-ranges of the date range not covered by any of the covered ranges
+    """
+    missing_ranges: list[DateRange] = []
+    start_date = date_range.start_date
+    for covered_range in sorted(covered_ranges, key=lambda r: r.start_date):
+        if covered_range.end_date < start_date:
+            continue
+        if covered_range.start_date > date_range.end_date:
+            break
+        if covered_range.start_date > start_date:
+            missing_ranges.append(
+                DateRange(start_date, covered_range.start_date - timedelta(days=1))
+            )
+        if covered_range.end_date >= date_range.end_date:
+            return missing_ranges
+        start_date = covered_range.end_date + timedelta(days=1)
+    missing_ranges.append(DateRange(start_date, date_range.end_date))
+    return missing_ranges
+
+
+def _assemble_series(date_range: DateRange, parts: list[RateSeries]) -> RateSeries:
+    """
+    :param parts: Non overlapping series within the date range (the last one gives the numeric
+        mode and the decimal places of the assembled series)
+    """
+    if len(parts) == 1 and parts[0].date_range == date_range:
+        return parts[0]
+    numeric_mode = parts[-1].numeric_mode
+    decimal_places = parts[-1].decimal_places
+    builder = RateSeriesBuilder(date_range, numeric_mode, decimal_places)
+    for part in parts:
+        if part.numeric_mode is numeric_mode and part.decimal_places == decimal_places:
+            start_ordinal = part.start_date.toordinal()
+            values = part.buffer
+            for index, valid in enumerate(part.mask):
+                if valid:
+                    builder.set_value(start_ordinal + index, values[index])
+        else:
+            for dt, rate in part.items():
+                builder.set(
+                    dt, decimal_rate(rate, part.numeric_mode, part.decimal_places)
+                )
+    return builder.build()
+
+
+class _Refresher(object):
+    def __init__(
+        self,
+        refresh: Callable[[set[CurrencyPair]], None],
+        hot_set_size: int,
+        refresh_interval: float,
+    ):
+        """Background thread periodically refreshing the most frequently accessed currency pairs.
+
+        :param refresh: Function refreshing the provided currency pairs
+        :param hot_set_size: Number of currency pairs refreshed
+        :param refresh_interval: Time (in seconds) between two refreshes
+        """
+        self._refresh = refresh
+        self._hot_set_size = hot_set_size
+        self._refresh_interval = refresh_interval
+        self._access_counts: Counter[CurrencyPair] = Counter()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def record_access(self, currency_pairs: Iterable[CurrencyPair]) -> None:
+        with self._lock:
+            self._access_counts.update(currency_pairs)
+            if self._thread is None and not self._stopped.is_set():
+                self._thread = threading.Thread(
+                    target=self._run, name="quickforex-refresher", daemon=True
+                )
+                self._thread.start()
+
+    def hot_set(self) -> set[CurrencyPair]:
+        with self._lock:
+            return {
+                pair for pair, _ in self._access_counts.most_common(self._hot_set_size)
+            }
+
+    def _decay(self) -> None:
+        with self._lock:
+            self._access_counts = Counter(
+                {
+                    pair: count // 2
+                    for pair, count in self._access_counts.items()
+                    if count > 1
+                }
+            )
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self._refresh_interval):
+            hot_set = self.hot_set()
+            self._decay()
+            if not hot_set:
+                continue
+            try:
+                self._refresh(hot_set)
+            except Exception as e:
+                logger.warning(f"failed to refresh {len(hot_set)} currency pairs: {e}")
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stopped.set()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+
+
+@registered_provider
+class CachingProvider(ProviderBase):
+    """Provider caching the rates returned by another provider in memory"""
+
+    identifier = "caching"
+
+    def __init__(
+        self,
+        provider: Optional[ProviderBase] = None,
+        settings: Optional[Settings] = None,
+    ):
+        """
+        :param provider: Wrapped provider (created from the provider_id setting when not provided)
+        :param settings: Caching settings:
+            - provider_id: identifier of the wrapped provider
+            - max_entries: maximum number of (currency pair, date) entries of the last available
+              and historical rates kept in memory
+            - max_series_entries: maximum number of currency pairs which time series are kept in
+              memory (as one block per fetched date range, including the days without rate)
+            - latest_ttl: time to live (in seconds) of the last available rates
+            - historical_ttl: time to live (in seconds) of historical rates (never expire when None)
+            - hot_set_size: number of most frequently accessed currency pairs which last available
+              rates are refreshed in the background, before they expire (disabled when 0)
+            - refresh_interval: time (in seconds) between two background refreshes, should be
+              lower than latest_ttl
+        """
+        self._settings = settings or Settings()
+        self._provider = create_wrapped_provider(
+            self.identifier, provider, self._settings.provider_id
+        )
+        self._cache = LruCache(self._settings.max_entries)
+        # Blocks of time series (tuple of _SeriesBlock) of each currency pair
+        self._series_cache = LruCache(self._settings.max_series_entries)
+        self._refresher = (
+            _Refresher(
+                self._refresh_latest_rates,
+                self._settings.hot_set_size,
+                self._settings.refresh_interval,
+            )
+            if self._settings.hot_set_size > 0
+            else None
+        )
+
+    def _ttl(self, as_of: Optional[date]) -> Optional[float]:
+        if as_of is None or as_of >= date.today():
+            return self._settings.latest_ttl
+        return self._settings.historical_ttl
+
+    @property
+    def provider(self) -> ProviderBase:
+        return self._provider
+
+    @property
+    def cache(self) -> LruCache:
+        return self._cache
+
+    @property
+    def series_cache(self) -> LruCache:
+        return self._series_cache
+
+    def close(self) -> None:
+        """Stop refreshing hot currency pairs in the background (the wrapped provider is not closed)."""
+        if self._refresher is not None:
+            self._refresher.stop()
+
+    def __enter__(self) -> "CachingProvider":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _refresh_latest_rates(self, currency_pairs: set[CurrencyPair]) -> None:
+        logger.debug(f"refreshing {len(currency_pairs)} hot currency pairs")
+        for pair, rate in self._provider.get_latest_rates(currency_pairs).items():
+            self._cache.put((pair, None), rate, ttl=self._ttl(None))
+
+    def _get_rates(
+        self, currency_pairs: Iterable[CurrencyPair], as_of: Optional[date] = None
+    ) -> dict[CurrencyPair, Decimal]:
+        currency_pairs = set(currency_pairs)
+        if as_of is None and self._refresher is not None:
+            self._refresher.record_access(currency_pairs)
+        rates: dict[CurrencyPair, Decimal] = {}
+        missing_pairs: set[CurrencyPair] = set()
+        for pair in currency_pairs:
+            rate = self._cache.get((pair, as_of))
+            if rate is None and as_of is not None:
+                rate = self._get_series_rate(pair, as_of)
+            if rate is None:
+                missing_pairs.add(pair)
+            else:
+                rates[pair] = rate
+        if missing_pairs:
+            if as_of is None:
+                fetched_rates = self._provider.get_latest_rates(missing_pairs)
+            else:
+                fetched_rates = self._provider.get_historical_rates(
+                    missing_pairs, as_of
+                )
+            for pair, rate in fetched_rates.items():
+                self._cache.put((pair, as_of), rate, ttl=self._ttl(as_of))
+            rates.update(fetched_rates)
+        return rates
+
+    def get_latest_rates(
+        self, currency_pairs: Iterable[CurrencyPair]
+    ) -> dict[CurrencyPair, Decimal]:
+        return self._get_rates(currency_pairs)
+
+    def get_latest_rate(self, currency_pair: CurrencyPair) -> Decimal:
+        return self.get_latest_rates([currency_pair])[currency_pair]
+
+    def get_historical_rates(
+        self, currency_pairs: Iterable[CurrencyPair], as_of: date
+    ) -> dict[CurrencyPair, Decimal]:
+        return self._get_rates(currency_pairs, as_of)
+
+    def get_historical_rate(self, currency_pair: CurrencyPair, as_of: date) -> Decimal:
+        return self.get_historical_rates([currency_pair], as_of)[currency_pair]
+
+    def _get_series_blocks(self, currency_pair: CurrencyPair) -> list[_SeriesBlock]:
+        now = time.monotonic()
+        return [
+            block
+            for block in self._series_cache.get(currency_pair, ())
+            if not block.expired(now)
+        ]
+
+    def _get_series_rate(
+        self, currency_pair: CurrencyPair, as_of: date
+    ) -> Optional[RateType]:
+        for block in self._get_series_blocks(currency_pair):
+            if as_of in block.series.date_range:
+                return block.series.get(as_of)
+        return None
+
+    def _series_blocks(
+        self, date_range: DateRange, rates: Mapping[date, RateType]
+    ) -> list[_SeriesBlock]:
+        # The days until yesterday and the recent days expire after different times to live
+        yesterday = date.today() - timedelta(days=1)
+        series = _block_series(date_range, rates)
+        blocks: list[_SeriesBlock] = []
+        for part_range in [
+            _overlap(date_range, DateRange(date.min, yesterday)),
+            _overlap(date_range, DateRange(yesterday + timedelta(days=1), date.max)),
+        ]:
+            if part_range is not None:
+                ttl = self._ttl(part_range.end_date)
+                blocks.append(
+                    _SeriesBlock(
+                        series=series[part_range],
+                        expires_at=None if ttl is None else time.monotonic() + ttl,
+                    )
+                )
+        return blocks
+
+    def get_rates_time_series(
+        self, currency_pairs: Iterable[CurrencyPair], date_range: DateRange
+    ) -> dict[CurrencyPair, RateSeries]:
+        blocks: dict[CurrencyPair, list[_SeriesBlock]] = {}
+        pairs_by_missing_range: dict[DateRange, set[CurrencyPair]] = defaultdict(set)
+        for pair in set(currency_pairs):
+            blocks[pair] = self._get_series_blocks(pair)
+            for missing_range in _uncovered_ranges(
+                date_range, (block.series.date_range for block in blocks[pair])
+            ):
+                pairs_by_missing_range[missing_range].add(pair)
+        fetched_pairs: set[CurrencyPair] = set()
+        for missing_range, pairs in pairs_by_missing_range.items():
+            logger.debug(f"fetching {missing_range} for {len(pairs)} currency pair(s)")
+            fetched_series = self._provider.get_rates_time_series(pairs, missing_range)
+            for pair in pairs:
+                blocks[pair].extend(
+                    self._series_blocks(missing_range, fetched_series.get(pair, {}))
+                )
+            fetched_pairs |= pairs
+        for pair in fetched_pairs:
+            self._series_cache.put(pair, tuple(blocks[pair]))
+        series: dict[CurrencyPair, RateSeries] = {}
+        for pair, pair_blocks in blocks.items():
+            parts = [
+                block.series[overlap]
+                for block in pair_blocks
+                for overlap in [_overlap(date_range, block.series.date_range)]
+                if overlap is not None
+            ]
+            pair_series = _assemble_series(date_range, parts)
+            if len(pair_series) > 0:
+                series[pair] = pair_series
+        return series
@@ -5,8 +5,8 @@ from datetime import date
 from dataclasses import dataclass
 
 from quickforex.domain import CurrencyPair, DateRange
-from quickforex.providers.factory import registered_provider
-from quickforex.providers import ProviderBase
+from quickforex.providers.factory import registered_provider, registered_async_provider
+from quickforex.providers.base import ProviderBase, AsyncProviderBase
 
 
 @dataclass
@@ -70,3 +70,39 @@ class DummyProvider(ProviderBase):
             pair: {dt: self._settings.return_rate for dt in date_range}
             for pair in currency_pairs
         }
+
+
+@registered_async_provider
+class AsyncDummyProvider(AsyncProviderBase):
+    """Dummy provider"""
+
+    identifier = "dummy"
+
+    def __init__(self, settings: Optional[Settings] = None):
+        self._provider = DummyProvider(settings)
+
+    async def get_latest_rates(
+        self, currency_pairs: Iterable[CurrencyPair]
+    ) -> dict[CurrencyPair, Decimal]:
+        return self._provider.get_latest_rates(currency_pairs)
+
+    async def get_latest_rate(self, currency_pair: CurrencyPair) -> Decimal:
+        return self._provider.get_latest_rate(currency_pair)
+
+    async def get_historical_rates(
+        self, currency_pairs: Iterable[CurrencyPair], as_of: date
+    ) -> dict[CurrencyPair, Decimal]:
+        return self._provider.get_historical_rates(currency_pairs, as_of)
+
+    async def get_historical_rate(
+        self, currency_pair: CurrencyPair, as_of: date
+    ) -> Decimal:
+        return self._provider.get_historical_rate(currency_pair, as_of)
+
+    async def get_rates_time_series(
+        self, currency_pairs: Iterable[CurrencyPair], date_range: DateRange
+    ) -> dict[CurrencyPair, dict[date, Decimal]]:
+        return self._provider.get_rates_time_series(currency_pairs, date_range)
+
+    async def close(self) -> None:
+        pass
@@ -1,25 +1,75 @@
-from typing import Any, Optional, Iterable
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Generator,
+    Optional,
+    Iterable,
+    Iterator,
+    TypeVar,
+)
 from dataclasses import dataclass
 from collections import defaultdict
-from datetime import date, datetime, timedelta
+from datetime import date
 from decimal import Decimal
+import json
+import os
 
-from quickforex.providers.factory import registered_provider
-from quickforex.providers.base import ProviderBase
-from quickforex.http_requester import HttpRequesterBase
+from quickforex.providers.factory import registered_provider, registered_async_provider
+from quickforex.providers.base import ProviderBase, AsyncProviderBase
+from quickforex.http_requester import (
+    HttpRequesterBase,
+    AsyncHttpRequesterBase,
+    HttpSession,
+    HedgingPolicy,
+    ResponseObserver,
+    SessionSettings,
+    get_shared_session,
+)
+from quickforex.http_cache import DiskCache, NEVER_EXPIRES
+from quickforex.chunk_sizing import ChunkSizer
+from quickforex.concurrency import (
+    BoundedExecutor,
+    gather_bounded,
+    iter_prefetched,
+    aiter_prefetched,
+)
+from quickforex.triangulation import (
+    TRIANGULATION_GUARD_DIGITS,
+    pivot_symbols,
+    triangulate,
+    triangulate_time_series,
+)
 from quickforex.errors import QuickForexError
 from quickforex.logger import get_module_logger
+from quickforex.rate_series import RateSeries, RateSeriesBuilder
+from quickforex.numeric import (
+    NumericMode,
+    RateType,
+    rate_converter,
+    rate_parser,
+    buffer_value_parser,
+)
 from quickforex.domain import CurrencyPair, SymbolType, DateRange
 
 
 API_URL = "https://api.exchangerate.host"
+API_URL_ENV_VAR = "QUICKFOREX_EXCHANGERATE_HOST_URL"
 DATE_FORMAT = "%Y-%m-%d"
 DECIMAL_PLACES = 6
+MAX_TIME_SERIES_DAYS = 366
+
+
+T = TypeVar("T")
 
 
 logger = get_module_logger(__name__)
 
 
+def _get_api_url() -> str:
+    return os.environ.get(API_URL_ENV_VAR, API_URL)
+
+
 def _group_pairs_by_domestic_currency(
     pairs: set[CurrencyPair],
 ) -> dict[SymbolType, list[SymbolType]]:
@@ -34,40 +84,485 @@ def _format_date(dt: date) -> str:
 
 
 def _parse_date(dt_str: str) -> date:
-    return datetime.strptime(dt_str, DATE_FORMAT).date()
+    return date.fromisoformat(dt_str)
+
+
+# Rates are kept as number literals, and parsed later to the numeric type of the provider
+_JSON_DECODER = json.JSONDecoder(parse_float=str)
+
+
+_parse_decimal = rate_parser(NumericMode.DECIMAL, DECIMAL_PLACES)
+
+
+def _create_time_series_observer(chunk_sizer: ChunkSizer) -> ResponseObserver:
+    def observe(
+        endpoint: str, params: Optional[dict[str, Any]], size: int, latency: float
+    ) -> None:
+        if endpoint != "timeseries" or not params:
+            return
+        days = (
+            _parse_date(params["end_date"]) - _parse_date(params["start_date"])
+        ).days + 1
+        chunk_sizer.observe(
+            len(str(params["symbols"]).split(",")) * days, size, latency
+        )
+
+    return observe
+
 
+def _time_series_chunk_days(
+    settings: "Settings",
+    chunk_sizer: ChunkSizer,
+    date_range: DateRange,
+    groups: dict[SymbolType, list[SymbolType]],
+) -> int:
+    if settings.time_series_chunk_days is not None:
+        return min(settings.time_series_chunk_days, MAX_TIME_SERIES_DAYS)
+    return chunk_sizer.chunk_days(
+        len(date_range),
+        max((len(symbols) for symbols in groups.values()), default=1),
+        requests_per_chunk=max(len(groups), 1),
+        max_concurrency=settings.max_concurrent_time_series_requests,
+    )
 
-def _iter_date_range_chunks(date_range: DateRange, interval_days: int):
-    assert date_range.start_date <= date_range.end_date
-    assert interval_days > 0
-    current_date = date_range.start_date
-    while current_date < date_range.end_date:
-        next_date = min(
-            current_date + timedelta(days=interval_days), date_range.end_date
+
+def _check_response(response_payload: Any) -> None:
+    if not response_payload["success"]:
+        raise QuickForexError(
+            f"received error response from exchangerate.host: {response_payload}"
         )
-        yield DateRange(current_date, next_date)
-        current_date = next_date + timedelta(days=1)
+
+
+def _rates_request(
+    domestic_currency: SymbolType,
+    foreign_currencies: list[SymbolType],
+    as_of: Optional[date],
+    places: int = DECIMAL_PLACES,
+) -> tuple[str, dict[str, Any]]:
+    return (
+        _format_date(as_of) if as_of else "latest",
+        {
+            "base": domestic_currency,
+            "symbols": ",".join(foreign_currencies),
+            "places": places,
+        },
+    )
+
+
+def _time_series_request(
+    date_range: DateRange,
+    domestic_currency: SymbolType,
+    foreign_currencies: list[SymbolType],
+    places: int = DECIMAL_PLACES,
+) -> tuple[str, dict[str, Any]]:
+    return (
+        "timeseries",
+        {
+            "start_date": _format_date(date_range.start_date),
+            "end_date": _format_date(date_range.end_date),
+            "base": domestic_currency,
+            "symbols": ",".join(foreign_currencies),
+            "places": places,
+        },
+    )
+
+
+def _check_base_currency(response: Any, domestic_currency: SymbolType) -> None:
+    base_currency = response["base"]
+    if base_currency != domestic_currency:
+        raise QuickForexError(
+            f"server responded with unexpected base currency '{base_currency}'"
+            f" (expected '{domestic_currency}')"
+        )
+
+
+def _merge_rates_response(
+    rates: dict[CurrencyPair, RateType],
+    remaining_pairs: set[CurrencyPair],
+    domestic_currency: SymbolType,
+    response: Any,
+    parse_rate: Callable[[Any], RateType] = _parse_decimal,
+) -> None:
+    _check_base_currency(response, domestic_currency)
+    for foreign_currency, rate in response["rates"].items():
+        currency_pair = CurrencyPair.interned(domestic_currency, foreign_currency)
+        remaining_pairs.remove(currency_pair)
+        rates[currency_pair] = parse_rate(rate)
+
+
+def _check_no_remaining_pairs(remaining_pairs: set[CurrencyPair]) -> None:
+    if remaining_pairs:
+        formatted_pairs = ", ".join(
+            f"{pair.domestic}{pair.foreign}" for pair in remaining_pairs
+        )
+        raise QuickForexError(
+            f"server did not return rate for the following currency pairs: {formatted_pairs}"
+        )
+
+
+class _TimeSeriesMerger(object):
+    def __init__(
+        self,
+        builders: dict[SymbolType, RateSeriesBuilder],
+        parse_value: Callable[[Any], Any],
+    ):
+        """Merge the rates of the time series responses of a base currency into series builders.
+
+        :param builders: Series builder of each requested foreign currency (other currencies are
+            ignored)
+        :param parse_value: Function parsing the rates to series buffer values
+        """
+        self._builders = builders
+        self._parse_value = parse_value
+
+    def merge_rates(self, date_str: str, rates_by_symbol: dict[str, Any]) -> None:
+        ordinal = _parse_date(date_str).toordinal()
+        for foreign_currency, rate in rates_by_symbol.items():
+            builder = self._builders.get(foreign_currency)
+            if builder is not None:
+                builder.set_value(ordinal, self._parse_value(rate))
+
+    def merge_response(self, response: Any) -> None:
+        for date_str, rates_by_symbol in response["rates"].items():
+            self.merge_rates(date_str, rates_by_symbol)
+
+
+def _create_series_builders(
+    groups: dict[SymbolType, list[SymbolType]],
+    create_series: Callable[[], RateSeriesBuilder],
+) -> dict[SymbolType, dict[SymbolType, RateSeriesBuilder]]:
+    return {
+        domestic_currency: {
+            foreign_currency: create_series() for foreign_currency in foreign_currencies
+        }
+        for domestic_currency, foreign_currencies in groups.items()
+    }
+
+
+def _build_series(
+    builders: dict[SymbolType, dict[SymbolType, RateSeriesBuilder]]
+) -> dict[CurrencyPair, RateSeries]:
+    all_series = {
+        CurrencyPair.interned(domestic_currency, foreign_currency): builder.build()
+        for domestic_currency, builders_by_symbol in builders.items()
+        for foreign_currency, builder in builders_by_symbol.items()
+    }
+    return {pair: series for pair, series in all_series.items() if len(series) > 0}
+
+
+def _parse_pivot_rates(pivot: SymbolType, response: Any) -> dict[SymbolType, Decimal]:
+    _check_base_currency(response, pivot)
+    return {symbol: _parse_decimal(rate) for symbol, rate in response["rates"].items()}
+
+
+def _merge_pivot_time_series_response(
+    pivot_series: dict[date, dict[SymbolType, Decimal]],
+    pivot: SymbolType,
+    response: Any,
+) -> None:
+    _check_base_currency(response, pivot)
+    for date_str, rates_by_symbol in response["rates"].items():
+        pivot_series[_parse_date(date_str)] = {
+            symbol: _parse_decimal(rate) for symbol, rate in rates_by_symbol.items()
+        }
+
+
+def _normalize_currency_pairs(
+    currency_pairs: Iterable[CurrencyPair],
+) -> set[CurrencyPair]:
+    currency_pairs = (
+        [currency_pairs] if isinstance(currency_pairs, CurrencyPair) else currency_pairs
+    )
+    return set(pair for pair in currency_pairs)
 
 
 class Requester(HttpRequesterBase):
-    def __init__(self, api_url: str):
-        super().__init__(api_url)
+    json_decoder = _JSON_DECODER
+
+    def __init__(
+        self,
+        api_url: str,
+        session: Optional[HttpSession] = None,
+        hedging: Optional[HedgingPolicy] = None,
+        cache: Optional[DiskCache] = None,
+        latest_cache_ttl: float = 60.0,
+        coalesce: bool = True,
+    ):
+        super().__init__(api_url, session, hedging, cache, coalesce)
+        self._latest_cache_ttl = latest_cache_ttl
 
     def response_check_hook(self, response_payload: Any) -> None:
-        if not response_payload["success"]:
-            raise QuickForexError(
-                f"received error response from exchangerate.host: {response_payload}"
-            )
+        _check_response(response_payload)
+
+    def response_cache_ttl_hook(
+        self, endpoint: str, params: Optional[dict[str, str]]
+    ) -> Optional[float]:
+        if endpoint == "latest":
+            return self._latest_cache_ttl
+        last_date_str = params["end_date"] if endpoint == "timeseries" else endpoint
+        if _parse_date(last_date_str) < date.today():
+            return NEVER_EXPIRES
+        return self._latest_cache_ttl
+
+
+class AsyncRequester(AsyncHttpRequesterBase):
+    json_decoder = _JSON_DECODER
+
+    def __init__(self, api_url: str, settings: Optional[SessionSettings] = None):
+        super().__init__(api_url, settings)
+
+    def response_check_hook(self, response_payload: Any) -> None:
+        _check_response(response_payload)
 
 
 @dataclass
 class Settings:
-    decimal_places: int = 6
+    # Number of decimal places of the rates, requested from the API ('places' parameter)
+    decimal_places: int = DECIMAL_PLACES
     source: Optional[str] = None
+    pool_maxsize: int = 10
+    keep_alive: bool = True
+    max_concurrent_requests: int = 8
+    max_concurrent_time_series_requests: int = 4
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    hedge_percentile: Optional[float] = None
+    cache_directory: Optional[str] = None
+    cache_max_size_mb: int = 256
+    latest_cache_ttl: float = 60.0
+    triangulation_pivot: Optional[str] = None
+    coalesce_requests: bool = True
+    numeric_mode: str = "decimal"
+    stream_time_series: bool = False
+    time_series_chunk_days: Optional[int] = None
+
+    @property
+    def numeric(self) -> NumericMode:
+        return NumericMode.parse(self.numeric_mode)
+
+    def create_rate_converter(self) -> Callable[[Any], RateType]:
+        return rate_converter(self.numeric, self.decimal_places)
+
+    def create_rate_parser(self) -> Callable[[Any], RateType]:
+        return rate_parser(self.numeric, self.decimal_places)
+
+    def create_buffer_value_parser(self) -> Callable[[Any], Any]:
+        return buffer_value_parser(self.numeric, self.decimal_places)
+
+    def create_series_builder(self, date_range: DateRange) -> RateSeriesBuilder:
+        return RateSeriesBuilder(date_range, self.numeric, self.decimal_places)
+
+    @property
+    def triangulation_places(self) -> int:
+        return self.decimal_places + TRIANGULATION_GUARD_DIGITS
+
+    @property
+    def session_settings(self) -> SessionSettings:
+        return SessionSettings(
+            pool_maxsize=self.pool_maxsize,
+            keep_alive=self.keep_alive,
+            connect_timeout=self.connect_timeout,
+            read_timeout=self.read_timeout,
+        )
+
+    @property
+    def hedging_policy(self) -> Optional[HedgingPolicy]:
+        if self.hedge_percentile is None:
+            return None
+        return HedgingPolicy(percentile=self.hedge_percentile)
+
+    def create_cache(self) -> Optional[DiskCache]:
+        if self.cache_directory is None:
+            return None
+        return DiskCache(
+            self.cache_directory, max_size_bytes=self.cache_max_size_mb * 1024 * 1024
+        )
+
+
+@dataclass
+class _Request:
+    endpoint: str
+    params: dict[str, Any]
+    # When set, the time series response is merged into this merger (rather than returned)
+    merger: Optional[_TimeSeriesMerger] = None
+
+
+@dataclass
+class _RequestBatch:
+    requests: list[_Request]
+    time_series: bool = False
+
+
+# The provider operations are generators yielding the batches of requests to send, and receiving
+# the responses of each batch (in the order of the requests). They are shared by the synchronous
+# and asynchronous providers, which only differ in the way they send the requests.
+_Operation = Generator[_RequestBatch, list[Any], T]
+
+
+class _ExchangeRateHostOperations(object):
+    def __init__(self, settings: Settings):
+        self._settings = settings
+        self._convert_rate = settings.create_rate_converter()
+        self._parse_rate = settings.create_rate_parser()
+        self._parse_series_value = settings.create_buffer_value_parser()
+        self._chunk_sizer = ChunkSizer(max_days=MAX_TIME_SERIES_DAYS)
+
+    @property
+    def settings(self) -> Settings:
+        return self._settings
+
+    def _rates(
+        self, currency_pairs: Iterable[CurrencyPair], as_of: Optional[date]
+    ) -> _Operation[dict[CurrencyPair, RateType]]:
+        currency_pairs = set(pair for pair in currency_pairs)
+        if self._settings.triangulation_pivot is None:
+            return (yield from self._direct_rates(currency_pairs, as_of))
+        pivot = self._settings.triangulation_pivot
+        symbols = pivot_symbols(currency_pairs, pivot)
+        pivot_rates: dict[SymbolType, Decimal] = {}
+        if symbols:
+            endpoint, params = _rates_request(
+                pivot, symbols, as_of, places=self._settings.triangulation_places
+            )
+            (response,) = yield _RequestBatch([_Request(endpoint, params)])
+            pivot_rates = _parse_pivot_rates(pivot, response)
+        triangulated_rates, unresolved_pairs = triangulate(
+            currency_pairs,
+            pivot,
+            pivot_rates,
+            self._settings.triangulation_places,
+            self._settings.decimal_places,
+        )
+        rates = {
+            pair: self._convert_rate(rate) for pair, rate in triangulated_rates.items()
+        }
+        if unresolved_pairs:
+            rates.update((yield from self._direct_rates(unresolved_pairs, as_of)))
+        return rates
+
+    def _direct_rates(
+        self, currency_pairs: set[CurrencyPair], as_of: Optional[date]
+    ) -> _Operation[dict[CurrencyPair, RateType]]:
+        remaining_pairs = set(pair for pair in currency_pairs)
+        groups = _group_pairs_by_domestic_currency(currency_pairs)
+        responses = yield _RequestBatch(
+            [
+                _Request(
+                    *_rates_request(
+                        domestic_currency,
+                        foreign_currencies,
+                        as_of,
+                        places=self._settings.decimal_places,
+                    )
+                )
+                for domestic_currency, foreign_currencies in groups.items()
+            ]
+        )
+        rates: dict[CurrencyPair, RateType] = {}
+        for domestic_currency, response in zip(groups.keys(), responses):
+            _merge_rates_response(
+                rates,
+                remaining_pairs,
+                domestic_currency,
+                response,
+                self._parse_rate,
+            )
+        _check_no_remaining_pairs(remaining_pairs)
+        return rates
+
+    def _rates_time_series(
+        self, currency_pairs: Iterable[CurrencyPair], date_range: DateRange
+    ) -> _Operation[dict[CurrencyPair, RateSeries]]:
+        assert date_range.end_date <= date.today()
+        currency_pairs = _normalize_currency_pairs(currency_pairs)
+        if self._settings.triangulation_pivot is None:
+            return (
+                yield from self._direct_rates_time_series(currency_pairs, date_range)
+            )
+        pivot = self._settings.triangulation_pivot
+        symbols = pivot_symbols(currency_pairs, pivot)
+        pivot_series: dict[date, dict[SymbolType, Decimal]] = {}
+        if not symbols:
+            pivot_series = {dt: {} for dt in date_range}
+        else:
+            chunk_days = _time_series_chunk_days(
+                self._settings, self._chunk_sizer, date_range, {pivot: symbols}
+            )
+            responses = yield _RequestBatch(
+                [
+                    _Request(
+                        *_time_series_request(
+                            current_range,
+                            pivot,
+                            symbols,
+                            places=self._settings.triangulation_places,
+                        )
+                    )
+                    for current_range in date_range.chunks(chunk_days)
+                ],
+                time_series=True,
+            )
+            for response in responses:
+                _merge_pivot_time_series_response(pivot_series, pivot, response)
+        triangulated_series, unresolved_pairs = triangulate_time_series(
+            currency_pairs,
+            pivot,
+            pivot_series,
+            self._settings.triangulation_places,
+            self._settings.decimal_places,
+        )
+        series = {
+            pair: RateSeries.from_rates(
+                date_range,
+                pair_series,
+                self._settings.numeric,
+                self._settings.decimal_places,
+            )
+            for pair, pair_series in triangulated_series.items()
+        }
+        if unresolved_pairs:
+            series.update(
+                (
+                    yield from self._direct_rates_time_series(
+                        unresolved_pairs, date_range
+                    )
+                )
+            )
+        return series
+
+    def _direct_rates_time_series(
+        self, currency_pairs: set[CurrencyPair], date_range: DateRange
+    ) -> _Operation[dict[CurrencyPair, RateSeries]]:
+        groups = _group_pairs_by_domestic_currency(currency_pairs)
+        chunk_days = _time_series_chunk_days(
+            self._settings, self._chunk_sizer, date_range, groups
+        )
+        builders = _create_series_builders(
+            groups, lambda: self._settings.create_series_builder(date_range)
+        )
+        yield _RequestBatch(
+            [
+                _Request(
+                    *_time_series_request(
+                        current_range,
+                        domestic_currency,
+                        foreign_currencies,
+                        places=self._settings.decimal_places,
+                    ),
+                    merger=_TimeSeriesMerger(
+                        builders[domestic_currency], self._parse_series_value
+                    ),
+                )
+                for current_range in date_range.chunks(chunk_days)
+                for domestic_currency, foreign_currencies in groups.items()
+            ],
+            time_series=True,
+        )
+        return _build_series(builders)
 
 
 @registered_provider
-class ExchangeRateHostProvider(ProviderBase):
+class ExchangeRateHostProvider(_ExchangeRateHostOperations, ProviderBase):
     """Provider backed by exchangerate.host"""
 
     identifier = "exchangerate.host"
@@ -75,48 +570,67 @@ class ExchangeRateHostProvider(ProviderBase):
     def __init__(
         self, requester: Optional[Requester] = None, settings: Optional[Settings] = None
     ):
-        self._requester = requester or Requester(API_URL)
-        self._settings = settings or Settings()
+        super().__init__(settings or Settings())
+        self._requester = requester or Requester(
+            _get_api_url(),
+            session=get_shared_session(self._settings.session_settings),
+            hedging=self._settings.hedging_policy,
+            cache=self._settings.create_cache(),
+            latest_cache_ttl=self._settings.latest_cache_ttl,
+            coalesce=self._settings.coalesce_requests,
+        )
+        self._requester.add_response_observer(
+            _create_time_series_observer(self._chunk_sizer)
+        )
+        self._requests_executor = BoundedExecutor(
+            self._settings.max_concurrent_requests
+        )
+        self._time_series_executor = BoundedExecutor(
+            self._settings.max_concurrent_time_series_requests
+        )
 
-    def _get_rates(
-        self, currency_pairs: Iterable[CurrencyPair], as_of: Optional[date] = None
-    ):
-        currency_pairs = set(pair for pair in currency_pairs)
-        remaining_pairs = set(pair for pair in currency_pairs)
-        groups = _group_pairs_by_domestic_currency(currency_pairs)
-        rates: dict[CurrencyPair, Decimal] = {}
-        for domestic_currency, foreign_currencies in groups.items():
-            response = self._requester.get(
-                _format_date(as_of) if as_of else "latest",
-                params={
-                    "base": domestic_currency,
-                    "symbols": ",".join(foreign_currencies),
-                    "places": DECIMAL_PLACES,
-                },
-            )
-            base_currency = response["base"]
-            if base_currency != domestic_currency:
-                raise QuickForexError(
-                    f"server responded with unexpected base currency '{base_currency}'"
-                    f" (expected '{domestic_currency}')"
+    def close(self) -> None:
+        self._requests_executor.shutdown()
+        self._time_series_executor.shutdown()
+        self._requester.close()
+
+    def __enter__(self) -> "ExchangeRateHostProvider":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _run(self, operation: _Operation[T]) -> T:
+        responses = None
+        try:
+            while True:
+                batch = operation.send(responses)
+                executor = (
+                    self._time_series_executor
+                    if batch.time_series
+                    else self._requests_executor
                 )
-            for foreign_currency, rate in response["rates"].items():
-                currency_pair = CurrencyPair(base_currency, foreign_currency)
-                remaining_pairs.remove(currency_pair)
-                rates[currency_pair] = Decimal(rate)
-        if remaining_pairs:
-            formatted_pairs = ", ".join(
-                f"{pair.domestic}{pair.foreign}" for pair in remaining_pairs
+                responses = executor.map(self._send, batch.requests)
+        except StopIteration as stop:
+            return stop.value
+
+    def _send(self, request: _Request) -> Any:
+        if request.merger is None:
+            return self._requester.get(request.endpoint, params=request.params)
+        if self._settings.stream_time_series:
+            self._requester.get_streamed(
+                request.endpoint, request.params, "rates", request.merger.merge_rates
             )
-            raise QuickForexError(
-                f"server did not return rate for the following currency pairs: {formatted_pairs}"
+        else:
+            request.merger.merge_response(
+                self._requester.get(request.endpoint, params=request.params)
             )
-        return rates
+        return None
 
     def get_latest_rates(
         self, currency_pairs: Iterable[CurrencyPair]
     ) -> dict[CurrencyPair, Decimal]:
-        return self._get_rates(currency_pairs)
+        return self._run(self._rates(currency_pairs, None))
 
     def get_latest_rate(self, currency_pair: CurrencyPair) -> Decimal:
         return self.get_latest_rates([currency_pair])[currency_pair]
@@ -124,40 +638,131 @@ class ExchangeRateHostProvider(ProviderBase):
     def get_historical_rates(
         self, currency_pairs: Iterable[CurrencyPair], as_of: date
     ) -> dict[CurrencyPair, Decimal]:
-        return self._get_rates(currency_pairs, as_of)
+        return self._run(self._rates(currency_pairs, as_of))
 
     def get_historical_rate(self, currency_pair: CurrencyPair, as_of: date) -> Decimal:
         return self.get_historical_rates([currency_pair], as_of)[currency_pair]
 
     def get_rates_time_series(
         self, currency_pairs: Iterable[CurrencyPair], date_range: DateRange
-    ) -> dict[CurrencyPair, dict[date, Decimal]]:
+    ) -> dict[CurrencyPair, RateSeries]:
+        return self._run(self._rates_time_series(currency_pairs, date_range))
+
+    def iter_rates_time_series(
+        self,
+        currency_pairs: Iterable[CurrencyPair],
+        date_range: DateRange,
+        chunk_days: int = 365,
+    ) -> Iterator[dict[CurrencyPair, RateSeries]]:
+        """Retrieve the rates time series chunk by chunk. The next chunks are downloaded while the
+        current one is consumed, at most max_concurrent_time_series_requests chunks ahead (so only
+        these chunks are held in memory).
+
+        :param currency_pairs: Currency pairs for which to retrieve the exchange rates
+        :param date_range: Date range over which the exchange rates should be retrieved
+        :param chunk_days: Number of days of each chunk
+        :return: Iterator over the time series of each chunk (in chronological order)
+        """
         assert date_range.end_date <= date.today()
-        currency_pairs = (
-            [currency_pairs]
-            if isinstance(currency_pairs, CurrencyPair)
-            else currency_pairs
+        currency_pairs = _normalize_currency_pairs(currency_pairs)
+        return iter_prefetched(
+            lambda chunk: self.get_rates_time_series(currency_pairs, chunk),
+            date_range.chunks(chunk_days),
+            max_ahead=self._settings.max_concurrent_time_series_requests,
         )
-        currency_pairs = set(pair for pair in currency_pairs)
-        groups = _group_pairs_by_domestic_currency(currency_pairs)
-        series: dict[CurrencyPair, dict[date, Decimal]] = defaultdict(dict)
-        for current_range in _iter_date_range_chunks(date_range, interval_days=365):
-            for domestic_currency, foreign_currencies in groups.items():
-                response = self._requester.get(
-                    "timeseries",
-                    params={
-                        "start_date": _format_date(current_range.start_date),
-                        "end_date": _format_date(current_range.end_date),
-                        "base": domestic_currency,
-                        "symbols": ",".join(foreign_currencies),
-                        "places": DECIMAL_PLACES,
-                    },
+
+
+@registered_async_provider
+class AsyncExchangeRateHostProvider(_ExchangeRateHostOperations, AsyncProviderBase):
+    """Provider backed by exchangerate.host"""
+
+    identifier = "exchangerate.host"
+
+    def __init__(
+        self,
+        requester: Optional[AsyncRequester] = None,
+        settings: Optional[Settings] = None,
+    ):
+        super().__init__(settings or Settings())
+        self._requester = requester or AsyncRequester(
+            _get_api_url(), settings=self._settings.session_settings
+        )
+        self._requester.add_response_observer(
+            _create_time_series_observer(self._chunk_sizer)
+        )
+
+    async def close(self) -> None:
+        await self._requester.close()
+
+    async def __aenter__(self) -> "AsyncExchangeRateHostProvider":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    async def _run(self, operation: _Operation[T]) -> T:
+        responses = None
+        try:
+            while True:
+                batch = operation.send(responses)
+                responses = await gather_bounded(
+                    (self._send(request) for request in batch.requests),
+                    max_concurrency=(
+                        self._settings.max_concurrent_time_series_requests
+                        if batch.time_series
+                        else self._settings.max_concurrent_requests
+                    ),
                 )
-                for date_str, rates_by_symbol in response["rates"].items():
-                    current_date = _parse_date(date_str)
-                    for foreign_currency, rate in rates_by_symbol.items():
-                        currency_pair = CurrencyPair(
-                            domestic_currency, foreign_currency
-                        )
-                        series[currency_pair][current_date] = Decimal(rate)
-        return series
+        except StopIteration as stop:
+            return stop.value
+
+    async def _send(self, request: _Request) -> Any:
+        if request.merger is None:
+            return await self._requester.get(request.endpoint, params=request.params)
+        if self._settings.stream_time_series:
+            await self._requester.get_streamed(
+                request.endpoint, request.params, "rates", request.merger.merge_rates
+            )
+        else:
+            request.merger.merge_response(
+                await self._requester.get(request.endpoint, params=request.params)
+            )
+        return None
+
+    async def get_latest_rates(
+        self, currency_pairs: Iterable[CurrencyPair]
+    ) -> dict[CurrencyPair, Decimal]:
+        return await self._run(self._rates(currency_pairs, None))
+
+    async def get_latest_rate(self, currency_pair: CurrencyPair) -> Decimal:
+        return (await self.get_latest_rates([currency_pair]))[currency_pair]
+
+    async def get_historical_rates(
+        self, currency_pairs: Iterable[CurrencyPair], as_of: date
+    ) -> dict[CurrencyPair, Decimal]:
+        return await self._run(self._rates(currency_pairs, as_of))
+
+    async def get_historical_rate(
+        self, currency_pair: CurrencyPair, as_of: date
+    ) -> Decimal:
+        return (await self.get_historical_rates([currency_pair], as_of))[currency_pair]
+
+    async def get_rates_time_series(
+        self, currency_pairs: Iterable[CurrencyPair], date_range: DateRange
+    ) -> dict[CurrencyPair, RateSeries]:
+        return await self._run(self._rates_time_series(currency_pairs, date_range))
+
+    def iter_rates_time_series(
+        self,
+        currency_pairs: Iterable[CurrencyPair],
+        date_range: DateRange,
+        chunk_days: int = 365,
+    ) -> AsyncIterator[dict[CurrencyPair, RateSeries]]:
+        """Asynchronous counterpart of ExchangeRateHostProvider.iter_rates_time_series"""
+        assert date_range.end_date <= date.today()
+        currency_pairs = _normalize_currency_pairs(currency_pairs)
+        return aiter_prefetched(
+            lambda chunk: self.get_rates_time_series(currency_pairs, chunk),
+            date_range.chunks(chunk_days),
+            max_ahead=self._settings.max_concurrent_time_series_requests,
+        )
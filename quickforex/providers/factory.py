@@ -1,13 +1,34 @@
 from typing import Type, Any, Optional
+import importlib
 
 from quickforex.errors import QuickForexError
-from quickforex.providers.base import ProviderBase
+from quickforex.providers.base import ProviderBase, AsyncProviderBase
 from quickforex.providers.provider_metadata import (
     ProviderMetadata,
     SettingFieldDescription,
 )
 
 
+DEFAULT_PROVIDER_ID = "exchangerate.host"
+
+
+# Modules defining the built-in providers. They are only imported (which registers their
+# providers) when one of their providers is looked up, so that importing quickforex does not
+# import the dependencies of every provider.
+_BUILTIN_PROVIDER_MODULES = {
+    "exchangerate.host": "quickforex.providers.exchangerate_host",
+    "dummy": "quickforex.providers.dummy",
+    "caching": "quickforex.providers.caching",
+    "sqlite": "quickforex.providers.sqlite_store",
+    "batching": "quickforex.providers.batching",
+    "routing": "quickforex.providers.routing",
+}
+_BUILTIN_ASYNC_PROVIDER_MODULES = {
+    "exchangerate.host": "quickforex.providers.exchangerate_host",
+    "dummy": "quickforex.providers.dummy",
+}
+
+
 class AlreadyRegisteredProviderError(QuickForexError):
     def __init__(self, provider_id: str):
         super().__init__(
@@ -21,8 +42,16 @@ class MissingProviderError(QuickForexError):
 
 
 class Directory(object):
-    def __init__(self):
+    def __init__(self, provider_modules: Optional[dict[str, str]] = None):
+        """
+        :param provider_modules: Modules to import to register a provider, by provider identifier
+        """
         self._providers: dict[str, Type[ProviderBase]] = {}
+        self._provider_modules = provider_modules or {}
+
+    def _load(self, provider_id: str) -> None:
+        if provider_id not in self._providers and provider_id in self._provider_modules:
+            importlib.import_module(self._provider_modules[provider_id])
 
     def register(self, provider_type: Type[ProviderBase]):
         provider_id = provider_type.identifier
@@ -31,6 +60,7 @@ class Directory(object):
         self._providers[provider_id] = provider_type
 
     def is_registered(self, provider_id: str) -> bool:
+        self._load(provider_id)
         return provider_id in self._providers
 
     def get_provider_type(self, provider_id: str) -> Type[ProviderBase]:
@@ -58,7 +88,7 @@ class Directory(object):
                 )
             missing_settings: list[SettingFieldDescription] = [
                 field
-                for field in meta.settings_schema
+                for field in meta.required_settings_fields
                 if field.name not in settings_overrides
             ]
             if missing_settings:
@@ -74,13 +104,16 @@ class Directory(object):
 
     @property
     def available_providers(self) -> list[ProviderMetadata]:
+        for provider_id in self._provider_modules:
+            self._load(provider_id)
         return [
             self.get_provider_metadata(provider_id)
             for provider_id in self._providers.keys()
         ]
 
 
-_DIRECTORY = Directory()
+_DIRECTORY = Directory(_BUILTIN_PROVIDER_MODULES)
+_ASYNC_DIRECTORY = Directory(_BUILTIN_ASYNC_PROVIDER_MODULES)
 
 
 def registered_provider(provider_type: Type[ProviderBase]) -> Type[ProviderBase]:
@@ -88,6 +121,13 @@ def registered_provider(provider_type: Type[ProviderBase]) -> Type[ProviderBase]
     return provider_type
 
 
+def registered_async_provider(
+    provider_type: Type[AsyncProviderBase],
+) -> Type[AsyncProviderBase]:
+    _ASYNC_DIRECTORY.register(provider_type)
+    return provider_type
+
+
 def get_available_providers() -> list[ProviderMetadata]:
     return _DIRECTORY.available_providers
 
@@ -96,6 +136,10 @@ def get_provider_metadata(provider_id: str) -> ProviderMetadata:
     return _DIRECTORY.get_provider_metadata(provider_id)
 
 
+def get_provider_type(provider_id: str) -> Type[ProviderBase]:
+    return _DIRECTORY.get_provider_type(provider_id)
+
+
 def provider_exists(provider_id: str) -> bool:
     return _DIRECTORY.is_registered(provider_id)
 
@@ -104,3 +148,34 @@ def create_provider(
     provider_id: str, settings_overrides: Optional[dict[str, Any]] = None
 ):
     return _DIRECTORY.create(provider_id, settings_overrides)
+
+
+def async_provider_exists(provider_id: str) -> bool:
+    return _ASYNC_DIRECTORY.is_registered(provider_id)
+
+
+def get_async_provider_type(provider_id: str) -> Type[AsyncProviderBase]:
+    return _ASYNC_DIRECTORY.get_provider_type(provider_id)
+
+
+def create_async_provider(
+    provider_id: str, settings_overrides: Optional[dict[str, Any]] = None
+):
+    return _ASYNC_DIRECTORY.create(provider_id, settings_overrides)
+
+
+def create_wrapped_provider(
+    wrapper_id: str, provider: Optional[ProviderBase], provider_id: str
+) -> ProviderBase:
+    """Resolve the provider wrapped by a provider wrapper.
+
+    :param wrapper_id: Identifier of the wrapper
+    :param provider: Wrapped provider instance, if provided by the caller
+    :param provider_id: Identifier of the provider to create otherwise (with default settings)
+    :return: Wrapped provider
+    """
+    if provider is not None:
+        return provider
+    if provider_id == wrapper_id:
+        raise QuickForexError(f"provider '{wrapper_id}' cannot wrap itself")
+    return create_provider(provider_id)
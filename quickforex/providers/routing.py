@@ -0,0 +1,274 @@
+from typing import Callable, Iterable, Optional, TypeVar
+from dataclasses import dataclass
+from concurrent import futures
+from datetime import date
+from decimal import Decimal
+import contextvars
+import threading
+import time
+
+from quickforex.domain import CurrencyPair, DateRange
+from quickforex.errors import QuickForexError
+from quickforex.deadline import DeadlineExceededError, current_deadline
+from quickforex.logger import get_module_logger
+from quickforex.providers.factory import registered_provider, create_wrapped_provider
+from quickforex.providers.base import ProviderBase
+
+
+logger = get_module_logger(__name__)
+
+
+T = TypeVar("T")
+
+
+@dataclass
+class Settings:
+    provider_ids: str = "exchangerate.host"
+    race: bool = False
+    smoothing: float = 0.2
+    max_error_rate: float = 0.5
+    probe_interval: float = 30.0
+
+
+@dataclass(frozen=True)
+class BackendStats:
+    identifier: str
+    latency: Optional[float]
+    error_rate: float
+    healthy: bool
+
+
+class _Backend(object):
+    def __init__(self, provider: ProviderBase):
+        self.provider = provider
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.last_failure: Optional[float] = None
+
+
+@registered_provider
+class RoutingProvider(ProviderBase):
+    """Provider routing each lookup to the fastest healthy provider among several providers"""
+
+    identifier = "routing"
+
+    def __init__(
+        self,
+        providers: Optional[list[ProviderBase]] = None,
+        settings: Optional[Settings] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """The latency and the error rate of each wrapped provider are tracked with exponentially
+        weighted moving averages. Each lookup is sent to the healthy provider with the lowest
+        latency (providers without latency measurement first) and, when it fails, to the next
+        providers in order. A provider is unhealthy while its error rate exceeds max_error_rate,
+        and is given a single lookup (probe) again once probe_interval elapsed since its last
+        failure.
+
+        :param providers: Wrapped providers (created from the provider_ids setting when not provided)
+        :param settings: Routing settings:
+            - provider_ids: comma separated identifiers of the wrapped providers
+            - race: when enabled, each lookup is sent to the two best providers at once and the
+              first successful response is used
+            - smoothing: weight of the last lookup in the latency and error rate averages
+            - max_error_rate: error rate above which a provider is unhealthy
+            - probe_interval: time (in seconds) after which an unhealthy provider is tried again
+        :param clock: Monotonic clock (in seconds) used to measure the latencies and the time since
+            the last failures
+        """
+        self._settings = settings or Settings()
+        if providers is None:
+            providers = [
+                create_wrapped_provider(self.identifier, None, provider_id.strip())
+                for provider_id in self._settings.provider_ids.split(",")
+                if provider_id.strip()
+            ]
+        if not providers:
+            raise QuickForexError("provider 'routing' requires at least one provider")
+        self._backends = [_Backend(provider) for provider in providers]
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._race_executor: Optional[futures.ThreadPoolExecutor] = None
+
+    @property
+    def providers(self) -> list[ProviderBase]:
+        return [backend.provider for backend in self._backends]
+
+    @property
+    def stats(self) -> list[BackendStats]:
+        """
+        :return: Latency (in seconds) and error rate averages of each wrapped provider
+        """
+        now = self._clock()
+        with self._lock:
+            return [
+                BackendStats(
+                    identifier=backend.provider.identifier,
+                    latency=backend.latency,
+                    error_rate=backend.error_rate,
+                    healthy=self._is_available(backend, now),
+                )
+                for backend in self._backends
+            ]
+
+    def _is_available(self, backend: _Backend, now: float) -> bool:
+        return (
+            backend.error_rate <= self._settings.max_error_rate
+            or backend.last_failure is None
+            or now - backend.last_failure >= self._settings.probe_interval
+        )
+
+    def _is_probe_due(self, backend: _Backend, now: float) -> bool:
+        return (
+            backend.error_rate > self._settings.max_error_rate
+            and backend.last_failure is not None
+            and now - backend.last_failure >= self._settings.probe_interval
+        )
+
+    def _ranked_backends(self) -> list[_Backend]:
+        now = self._clock()
+        with self._lock:
+            # A single lookup probes an unhealthy provider once probe_interval elapsed: the probe
+            # is claimed (as if the provider just failed), and the provider is tried first
+            probed = [
+                backend
+                for backend in self._backends
+                if self._is_probe_due(backend, now)
+            ]
+            for backend in probed:
+                backend.last_failure = now
+            return probed + sorted(
+                (backend for backend in self._backends if backend not in probed),
+                key=lambda backend: (
+                    not self._is_available(backend, now),
+                    backend.latency is not None,
+                    backend.latency or 0.0,
+                    backend.error_rate,
+                ),
+            )
+
+    def _record(self, backend: _Backend, latency: float, failed: bool) -> None:
+        smoothing = self._settings.smoothing
+        with self._lock:
+            if not failed:
+                backend.latency = (
+                    latency
+                    if backend.latency is None
+                    else smoothing * latency + (1 - smoothing) * backend.latency
+                )
+            else:
+                backend.last_failure = self._clock()
+            backend.error_rate = smoothing * float(failed) + (
+                (1 - smoothing) * backend.error_rate
+            )
+
+    def _call_backend(
+        self, backend: _Backend, lookup: Callable[[ProviderBase], T]
+    ) -> T:
+        start = self._clock()
+        try:
+            outcome = lookup(backend.provider)
+        except DeadlineExceededError:
+            raise
+        except Exception as e:
+            self._record(backend, self._clock() - start, failed=True)
+            logger.debug(f"provider '{backend.provider.identifier}' failed: {e}")
+            raise
+        self._record(backend, self._clock() - start, failed=False)
+        return outcome
+
+    def _get_race_executor(self) -> futures.ThreadPoolExecutor:
+        with self._lock:
+            if self._race_executor is None:
+                self._race_executor = futures.ThreadPoolExecutor(
+                    thread_name_prefix="quickforex-routing"
+                )
+            return self._race_executor
+
+    def _race(self, backends: list[_Backend], lookup: Callable[[ProviderBase], T]) -> T:
+        executor = self._get_race_executor()
+        pending = {
+            executor.submit(
+                contextvars.copy_context().run, self._call_backend, backend, lookup
+            )
+            for backend in backends
+        }
+        deadline = current_deadline()
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = futures.wait(
+                pending,
+                timeout=deadline.remaining if deadline else None,
+                return_when=futures.FIRST_COMPLETED,
+            )
+            if not done:
+                raise DeadlineExceededError(deadline.timeout)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def _route(self, lookup: Callable[[ProviderBase], T]) -> T:
+        backends = self._ranked_backends()
+        if self._settings.race and len(backends) > 1:
+            try:
+                return self._race(backends[:2], lookup)
+            except DeadlineExceededError:
+                raise
+            except Exception as e:
+                if len(backends) == 2:
+                    raise
+                logger.debug(f"raced providers failed ({e}), trying the next providers")
+                backends = backends[2:]
+        for index, backend in enumerate(backends):
+            try:
+                return self._call_backend(backend, lookup)
+            except DeadlineExceededError:
+                raise
+            except Exception:
+                if index == len(backends) - 1:
+                    raise
+
+    def close(self) -> None:
+        """Release the threads used to race the lookups (the wrapped providers are not closed)."""
+        with self._lock:
+            if self._race_executor is not None:
+                self._race_executor.shutdown(wait=False)
+                self._race_executor = None
+
+    def __enter__(self) -> "RoutingProvider":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def get_latest_rates(
+        self, currency_pairs: Iterable[CurrencyPair]
+    ) -> dict[CurrencyPair, Decimal]:
+        currency_pairs = list(currency_pairs)
+        return self._route(lambda provider: provider.get_latest_rates(currency_pairs))
+
+    def get_latest_rate(self, currency_pair: CurrencyPair) -> Decimal:
+        return self._route(lambda provider: provider.get_latest_rate(currency_pair))
+
+    def get_historical_rates(
+        self, currency_pairs: Iterable[CurrencyPair], as_of: date
+    ) -> dict[CurrencyPair, Decimal]:
+        currency_pairs = list(currency_pairs)
+        return self._route(
+            lambda provider: provider.get_historical_rates(currency_pairs, as_of)
+        )
+
+    def get_historical_rate(self, currency_pair: CurrencyPair, as_of: date) -> Decimal:
+        return self._route(
+            lambda provider: provider.get_historical_rate(currency_pair, as_of)
+        )
+
+    def get_rates_time_series(
+        self, currency_pairs: Iterable[CurrencyPair], date_range: DateRange
+    ) -> dict[CurrencyPair, dict[date, Decimal]]:
+        currency_pairs = list(currency_pairs)
+        return self._route(
+            lambda provider: provider.get_rates_time_series(currency_pairs, date_range)
+        )
@@ -0,0 +1,170 @@
+from typing import Iterable, Optional
+from dataclasses import dataclass
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+
+from quickforex.domain import CurrencyPair, DateRange
+from quickforex.logger import get_module_logger
+from quickforex.numeric import RateType, decimal_rate, rate_converter
+from quickforex.rate_store import RateStore, merge_ranges
+from quickforex.rate_series import RateSeries
+from quickforex.providers.factory import registered_provider, create_wrapped_provider
+from quickforex.providers.base import ProviderBase, rates_format
+
+
+logger = get_module_logger(__name__)
+
+
+@dataclass
+class Settings:
+    database_path: str
+    provider_id: str = "exchangerate.host"
+    fetch_chunk_days: int = 365
+
+
+@registered_provider
+class SqliteStoreProvider(ProviderBase):
+    """Provider persisting the historical rates returned by another provider in a SQLite database"""
+
+    identifier = "sqlite"
+
+    def __init__(
+        self,
+        provider: Optional[ProviderBase] = None,
+        settings: Optional[Settings] = None,
+        store: Optional[RateStore] = None,
+    ):
+        """
+        :param provider: Wrapped provider (created from the provider_id setting when not provided)
+        :param settings: Store settings:
+            - database_path: path to the SQLite database file
+            - provider_id: identifier of the wrapped provider
+            - fetch_chunk_days: missing date ranges of a currency pair lying within this number of
+              days of each other are fetched with a single request
+        :param store: Rates store (created from the database_path setting when not provided)
+
+        Rates are stored unscaled, and converted back to the numeric mode of the wrapped provider
+        when they are read.
+        """
+        assert settings is not None or store is not None
+        self._settings = settings
+        self._provider = create_wrapped_provider(
+            self.identifier,
+            provider,
+            settings.provider_id if settings else Settings.provider_id,
+        )
+        self._store = store or RateStore(settings.database_path)
+        self._fetch_chunk_days = (
+            settings.fetch_chunk_days if settings else Settings.fetch_chunk_days
+        )
+        self._numeric_mode, self._decimal_places = rates_format(self._provider)
+        self._convert = rate_converter(self._numeric_mode, self._decimal_places)
+
+    @property
+    def provider(self) -> ProviderBase:
+        return self._provider
+
+    @property
+    def store(self) -> RateStore:
+        return self._store
+
+    def close(self) -> None:
+        self._store.close()
+
+    def get_latest_rates(
+        self, currency_pairs: Iterable[CurrencyPair]
+    ) -> dict[CurrencyPair, Decimal]:
+        return self._provider.get_latest_rates(currency_pairs)
+
+    def get_latest_rate(self, currency_pair: CurrencyPair) -> Decimal:
+        return self._provider.get_latest_rate(currency_pair)
+
+    def get_historical_rates(
+        self, currency_pairs: Iterable[CurrencyPair], as_of: date
+    ) -> dict[CurrencyPair, Decimal]:
+        if as_of >= date.today():
+            return self._provider.get_historical_rates(currency_pairs, as_of)
+        rates: dict[CurrencyPair, Decimal] = {}
+        missing_pairs: set[CurrencyPair] = set()
+        for pair in set(currency_pairs):
+            rate = self._store.get_rate(pair, as_of)
+            if rate is None:
+                missing_pairs.add(pair)
+            else:
+                rates[pair] = self._convert(rate)
+        if missing_pairs:
+            fetched_rates = self._provider.get_historical_rates(missing_pairs, as_of)
+            for pair, rate in fetched_rates.items():
+                self._store.put_rates(
+                    pair, {as_of: self._decimal_rate(rate)}, DateRange(as_of, as_of)
+                )
+            rates.update(fetched_rates)
+        return rates
+
+    def get_historical_rate(self, currency_pair: CurrencyPair, as_of: date) -> Decimal:
+        return self.get_historical_rates([currency_pair], as_of)[currency_pair]
+
+    def get_rates_time_series(
+        self, currency_pairs: Iterable[CurrencyPair], date_range: DateRange
+    ) -> dict[CurrencyPair, RateSeries]:
+        currency_pairs = set(currency_pairs)
+        last_stored_date = date.today() - timedelta(days=1)
+        pairs_by_missing_range: dict[DateRange, set[CurrencyPair]] = defaultdict(set)
+        if date_range.start_date <= last_stored_date:
+            stored_range = DateRange(
+                date_range.start_date, min(date_range.end_date, last_stored_date)
+            )
+            for pair in currency_pairs:
+                for missing_range in merge_ranges(
+                    self._store.find_missing_ranges(pair, stored_range),
+                    self._fetch_chunk_days,
+                ):
+                    pairs_by_missing_range[missing_range].add(pair)
+        if date_range.end_date > last_stored_date:
+            recent_range = DateRange(
+                max(date_range.start_date, last_stored_date + timedelta(days=1)),
+                date_range.end_date,
+            )
+            pairs_by_missing_range[recent_range] = set(currency_pairs)
+        fetched_series: dict[CurrencyPair, dict[date, Decimal]] = defaultdict(dict)
+        for missing_range, pairs in pairs_by_missing_range.items():
+            logger.debug(f"fetching {missing_range} for {len(pairs)} currency pair(s)")
+            missing_series = self._provider.get_rates_time_series(pairs, missing_range)
+            for pair in pairs:
+                pair_series = missing_series.get(pair, {})
+                fetched_series[pair].update(pair_series)
+                if missing_range.start_date <= last_stored_date:
+                    self._store.put_rates(
+                        pair,
+                        {
+                            dt: self._decimal_rate(rate)
+                            for dt, rate in pair_series.items()
+                            if dt <= last_stored_date
+                        },
+                        DateRange(
+                            missing_range.start_date,
+                            min(missing_range.end_date, last_stored_date),
+                        ),
+                    )
+        series: dict[CurrencyPair, RateSeries] = {}
+        for pair in currency_pairs:
+            # Stored (unscaled) rates are scaled by the series builder in the INT64 numeric mode
+            pair_series: dict[date, RateType] = self._store.get_rates(pair, date_range)
+            pair_series.update(
+                (dt, rate)
+                for dt, rate in fetched_series.get(pair, {}).items()
+                if dt > last_stored_date
+            )
+            # Like the wrapped providers, pairs without any rate over the range are left out
+            if pair_series:
+                series[pair] = RateSeries.from_rates(
+                    date_range,
+                    pair_series,
+                    numeric_mode=self._numeric_mode,
+                    decimal_places=self._decimal_places,
+                )
+        return series
+
+    def _decimal_rate(self, rate: RateType) -> Decimal:
+        return decimal_rate(rate, self._numeric_mode, self._decimal_places)
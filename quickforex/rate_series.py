@@ -0,0 +1,266 @@
+from typing import Iterator, Mapping, Optional, Union
+from array import array
+from datetime import date
+from decimal import Decimal
+import math
+
+from quickforex.domain import DateRange
+from quickforex.errors import QuickForexError
+from quickforex.numeric import NumericMode, RateType, rate_converter
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise QuickForexError(
+            "exporting rates series to NumPy requires the 'numpy' package"
+            " (hint: pip install quickforex[numpy])"
+        )
+    return numpy
+
+
+def _buffer_format(numeric_mode: NumericMode) -> str:
+    return "q" if numeric_mode is NumericMode.INT64 else "d"
+
+
+class RateSeries(Mapping[date, RateType]):
+    __slots__ = (
+        "_start_ordinal",
+        "_values",
+        "_mask",
+        "_count",
+        "_numeric_mode",
+        "_decimal_places",
+    )
+
+    def __init__(
+        self,
+        start_date: date,
+        values: Union[array, memoryview],
+        mask=None,
+        numeric_mode: NumericMode = NumericMode.DECIMAL,
+        decimal_places: int = 6,
+    ) -> None:
+        """Time series of rates stored as a contiguous buffer of doubles (one per day from the start
+        date) and a validity mask flagging the days for which a rate is available.
+
+        A rate series is a read-only mapping from date to rate (days without rate are not part of the
+        mapping) and can be sliced by date range without copying the underlying buffers.
+
+        With the DECIMAL numeric mode, rates are read back from the shortest decimal literal of the
+        stored doubles, so that a rate parsed from a decimal literal (of at most 15 significant
+        digits) is returned exactly rather than as the binary approximation stored in the buffer.
+
+        :param start_date: Date of the first value
+        :param values: Buffer of doubles (array('d'), numpy array, memoryview, ...), one per day. With
+            the INT64 numeric mode, buffer of 64 bits integers (array('q'), ...) instead.
+        :param mask: Buffer of bytes (one per value, non-zero when the rate is available), all the
+            values are available when not provided.
+        :param numeric_mode: Type of the rates returned by the series (see quickforex.numeric)
+        :param decimal_places: Number of decimal places of the rates (scale of INT64 rates)
+        """
+        values = memoryview(values)
+        if values.format != _buffer_format(numeric_mode) or values.ndim != 1:
+            raise TypeError(
+                f"rates series values must be a one-dimensional buffer"
+                f" of {'64 bits integers' if numeric_mode is NumericMode.INT64 else 'doubles'}"
+            )
+        if mask is None:
+            mask = b"\x01" * len(values)
+        mask = memoryview(mask).cast("B")
+        if len(mask) != len(values):
+            raise ValueError(
+                f"rates series mask has {len(mask)} entries, expected {len(values)}"
+            )
+        self._start_ordinal = start_date.toordinal()
+        self._values = values.toreadonly()
+        self._mask = mask.toreadonly()
+        self._count = len(mask) - mask.tobytes().count(0)
+        self._numeric_mode = numeric_mode
+        self._decimal_places = decimal_places
+
+    @staticmethod
+    def from_rates(
+        date_range: DateRange,
+        rates: Mapping[date, RateType],
+        numeric_mode: Optional[NumericMode] = None,
+        decimal_places: int = 6,
+    ) -> "RateSeries":
+        """
+        :param date_range: Date range covered by the series (rates outside of this range are ignored)
+        :param rates: Rate for each date
+        :param numeric_mode: Numeric mode of the series (by default, the numeric mode matching the
+            type of the provided rates)
+        :param decimal_places: Number of decimal places of the rates (scale of INT64 rates)
+        """
+        if numeric_mode is None:
+            if isinstance(rates, RateSeries):
+                numeric_mode = rates.numeric_mode
+                decimal_places = rates.decimal_places
+            else:
+                numeric_mode = NumericMode.of(next(iter(rates.values()), Decimal(0)))
+        builder = RateSeriesBuilder(date_range, numeric_mode, decimal_places)
+        for dt, rate in rates.items():
+            builder.set(dt, rate)
+        return builder.build()
+
+    @property
+    def start_date(self) -> date:
+        return date.fromordinal(self._start_ordinal)
+
+    @property
+    def end_date(self) -> date:
+        return date.fromordinal(self._start_ordinal + max(len(self._values) - 1, 0))
+
+    @property
+    def date_range(self) -> DateRange:
+        return DateRange(self.start_date, self.end_date)
+
+    @property
+    def numeric_mode(self) -> NumericMode:
+        return self._numeric_mode
+
+    @property
+    def decimal_places(self) -> int:
+        return self._decimal_places
+
+    @property
+    def buffer(self) -> memoryview:
+        """Read-only view (no copy) of the underlying buffer of doubles (NaN for days without rate,
+        with the FLOAT and DECIMAL numeric modes).
+        """
+        return self._values
+
+    @property
+    def mask(self) -> memoryview:
+        """Read-only view (no copy) of the validity mask (one byte per day, 1 when the rate is available)."""
+        return self._mask
+
+    def to_numpy(self):
+        """
+        :return: Read-only numpy array sharing the buffer of the series (float64 with NaN for days
+            without rate, or int64 with the INT64 numeric mode)
+        """
+        return _import_numpy().frombuffer(
+            self._values,
+            dtype="int64" if self._numeric_mode is NumericMode.INT64 else "float64",
+        )
+
+    def _index(self, dt: date) -> Optional[int]:
+        index = dt.toordinal() - self._start_ordinal
+        if 0 <= index < len(self._values) and self._mask[index]:
+            return index
+        return None
+
+    def __getitem__(self, key: Union[date, DateRange]):
+        if isinstance(key, DateRange):
+            return self._slice(key)
+        if not isinstance(key, date):
+            raise KeyError(key)
+        index = self._index(key)
+        if index is None:
+            raise KeyError(key)
+        if self._numeric_mode is NumericMode.DECIMAL:
+            return Decimal(repr(self._values[index]))
+        return self._values[index]
+
+    def _slice(self, date_range: DateRange) -> "RateSeries":
+        start = min(
+            max(date_range.start_date.toordinal() - self._start_ordinal, 0),
+            len(self._values),
+        )
+        end = min(
+            max(date_range.end_date.toordinal() - self._start_ordinal + 1, start),
+            len(self._values),
+        )
+        return RateSeries(
+            date.fromordinal(self._start_ordinal + start),
+            self._values[start:end],
+            self._mask[start:end],
+            self._numeric_mode,
+            self._decimal_places,
+        )
+
+    def __contains__(self, dt: object) -> bool:
+        return isinstance(dt, date) and self._index(dt) is not None
+
+    def __iter__(self) -> Iterator[date]:
+        for index, valid in enumerate(self._mask):
+            if valid:
+                yield date.fromordinal(self._start_ordinal + index)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __reduce__(self):
+        return RateSeries, (
+            self.start_date,
+            array(_buffer_format(self._numeric_mode), self._values.tobytes()),
+            self._mask.tobytes(),
+            self._numeric_mode,
+            self._decimal_places,
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"RateSeries(start_date={self.start_date!r}, days={len(self._values)},"
+            f" rates={self._count})"
+        )
+
+
+class RateSeriesBuilder(object):
+    def __init__(
+        self,
+        date_range: DateRange,
+        numeric_mode: NumericMode = NumericMode.DECIMAL,
+        decimal_places: int = 6,
+    ):
+        """Incrementally fill the rates of a series covering a date range.
+
+        :param date_range: Date range covered by the series
+        :param numeric_mode: Numeric mode of the series
+        :param decimal_places: Number of decimal places of the rates (scale of INT64 rates)
+        """
+        self._start_date = date_range.start_date
+        self._start_ordinal = date_range.start_date.toordinal()
+        self._numeric_mode = numeric_mode
+        self._decimal_places = decimal_places
+        if numeric_mode is NumericMode.INT64:
+            self._values = array("q", [0]) * len(date_range)
+            self._convert = rate_converter(numeric_mode, decimal_places)
+        else:
+            self._values = array("d", [math.nan]) * len(date_range)
+            self._convert = float
+        self._mask = bytearray(len(date_range))
+
+    def set(self, dt: date, rate: Union[RateType, float]) -> None:
+        """
+        :param dt: Date
+        :param rate: Rate (INT64 rates are scaled when a float or a Decimal is provided)
+        """
+        index = dt.toordinal() - self._start_ordinal
+        if 0 <= index < len(self._values):
+            self._values[index] = self._convert(rate)
+            self._mask[index] = 1
+
+    def set_value(self, ordinal: int, value: Union[float, int]) -> None:
+        """Set the rate of a day without conversion.
+
+        :param ordinal: Proleptic Gregorian ordinal of the day (see date.toordinal)
+        :param value: Value stored in the buffer of the series (double, or scaled integer with the
+            INT64 numeric mode)
+        """
+        index = ordinal - self._start_ordinal
+        if 0 <= index < len(self._values):
+            self._values[index] = value
+            self._mask[index] = 1
+
+    def build(self) -> RateSeries:
+        return RateSeries(
+            self._start_date,
+            self._values,
+            self._mask,
+            self._numeric_mode,
+            self._decimal_places,
+        )
@@ -0,0 +1,213 @@
+from typing import Iterable, Optional
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+import threading
+import sqlite3
+
+from quickforex.domain import CurrencyPair, DateRange
+
+
+# The coverage table holds the date ranges which were fetched for each currency pair (including the
+# days without rate, such as weekends and holidays), overlapping and adjacent ranges are merged.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rates (
+    domestic_currency TEXT NOT NULL,
+    foreign_currency TEXT NOT NULL,
+    as_of TEXT NOT NULL,
+    rate TEXT NOT NULL,
+    PRIMARY KEY (domestic_currency, foreign_currency, as_of)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS coverage (
+    domestic_currency TEXT NOT NULL,
+    foreign_currency TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    PRIMARY KEY (domestic_currency, foreign_currency, start_date)
+) WITHOUT ROWID;
+"""
+
+
+def find_missing_ranges(
+    date_range: DateRange, available_dates: Iterable[date]
+) -> list[DateRange]:
+    """
+    :param date_range: Requested date range
+    :param available_dates: Dates for which data is available
+    :return: Contiguous sub-ranges of the requested date range for which no data is available
+    """
+    available_dates = set(available_dates)
+    missing_ranges: list[DateRange] = []
+    gap_start: Optional[date] = None
+    for dt in date_range:
+        if dt in available_dates:
+            if gap_start is not None:
+                missing_ranges.append(DateRange(gap_start, dt - timedelta(days=1)))
+                gap_start = None
+        elif gap_start is None:
+            gap_start = dt
+    if gap_start is not None:
+        missing_ranges.append(DateRange(gap_start, date_range.end_date))
+    return missing_ranges
+
+
+def merge_ranges(ranges: Iterable[DateRange], max_days: int) -> list[DateRange]:
+    """Merge date ranges lying within max_days days of each other, so that they can be retrieved with
+    fewer (larger) requests. Ranges longer than max_days are kept as is.
+
+    :param ranges: Date ranges
+    :param max_days: Maximum number of days spanned by merged ranges
+    :return: Merged date ranges (sorted)
+    """
+    merged_ranges: list[DateRange] = []
+    for date_range in sorted(ranges, key=lambda r: r.start_date):
+        if merged_ranges:
+            last_range = merged_ranges[-1]
+            merged_range = DateRange(
+                last_range.start_date, max(last_range.end_date, date_range.end_date)
+            )
+            if len(merged_range) <= max_days:
+                merged_ranges[-1] = merged_range
+                continue
+        merged_ranges.append(date_range)
+    return merged_ranges
+
+
+class RateStore(object):
+    def __init__(self, database_path: str):
+        """Historical rates persisted in a SQLite database. Rates are stored as decimal strings, so
+            they are restored exactly.
+
+        :param database_path: Path to the database file (created if it does not exist), or ':memory:'
+        """
+        if database_path != ":memory:":
+            Path(database_path).expanduser().parent.mkdir(parents=True, exist_ok=True)
+            database_path = str(Path(database_path).expanduser())
+        self._connection = sqlite3.connect(database_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.executescript(_SCHEMA)
+
+    def put_rates(
+        self,
+        pair: CurrencyPair,
+        rates: dict[date, Decimal],
+        covered_range: Optional[DateRange] = None,
+    ) -> None:
+        """
+        :param pair: Currency pair
+        :param rates: Rate (unscaled) for each date
+        :param covered_range: Date range which was fetched to retrieve these rates (the dates of
+            this range without rate are not reported as missing afterwards)
+        """
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO rates VALUES (?, ?, ?, ?)",
+                (
+                    (pair.domestic, pair.foreign, dt.isoformat(), str(rate))
+                    for dt, rate in rates.items()
+                ),
+            )
+            if covered_range is not None:
+                self._add_coverage(pair, covered_range)
+
+    def _add_coverage(self, pair: CurrencyPair, date_range: DateRange) -> None:
+        # Ranges overlapping or adjacent to the new range are replaced by their union
+        overlapping_ranges = self._connection.execute(
+            "SELECT MIN(start_date), MAX(end_date) FROM coverage"
+            " WHERE domestic_currency = ? AND foreign_currency = ?"
+            " AND start_date <= ? AND end_date >= ?",
+            (
+                pair.domestic,
+                pair.foreign,
+                (date_range.end_date + timedelta(days=1)).isoformat(),
+                (date_range.start_date - timedelta(days=1)).isoformat(),
+            ),
+        ).fetchone()
+        start_date, end_date = date_range.start_date, date_range.end_date
+        if overlapping_ranges[0] is not None:
+            start_date = min(start_date, date.fromisoformat(overlapping_ranges[0]))
+            end_date = max(end_date, date.fromisoformat(overlapping_ranges[1]))
+        self._connection.execute(
+            "DELETE FROM coverage"
+            " WHERE domestic_currency = ? AND foreign_currency = ?"
+            " AND start_date BETWEEN ? AND ?",
+            (
+                pair.domestic,
+                pair.foreign,
+                start_date.isoformat(),
+                end_date.isoformat(),
+            ),
+        )
+        self._connection.execute(
+            "INSERT INTO coverage VALUES (?, ?, ?, ?)",
+            (
+                pair.domestic,
+                pair.foreign,
+                start_date.isoformat(),
+                end_date.isoformat(),
+            ),
+        )
+
+    def get_covered_ranges(
+        self, pair: CurrencyPair, date_range: DateRange
+    ) -> list[DateRange]:
+        """
+        :return: Fetched date ranges of this pair overlapping the date range (clipped to the date range)
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT start_date, end_date FROM coverage"
+                " WHERE domestic_currency = ? AND foreign_currency = ?"
+                " AND start_date <= ? AND end_date >= ?"
+                " ORDER BY start_date",
+                (
+                    pair.domestic,
+                    pair.foreign,
+                    date_range.end_date.isoformat(),
+                    date_range.start_date.isoformat(),
+                ),
+            ).fetchall()
+        return [
+            DateRange(
+                max(date.fromisoformat(start_date), date_range.start_date),
+                min(date.fromisoformat(end_date), date_range.end_date),
+            )
+            for start_date, end_date in rows
+        ]
+
+    def get_rates(
+        self, pair: CurrencyPair, date_range: DateRange
+    ) -> dict[date, Decimal]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT as_of, rate FROM rates"
+                " WHERE domestic_currency = ? AND foreign_currency = ? AND as_of BETWEEN ? AND ?"
+                " ORDER BY as_of",
+                (
+                    pair.domestic,
+                    pair.foreign,
+                    date_range.start_date.isoformat(),
+                    date_range.end_date.isoformat(),
+                ),
+            ).fetchall()
+        return {date.fromisoformat(as_of): Decimal(rate) for as_of, rate in rows}
+
+    def get_rate(self, pair: CurrencyPair, as_of: date) -> Optional[Decimal]:
+        return self.get_rates(pair, DateRange(as_of, as_of)).get(as_of)
+
+    def find_missing_ranges(
+        self, pair: CurrencyPair, date_range: DateRange
+    ) -> list[DateRange]:
+        """
+        :return: Contiguous sub-ranges of the date range which were never fetched for this pair
+            (dates with a stored rate are considered fetched)
+        """
+        available_dates = set(self.get_rates(pair, date_range).keys())
+        for covered_range in self.get_covered_ranges(pair, date_range):
+            available_dates.update(covered_range)
+        return find_missing_ranges(date_range, available_dates)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
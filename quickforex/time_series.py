@@ -0,0 +1,83 @@
+from typing import AsyncIterator, Iterable, Iterator, Mapping
+from datetime import date
+
+from quickforex.domain import CurrencyPair, DateRange
+from quickforex.providers.base import ProviderBase, AsyncProviderBase
+from quickforex.numeric import RateType
+
+
+DEFAULT_CHUNK_DAYS = 365
+
+
+RatesBlock = dict[CurrencyPair, Mapping[date, RateType]]
+RateRecord = tuple[CurrencyPair, date, RateType]
+
+
+def iter_rates_time_series(
+    provider: ProviderBase,
+    currency_pairs: Iterable[CurrencyPair],
+    date_range: DateRange,
+    chunk_days: int = DEFAULT_CHUNK_DAYS,
+) -> Iterator[RatesBlock]:
+    """Retrieve the rates time series of the currency pairs chunk by chunk.
+
+    Providers implementing iter_rates_time_series (such as ExchangeRateHostProvider, which
+    downloads the next chunks while the current one is consumed) are used as is. The time series of
+    the other providers are retrieved one chunk at a time with get_rates_time_series.
+
+    :param provider: Provider
+    :param currency_pairs: Currency pairs for which to retrieve the exchange rates
+    :param date_range: Date range over which the exchange rates should be retrieved
+    :param chunk_days: Number of days of each chunk
+    :return: Iterator over the time series of each chunk (in chronological order)
+    """
+    currency_pairs = set(currency_pairs)
+    iter_method = getattr(provider, "iter_rates_time_series", None)
+    if iter_method is not None:
+        return iter_method(currency_pairs, date_range, chunk_days)
+    return (
+        provider.get_rates_time_series(currency_pairs, chunk)
+        for chunk in date_range.chunks(chunk_days)
+    )
+
+
+async def aiter_rates_time_series(
+    provider: AsyncProviderBase,
+    currency_pairs: Iterable[CurrencyPair],
+    date_range: DateRange,
+    chunk_days: int = DEFAULT_CHUNK_DAYS,
+) -> AsyncIterator[RatesBlock]:
+    """Asynchronous counterpart of iter_rates_time_series"""
+    currency_pairs = set(currency_pairs)
+    iter_method = getattr(provider, "iter_rates_time_series", None)
+    if iter_method is not None:
+        async for block in iter_method(currency_pairs, date_range, chunk_days):
+            yield block
+        return
+    for chunk in date_range.chunks(chunk_days):
+        yield await provider.get_rates_time_series(currency_pairs, chunk)
+
+
+def _block_records(block: RatesBlock) -> Iterator[RateRecord]:
+    for pair in sorted(block, key=lambda pair: (pair.domestic, pair.foreign)):
+        for dt, rate in block[pair].items():
+            yield pair, dt, rate
+
+
+def iter_rate_records(blocks: Iterable[RatesBlock]) -> Iterator[RateRecord]:
+    """
+    :param blocks: Time series chunks (see iter_rates_time_series)
+    :return: Iterator over the (currency pair, date, rate) records of each chunk (ordered by
+        currency pair, then by date within each chunk)
+    """
+    for block in blocks:
+        yield from _block_records(block)
+
+
+async def aiter_rate_records(
+    blocks: AsyncIterator[RatesBlock],
+) -> AsyncIterator[RateRecord]:
+    """Asynchronous counterpart of iter_rate_records"""
+    async for block in blocks:
+        for record in _block_records(block):
+            yield record
@@ -0,0 +1,131 @@
+from typing import Iterable, Optional
+from datetime import date
+from decimal import Decimal
+
+from quickforex.domain import CurrencyPair, SymbolType
+
+
+TRIANGULATION_GUARD_DIGITS = 4
+
+
+def pivot_symbols(
+    currency_pairs: Iterable[CurrencyPair], pivot: SymbolType
+) -> list[SymbolType]:
+    """
+    :param currency_pairs: Requested currency pairs
+    :param pivot: Pivot currency
+    :return: Currencies which rate against the pivot currency is needed to triangulate the requested
+        currency pairs (same-currency pairs do not need any rate)
+    """
+    symbols: set[SymbolType] = set()
+    for pair in currency_pairs:
+        if pair.domestic != pair.foreign:
+            symbols.update((pair.domestic, pair.foreign))
+    symbols.discard(pivot)
+    return sorted(symbols)
+
+
+def cross_rate(
+    currency_pair: CurrencyPair,
+    pivot: SymbolType,
+    pivot_rates: dict[SymbolType, Decimal],
+    quoted_places: int,
+    decimal_places: int,
+) -> Optional[Decimal]:
+    """
+    :param currency_pair: Currency pair
+    :param pivot: Pivot currency
+    :param pivot_rates: Rates of the pivot currency against other currencies (units of each currency
+        for one unit of pivot currency)
+    :param quoted_places: Number of decimal places of the pivot rates
+    :param decimal_places: Number of decimal places of the cross rate
+    :return: Cross rate rounded to the requested number of decimal places, or None when this rate
+        cannot be derived from the pivot rates to that accuracy (the cross rate is then guaranteed
+        to be at most one unit in the last decimal place away from the cross rate of the exact pivot rates)
+    """
+    quantum = Decimal(1).scaleb(-decimal_places)
+    if currency_pair.domestic == currency_pair.foreign:
+        return Decimal(1).quantize(quantum)
+    quoted_error = Decimal(1).scaleb(-quoted_places) / 2
+    domestic_rate, domestic_error = _pivot_rate(
+        currency_pair.domestic, pivot, pivot_rates, quoted_error
+    )
+    foreign_rate, foreign_error = _pivot_rate(
+        currency_pair.foreign, pivot, pivot_rates, quoted_error
+    )
+    if domestic_rate is None or foreign_rate is None:
+        return None
+    if domestic_rate <= domestic_error or foreign_rate <= foreign_error:
+        return None
+    rate = foreign_rate / domestic_rate
+    max_error = (foreign_rate + foreign_error) / (domestic_rate - domestic_error) - rate
+    if max_error > quantum / 2:
+        return None
+    return rate.quantize(quantum)
+
+
+def _pivot_rate(
+    symbol: SymbolType,
+    pivot: SymbolType,
+    pivot_rates: dict[SymbolType, Decimal],
+    quoted_error: Decimal,
+) -> tuple[Optional[Decimal], Decimal]:
+    if symbol == pivot:
+        return Decimal(1), Decimal(0)
+    return pivot_rates.get(symbol), quoted_error
+
+
+def triangulate(
+    currency_pairs: Iterable[CurrencyPair],
+    pivot: SymbolType,
+    pivot_rates: dict[SymbolType, Decimal],
+    quoted_places: int,
+    decimal_places: int,
+) -> tuple[dict[CurrencyPair, Decimal], set[CurrencyPair]]:
+    """
+    :return: Cross rates of the currency pairs which could be triangulated (see cross_rate) and
+        currency pairs which could not
+    """
+    rates: dict[CurrencyPair, Decimal] = {}
+    unresolved_pairs: set[CurrencyPair] = set()
+    for pair in currency_pairs:
+        rate = cross_rate(pair, pivot, pivot_rates, quoted_places, decimal_places)
+        if rate is None:
+            unresolved_pairs.add(pair)
+        else:
+            rates[pair] = rate
+    return rates, unresolved_pairs
+
+
+def triangulate_time_series(
+    currency_pairs: Iterable[CurrencyPair],
+    pivot: SymbolType,
+    pivot_series: dict[date, dict[SymbolType, Decimal]],
+    quoted_places: int,
+    decimal_places: int,
+) -> tuple[dict[CurrencyPair, dict[date, Decimal]], set[CurrencyPair]]:
+    """
+    :return: Cross rates time series of the currency pairs which could be triangulated for every date
+        (see cross_rate) and currency pairs which could not
+    """
+    currency_pairs = set(currency_pairs)
+    series: dict[CurrencyPair, dict[date, Decimal]] = {
+        pair: {} for pair in currency_pairs
+    }
+    unresolved_pairs: set[CurrencyPair] = set()
+    for dt, pivot_rates in sorted(pivot_series.items()):
+        rates, unresolved_pairs_at_date = triangulate(
+            currency_pairs - unresolved_pairs,
+            pivot,
+            pivot_rates,
+            quoted_places,
+            decimal_places,
+        )
+        unresolved_pairs.update(unresolved_pairs_at_date)
+        for pair, rate in rates.items():
+            series[pair][dt] = rate
+    return {
+        pair: pair_series
+        for pair, pair_series in series.items()
+        if pair not in unresolved_pairs
+    }, unresolved_pairs
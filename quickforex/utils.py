@@ -1,10 +1,16 @@
 from typing import Union, Iterable, Any, Type
 from datetime import date
 import dataclasses
+import functools
 import typing
 import json
 
-from quickforex.domain import DateRange, CurrencyPairType, CurrencyPair
+from quickforex.domain import (
+    PARSED_CURRENCY_PAIRS_CACHE_SIZE,
+    DateRange,
+    CurrencyPairType,
+    CurrencyPair,
+)
 
 
 def currency_pair_of_tuple(ccy_pair: tuple[str, str]) -> CurrencyPair:
@@ -18,28 +24,48 @@ def currency_pair_of_tuple(ccy_pair: tuple[str, str]) -> CurrencyPair:
     return CurrencyPair(*ccy_pair)
 
 
+@functools.lru_cache(maxsize=PARSED_CURRENCY_PAIRS_CACHE_SIZE)
+def _currency_pair_of_str_tuple(ccy_pair: tuple[str, str]) -> CurrencyPair:
+    return CurrencyPair(*ccy_pair)
+
+
 def make_currency_pair(ccy_pair: CurrencyPairType) -> CurrencyPair:
     if isinstance(ccy_pair, CurrencyPair):
         return ccy_pair
     if isinstance(ccy_pair, str):
         return CurrencyPair.parse(ccy_pair)
     if isinstance(ccy_pair, tuple):
+        if len(ccy_pair) == 2 and type(ccy_pair[0]) is str and type(ccy_pair[1]) is str:
+            return _currency_pair_of_str_tuple(ccy_pair)
         return currency_pair_of_tuple(ccy_pair)
     raise ValueError(
         f"could not create currency pair from object '{ccy_pair}': unsupported format"
     )
 
 
+def _is_normalized(currency_pairs: Iterable[Any]) -> bool:
+    return all(type(pair) is CurrencyPair for pair in currency_pairs)
+
+
 def parse_currency_pairs_args(
     *currency_pairs_args: Union[Iterable[CurrencyPairType], CurrencyPairType]
 ) -> set[CurrencyPair]:
+    if (
+        len(currency_pairs_args) == 1
+        and type(currency_pairs_args[0]) in (set, frozenset)
+        and _is_normalized(currency_pairs_args[0])
+    ):
+        # Fast path: a collection of currency pairs was provided
+        return set(currency_pairs_args[0])
     currency_pairs: set[CurrencyPair] = set()
     for item in currency_pairs_args:
         if isinstance(item, (CurrencyPair, str, tuple)):
             currency_pairs.add(make_currency_pair(item))
         elif isinstance(item, Iterable):
-            for sub_item in item:
-                currency_pairs.add(make_currency_pair(sub_item))
+            if type(item) in (set, frozenset, list) and _is_normalized(item):
+                currency_pairs.update(item)
+            else:
+                currency_pairs.update(map(make_currency_pair, item))
         else:
             raise ValueError(
                 f"invalid currency pair argument {item}, expected iterable, found {type(item).__name__}"
@@ -43,4 +43,8 @@ setuptools.setup(
     install_requires=[
         "requests",
     ],
+    extras_require={
+        "async": ["aiohttp"],
+        "numpy": ["numpy"],
+    },
 )
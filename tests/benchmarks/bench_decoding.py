@@ -0,0 +1,104 @@
+"""Compare the decoding of a large exchangerate.host time series payload with the previous
+decoding (float parsing, strptime dates and Decimal conversion), for each numeric mode.
+
+Usage: python -m tests.benchmarks.bench_decoding [--years N] [--symbols N]
+"""
+from argparse import ArgumentParser
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+import json
+import time
+
+from quickforex.domain import DateRange
+from quickforex.providers.exchangerate_host import (
+    Settings,
+    Requester,
+    _TimeSeriesMerger,
+)
+from quickforex.rate_series import RateSeriesBuilder
+from tests.stub_server import stub_rate
+
+
+def _make_payload(date_range: DateRange, symbols: list[str]) -> bytes:
+    return json.dumps(
+        {
+            "success": True,
+            "timeseries": True,
+            "base": "EUR",
+            "start_date": date_range.start_date.isoformat(),
+            "end_date": date_range.end_date.isoformat(),
+            "rates": {
+                dt.isoformat(): {
+                    symbol: stub_rate("EUR", symbol, dt) for symbol in symbols
+                }
+                for dt in date_range
+            },
+        }
+    ).encode()
+
+
+def _decode_previous(content: bytes, date_range: DateRange) -> dict:
+    series: dict[str, RateSeriesBuilder] = {}
+    for date_str, rates_by_symbol in json.loads(content)["rates"].items():
+        current_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+        for symbol, rate in rates_by_symbol.items():
+            if symbol not in series:
+                series[symbol] = RateSeriesBuilder(date_range)
+            series[symbol].set(current_date, Decimal(rate))
+    return {symbol: builder.build() for symbol, builder in series.items()}
+
+
+def _decode(
+    content: bytes, date_range: DateRange, symbols: list[str], settings: Settings
+) -> dict:
+    builders = {
+        symbol: settings.create_series_builder(date_range) for symbol in symbols
+    }
+    merger = _TimeSeriesMerger(builders, settings.create_buffer_value_parser())
+    merger.merge_response(Requester.json_decoder.decode(content.decode("utf-8")))
+    return {symbol: builder.build() for symbol, builder in builders.items()}
+
+
+def _best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--symbols", type=int, default=150)
+    parser.add_argument("--repeat", type=int, default=3)
+    settings = parser.parse_args()
+    end_date = date(2021, 12, 31)
+    date_range = DateRange(end_date - timedelta(days=365 * settings.years), end_date)
+    symbols = [
+        chr(ord("A") + i // 26 % 26) + chr(ord("A") + i % 26) + "X"
+        for i in range(settings.symbols)
+    ]
+    content = _make_payload(date_range, symbols)
+    print(
+        f"payload: {len(date_range)} days x {len(symbols)} symbols"
+        f" ({len(content) / 1e6:.1f} MB)"
+    )
+    previous = _best_of(settings.repeat, lambda: _decode_previous(content, date_range))
+    print(f"{'previous':>16}: {previous * 1e3:8.1f} ms")
+    for numeric_mode in ["decimal", "float", "int64"]:
+        elapsed = _best_of(
+            settings.repeat,
+            lambda: _decode(
+                content, date_range, symbols, Settings(numeric_mode=numeric_mode)
+            ),
+        )
+        print(
+            f"{numeric_mode:>16}: {elapsed * 1e3:8.1f} ms"
+            f" (speedup: {previous / elapsed:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
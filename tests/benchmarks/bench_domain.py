@@ -0,0 +1,107 @@
+"""Compare the memory footprint and construction time of the slotted, interned CurrencyPair and
+slotted DateRange with the equivalent frozen dataclasses.
+
+Usage: python -m tests.benchmarks.bench_domain [--count N]
+"""
+from typing import Any, Callable
+from argparse import ArgumentParser
+from dataclasses import dataclass
+from datetime import date, timedelta
+import gc
+import time
+import tracemalloc
+
+from quickforex.domain import CurrencyPair, DateRange
+
+
+@dataclass(frozen=True)
+class DataclassCurrencyPair:
+    domestic: str
+    foreign: str
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.domestic, str) or not isinstance(self.foreign, str):
+            raise TypeError("invalid currency pair")
+
+
+@dataclass(frozen=True)
+class DataclassDateRange:
+    start_date: date
+    end_date: date
+
+    def __post_init__(self) -> None:
+        if self.start_date > self.end_date:
+            raise ValueError("invalid date range")
+
+
+def _measure(create: Callable[[], list[Any]]) -> tuple[float, float]:
+    """
+    :return: Time (in seconds, best of 3 runs) and memory (in bytes) allocated to create the
+        objects
+    """
+    elapsed = float("inf")
+    gc.disable()
+    try:
+        for _ in range(3):
+            gc.collect()
+            start = time.perf_counter()
+            objects = create()
+            elapsed = min(elapsed, time.perf_counter() - start)
+            del objects
+    finally:
+        gc.enable()
+    gc.collect()
+    tracemalloc.start()
+    objects = create()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return elapsed, allocated
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=200_000)
+    settings = parser.parse_args()
+    count = settings.count
+    symbols = [
+        chr(ord("A") + i // 26 % 26) + chr(ord("A") + i % 26) + "X" for i in range(200)
+    ]
+    # Currency pairs, as built for every data point of a time series: few distinct pairs
+    symbol_args = [("EUR", symbols[i % len(symbols)]) for i in range(count)]
+    start_date = date(2000, 1, 1)
+    range_args = [
+        (
+            start_date + timedelta(days=i % 5000),
+            start_date + timedelta(days=i % 5000 + 30),
+        )
+        for i in range(count)
+    ]
+    CurrencyPair("EUR", "USD")
+    cases = [
+        (
+            "dataclass CurrencyPair",
+            lambda: [DataclassCurrencyPair(*args) for args in symbol_args],
+        ),
+        ("CurrencyPair", lambda: [CurrencyPair(*args) for args in symbol_args]),
+        (
+            "CurrencyPair.interned",
+            lambda: [CurrencyPair.interned(*args) for args in symbol_args],
+        ),
+        (
+            "dataclass DateRange",
+            lambda: [DataclassDateRange(*args) for args in range_args],
+        ),
+        ("DateRange", lambda: [DateRange(*args) for args in range_args]),
+    ]
+    print(f"{count} objects")
+    for name, create in cases:
+        elapsed, allocated = _measure(create)
+        print(
+            f"{name:>24}: {elapsed / count * 1e9:6.0f} ns/object,"
+            f" {allocated / count:6.1f} bytes/object"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Compare one-connection-per-request HTTP calls with pooled keep-alive sessions.
+
+Usage: python -m tests.benchmarks.bench_http_session [--requests N]
+"""
+from argparse import ArgumentParser
+import time
+
+import requests
+
+from quickforex.http_requester import HttpRequesterBase, get_shared_session
+from tests.stub_server import StubExchangeRateHostServer
+
+
+PARAMS = {"base": "EUR", "symbols": "USD,GBP,JPY"}
+
+
+def _bench_unpooled(url: str, request_count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(request_count):
+        requests.get(f"{url}/latest", params=PARAMS).json()
+    return time.perf_counter() - start
+
+
+def _bench_pooled(url: str, request_count: int) -> float:
+    requester = HttpRequesterBase(url, session=get_shared_session())
+    start = time.perf_counter()
+    for _ in range(request_count):
+        requester.get("latest", params=PARAMS)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    settings = parser.parse_args()
+    with StubExchangeRateHostServer() as server:
+        unpooled = _bench_unpooled(server.url, settings.requests)
+        unpooled_connections = server.connection_count
+        pooled = _bench_pooled(server.url, settings.requests)
+        pooled_connections = server.connection_count - unpooled_connections
+    for name, elapsed, connections in [
+        ("requests.get", unpooled, unpooled_connections),
+        ("pooled session", pooled, pooled_connections),
+    ]:
+        print(
+            f"{name:>16}: {elapsed / settings.requests * 1e6:8.1f} us/request"
+            f" ({connections} connections)"
+        )
+    print(f"{'speedup':>16}: {unpooled / pooled:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
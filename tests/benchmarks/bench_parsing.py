@@ -0,0 +1,92 @@
+"""Measure the normalization of the currency pairs arguments of the API (parse_currency_pairs_args),
+and check it against regression thresholds.
+
+The thresholds (in nanoseconds per currency pair) are generous upper bounds for a recent machine,
+they can be scaled with --scale on slower machines. The exit status is 1 when a threshold is
+exceeded.
+
+Usage: python -m tests.benchmarks.bench_parsing [--pairs N] [--repeat N] [--scale F]
+"""
+from typing import Any, Callable
+from argparse import ArgumentParser
+import sys
+import timeit
+
+from quickforex.domain import CurrencyPair, _parse_currency_pair
+from quickforex.utils import parse_currency_pairs_args
+
+
+# Maximum time (in nanoseconds) per currency pair
+THRESHOLDS_NS = {
+    "normalized set": 300,
+    "normalized list": 1000,
+    "'EUR/USD' strings": 2500,
+    "'EURUSD' strings": 2500,
+    "tuples": 3000,
+    "10 string arguments": 4000,
+}
+
+
+def _symbols(count: int) -> list[str]:
+    return [
+        chr(ord("A") + i // 26 % 26) + chr(ord("A") + i % 26) + chr(ord("A") + i // 676)
+        for i in range(count)
+    ]
+
+
+def _cases(pairs_count: int) -> list[tuple[str, Callable[[], Any], int]]:
+    symbols = _symbols(pairs_count)
+    pairs = {CurrencyPair("EUR", symbol) for symbol in symbols}
+    strs = [f"EUR/{symbol}" for symbol in symbols]
+    compact_strs = [f"EUR{symbol}" for symbol in symbols]
+    tuples = [("EUR", symbol) for symbol in symbols]
+    return [
+        ("normalized set", lambda: parse_currency_pairs_args(pairs), pairs_count),
+        (
+            "normalized list",
+            lambda: parse_currency_pairs_args(list(pairs)),
+            pairs_count,
+        ),
+        ("'EUR/USD' strings", lambda: parse_currency_pairs_args(strs), pairs_count),
+        (
+            "'EURUSD' strings",
+            lambda: parse_currency_pairs_args(compact_strs),
+            pairs_count,
+        ),
+        ("tuples", lambda: parse_currency_pairs_args(tuples), pairs_count),
+        ("10 string arguments", lambda: parse_currency_pairs_args(*strs[:10]), 10),
+        (
+            "uncached 'EUR/USD' parsing",
+            lambda: {_parse_currency_pair.__wrapped__(pair_str) for pair_str in strs},
+            pairs_count,
+        ),
+    ]
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--pairs", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--scale", type=float, default=1.0)
+    settings = parser.parse_args()
+    failures = []
+    for name, case, pairs_count in _cases(settings.pairs):
+        case()
+        elapsed = min(timeit.repeat(case, number=settings.repeat, repeat=5))
+        per_pair_ns = elapsed / settings.repeat / pairs_count * 1e9
+        threshold = THRESHOLDS_NS.get(name)
+        status = ""
+        if threshold is not None:
+            threshold *= settings.scale
+            status = "ok" if per_pair_ns <= threshold else "REGRESSION"
+            if per_pair_ns > threshold:
+                failures.append(name)
+            status = f"(threshold {threshold:.0f} ns) {status}"
+        print(f"{name:>28}: {per_pair_ns:8.0f} ns/pair {status}")
+    if failures:
+        print(f"thresholds exceeded: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Compare the peak memory (and time) of buffered and streamed time series requests.
+
+Usage: python -m tests.benchmarks.bench_streaming [--days N] [--symbols N]
+"""
+from argparse import ArgumentParser
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import tracemalloc
+import time
+
+from quickforex.domain import CurrencyPair, DateRange
+from quickforex.providers.exchangerate_host import (
+    ExchangeRateHostProvider,
+    Requester,
+    Settings,
+)
+from tests.benchmarks.bench_decoding import _make_payload
+
+
+def _serve(body: bytes) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _measure(url: str, pairs: set[CurrencyPair], date_range: DateRange, stream: bool):
+    settings = Settings(
+        stream_time_series=stream,
+        numeric_mode="float",
+        max_concurrent_time_series_requests=1,
+    )
+    with ExchangeRateHostProvider(
+        requester=Requester(url), settings=settings
+    ) as provider:
+        tracemalloc.start()
+        start = time.perf_counter()
+        series = provider.get_rates_time_series(pairs, date_range)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    assert len(series) == len(pairs)
+    return elapsed, peak
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--symbols", type=int, default=150)
+    settings = parser.parse_args()
+    end_date = date(2021, 12, 31)
+    date_range = DateRange(end_date - timedelta(days=settings.days - 1), end_date)
+    symbols = [
+        chr(ord("A") + i // 26 % 26) + chr(ord("A") + i % 26) + "X"
+        for i in range(settings.symbols)
+    ]
+    body = _make_payload(date_range, symbols)
+    pairs = {CurrencyPair("EUR", symbol) for symbol in symbols}
+    server = _serve(body)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        print(
+            f"payload: {len(date_range)} days x {len(symbols)} symbols"
+            f" ({len(body) / 1e6:.1f} MB)"
+        )
+        for name, stream in [("buffered", False), ("streamed", True)]:
+            elapsed, peak = _measure(url, pairs, date_range, stream)
+            print(f"{name:>16}: {elapsed * 1e3:8.1f} ms, peak {peak / 1e6:6.1f} MB")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Measure the throughput and latency (p50/p99) of the Api, the module-level functions and the
+command line tool against a local stub of the exchangerate.host API.
+
+The stub server latency, payload size and failure rate can be configured, and the results can be
+saved (--output) and compared with previously saved results (--compare). With --max-regression,
+the exit status is 1 when the p50 latency of a benchmark increased by more than the provided
+fraction relative to the compared results.
+
+Usage: python -m tests.benchmarks.bench_suite [--operations N] [--concurrency N] [--latency S]
+    [--payload-padding BYTES] [--failure-rate F] [--symbols N] [--days N] [--only PREFIX]
+    [--output FILE] [--compare FILE [--max-regression F]]
+"""
+from typing import Any, Callable
+from argparse import ArgumentParser
+from datetime import date, timedelta
+import os
+import subprocess
+import sys
+
+import quickforex
+from quickforex.api import Api
+from quickforex.command_line import command_line_entrypoint
+from quickforex.domain import CurrencyPair, DateRange
+from quickforex.providers.exchangerate_host import (
+    API_URL_ENV_VAR,
+    ExchangeRateHostProvider,
+    Requester,
+)
+from tests.benchmarks.harness import (
+    BenchmarkResult,
+    find_regressions,
+    format_results,
+    load_results,
+    run_benchmark,
+    save_results,
+)
+from tests.stub_server import StubExchangeRateHostServer
+
+
+TODAY = date(2022, 1, 1)
+SYMBOLS = ["USD", "GBP", "JPY", "CHF", "CAD", "AUD", "NZD", "SEK", "NOK", "DKK"]
+
+
+def _symbols(count: int) -> list[str]:
+    extra = [
+        chr(ord("A") + i // 26 % 26) + chr(ord("A") + i % 26) + "X"
+        for i in range(max(count - len(SYMBOLS), 0))
+    ]
+    return (SYMBOLS + extra)[:count]
+
+
+def _as_of(index: int) -> date:
+    # Distinct dates, so that historical lookups are not coalesced with each other
+    return TODAY - timedelta(days=1 + index % 3000)
+
+
+def _scenarios(
+    server: StubExchangeRateHostServer, settings: Any
+) -> list[tuple[str, Callable[[int], Any], int]]:
+    symbols = _symbols(settings.symbols)
+    pairs = [CurrencyPair("EUR", symbol) for symbol in symbols]
+    pair_strs = [f"EUR/{symbol}" for symbol in symbols]
+    api = Api(provider=ExchangeRateHostProvider(requester=Requester(server.url)))
+    quickforex.install_provider_with_id("exchangerate.host")
+    series_operations = max(settings.operations // 10, 1)
+    cli_operations = max(settings.operations // 50, 1)
+    env = {**os.environ, API_URL_ENV_VAR: server.url}
+
+    def date_range(index: int) -> DateRange:
+        end_date = _as_of(index)
+        return DateRange(end_date - timedelta(days=settings.days - 1), end_date)
+
+    def run_cli(args: list[str]) -> None:
+        subprocess.run(
+            [sys.executable, "-m", "quickforex.command_line", *args],
+            env=env,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+
+    return [
+        ("api.get_latest_rate", lambda i: api.get_latest_rate(pairs[0]), None),
+        ("api.get_latest_rates", lambda i: api.get_latest_rates(*pairs), None),
+        (
+            "api.get_historical_rates",
+            lambda i: api.get_historical_rates(*pairs, as_of=_as_of(i)),
+            None,
+        ),
+        (
+            "api.get_rates_time_series",
+            lambda i: api.get_rates_time_series(*pairs, date_range=date_range(i)),
+            series_operations,
+        ),
+        (
+            "module.get_latest_rates",
+            lambda i: quickforex.get_latest_rates(*pair_strs),
+            None,
+        ),
+        (
+            "module.get_rates_time_series",
+            lambda i: quickforex.get_rates_time_series(
+                *pair_strs, date_range=date_range(i)
+            ),
+            series_operations,
+        ),
+        (
+            "module.get_historical_rates",
+            lambda i: quickforex.get_historical_rates(*pair_strs, as_of=_as_of(i)),
+            None,
+        ),
+        (
+            "cli.latest",
+            lambda i: command_line_entrypoint(["latest", *pair_strs]),
+            None,
+        ),
+        (
+            "cli.series",
+            lambda i: command_line_entrypoint(
+                [
+                    "series",
+                    *pair_strs,
+                    "--from",
+                    date_range(i).start_date.isoformat(),
+                    "--to",
+                    date_range(i).end_date.isoformat(),
+                ]
+            ),
+            series_operations,
+        ),
+        (
+            "cli.subprocess.latest",
+            lambda i: run_cli(["latest", *pair_strs]),
+            cli_operations,
+        ),
+    ]
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--operations", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--payload-padding", type=int, default=0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--symbols", type=int, default=10)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--only", type=str, default=None)
+    parser.add_argument("--output", type=str, default=None)
+    parser.add_argument("--compare", type=str, default=None)
+    parser.add_argument("--max-regression", type=float, default=None)
+    settings = parser.parse_args()
+    # Providers created with default settings (module-level functions, command line) are sent to
+    # the stub server
+    with StubExchangeRateHostServer(
+        today=TODAY,
+        latency=settings.latency,
+        payload_padding=settings.payload_padding,
+        failure_rate=settings.failure_rate,
+    ) as server:
+        os.environ[API_URL_ENV_VAR] = server.url
+        results: list[BenchmarkResult] = []
+        for name, operation, operations in _scenarios(server, settings):
+            if settings.only and not name.startswith(settings.only):
+                continue
+            results.append(
+                run_benchmark(
+                    name,
+                    operation,
+                    operations or settings.operations,
+                    concurrency=settings.concurrency,
+                )
+            )
+            print(format_results(results[-1:]).splitlines()[-1], file=sys.stderr)
+        print(
+            f"stub server: {server.request_count} requests, {server.failure_count} failed"
+        )
+    baseline = load_results(settings.compare) if settings.compare else None
+    print(format_results(results, baseline))
+    if settings.output:
+        save_results(settings.output, results, vars(settings))
+    if baseline and settings.max_regression is not None:
+        regressions = find_regressions(results, baseline, settings.max_regression)
+        if regressions:
+            print(f"p50 latency regressions: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
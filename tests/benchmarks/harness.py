@@ -0,0 +1,177 @@
+"""Measurement helpers shared by the benchmarks: run an operation many times (optionally from
+several threads), and report its throughput and latency percentiles.
+"""
+from typing import Any, Callable, Optional
+from concurrent import futures
+from dataclasses import dataclass, field
+import json
+import math
+import platform
+import sys
+import time
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """
+    :param samples: Samples
+    :param fraction: Percentile, between 0 and 1
+    :return: Percentile of the samples (nearest rank), NaN when there are no samples
+    """
+    if not samples:
+        return math.nan
+    ordered = sorted(samples)
+    rank = max(math.ceil(fraction * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    operations: int
+    errors: int
+    elapsed: float
+    latencies: list[float] = field(repr=False)
+
+    @property
+    def throughput(self) -> float:
+        return self.operations / self.elapsed if self.elapsed > 0 else math.nan
+
+    @property
+    def p50(self) -> float:
+        return percentile(self.latencies, 0.5)
+
+    @property
+    def p99(self) -> float:
+        return percentile(self.latencies, 0.99)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "operations": self.operations,
+            "errors": self.errors,
+            "elapsed": self.elapsed,
+            "throughput": self.throughput,
+            "p50": self.p50,
+            "p99": self.p99,
+        }
+
+
+def run_benchmark(
+    name: str,
+    operation: Callable[[int], Any],
+    operations: int,
+    concurrency: int = 1,
+    warmup: int = 1,
+) -> BenchmarkResult:
+    """
+    :param name: Name of the benchmark
+    :param operation: Operation to measure, called with the (0-based) index of the operation
+    :param operations: Number of measured operations
+    :param concurrency: Number of threads running the operations
+    :param warmup: Number of operations run (and not measured) before the measured ones
+    :return: Throughput and latency of the successful operations (failed operations are counted
+        as errors)
+    """
+    for index in range(warmup):
+        try:
+            operation(-index - 1)
+        except Exception:
+            pass
+
+    def timed(index: int) -> Optional[float]:
+        start = time.perf_counter()
+        try:
+            operation(index)
+        except Exception:
+            return None
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    if concurrency <= 1:
+        outcomes = [timed(index) for index in range(operations)]
+    else:
+        with futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+            outcomes = list(executor.map(timed, range(operations)))
+    elapsed = time.perf_counter() - start
+    latencies = [latency for latency in outcomes if latency is not None]
+    return BenchmarkResult(
+        name=name,
+        operations=operations,
+        errors=operations - len(latencies),
+        elapsed=elapsed,
+        latencies=latencies,
+    )
+
+
+def format_results(
+    results: list[BenchmarkResult], baseline: Optional[dict[str, Any]] = None
+) -> str:
+    """
+    :param results: Benchmark results
+    :param baseline: Results previously saved with save_results, the change of the p50 latency
+        relative to these results is reported when provided
+    :return: Table of the results
+    """
+    baseline_p50 = {
+        entry["name"]: entry["p50"] for entry in (baseline or {}).get("results", [])
+    }
+    lines = [
+        f"{'benchmark':<32} {'ops':>6} {'errors':>6} {'ops/s':>9}"
+        f" {'p50 (ms)':>9} {'p99 (ms)':>9}"
+        + (f" {'p50 vs base':>12}" if baseline else "")
+    ]
+    for result in results:
+        line = (
+            f"{result.name:<32} {result.operations:>6} {result.errors:>6}"
+            f" {result.throughput:>9.1f} {result.p50 * 1e3:>9.2f} {result.p99 * 1e3:>9.2f}"
+        )
+        if baseline:
+            reference = baseline_p50.get(result.name)
+            line += (
+                f" {(result.p50 / reference - 1) * 100:>+11.1f}%"
+                if reference
+                else f" {'n/a':>12}"
+            )
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def find_regressions(
+    results: list[BenchmarkResult], baseline: dict[str, Any], max_regression: float
+) -> list[str]:
+    """
+    :param results: Benchmark results
+    :param baseline: Results previously saved with save_results
+    :param max_regression: Maximum increase of the p50 latency relative to the baseline (0.1 for
+        10%)
+    :return: Names of the benchmarks which p50 latency increased by more than max_regression
+    """
+    baseline_p50 = {entry["name"]: entry["p50"] for entry in baseline["results"]}
+    return [
+        result.name
+        for result in results
+        if baseline_p50.get(result.name)
+        and result.p50 > baseline_p50[result.name] * (1 + max_regression)
+    ]
+
+
+def save_results(
+    path: str, results: list[BenchmarkResult], parameters: dict[str, Any]
+) -> None:
+    with open(path, "w") as output:
+        json.dump(
+            {
+                "timestamp": time.time(),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "parameters": parameters,
+                "results": [result.to_dict() for result in results],
+            },
+            output,
+            indent=2,
+        )
+
+
+def load_results(path: str) -> dict[str, Any]:
+    with open(path) as results_file:
+        return json.load(results_file)
@@ -0,0 +1,50 @@
+from typing import Iterable, Any
+from datetime import date
+from decimal import Decimal
+
+from quickforex.domain import CurrencyPair, DateRange
+from quickforex.providers.dummy import DummyProvider
+
+
+class CountingProvider(DummyProvider):
+    """Dummy provider recording the calls it receives as (kind, currency pairs, date or date range)"""
+
+    def __init__(self, return_rate: float = 1.0):
+        super().__init__()
+        self._settings.return_rate = return_rate
+        self.calls: list[tuple[str, frozenset[CurrencyPair], Any]] = []
+
+    def get_latest_rates(
+        self, currency_pairs: Iterable[CurrencyPair]
+    ) -> dict[CurrencyPair, Decimal]:
+        currency_pairs = set(currency_pairs)
+        self.calls.append(("latest", frozenset(currency_pairs), None))
+        return super().get_latest_rates(currency_pairs)
+
+    def get_historical_rates(
+        self, currency_pairs: Iterable[CurrencyPair], as_of: date
+    ) -> dict[CurrencyPair, Decimal]:
+        currency_pairs = set(currency_pairs)
+        self.calls.append(("historical", frozenset(currency_pairs), as_of))
+        return super().get_latest_rates(currency_pairs)
+
+    def get_rates_time_series(
+        self, currency_pairs: Iterable[CurrencyPair], date_range: DateRange
+    ) -> dict[CurrencyPair, dict[date, Decimal]]:
+        currency_pairs = set(currency_pairs)
+        self.calls.append(("series", frozenset(currency_pairs), date_range))
+        return super().get_rates_time_series(currency_pairs, date_range)
+
+
+class WeekdaysProvider(CountingProvider):
+    """Counting provider without rates on weekends, which rate is the day of the month"""
+
+    def get_rates_time_series(
+        self, currency_pairs: Iterable[CurrencyPair], date_range: DateRange
+    ) -> dict[CurrencyPair, dict[date, Decimal]]:
+        currency_pairs = set(currency_pairs)
+        super().get_rates_time_series(currency_pairs, date_range)
+        return {
+            pair: {dt: Decimal(dt.day) for dt in date_range if dt.weekday() < 5}
+            for pair in currency_pairs
+        }
@@ -0,0 +1,150 @@
+from datetime import date
+import asyncio
+
+import pytest
+
+from quickforex.api import Api
+from quickforex.async_api import AsyncApi
+from quickforex.domain import CurrencyPair, DateRange
+from quickforex.providers.exchangerate_host import (
+    AsyncExchangeRateHostProvider,
+    AsyncRequester,
+    Settings,
+)
+from tests.stub_server import StubExchangeRateHostServer, stub_rate
+
+
+@pytest.fixture
+def stub_server() -> StubExchangeRateHostServer:
+    with StubExchangeRateHostServer() as server:
+        yield server
+
+
+def test_async_api_with_dummy_provider():
+    async def run():
+        async with AsyncApi(provider_id="dummy", return_rate=2.0) as api:
+            return (
+                await api.get_latest_rate("EUR/USD"),
+                await api.get_historical_rates(
+                    "EURUSD", "GBPJPY", as_of=date(2021, 1, 1)
+                ),
+                await api.get_rates_time_series(
+                    "EUR/USD", start_date=date(2021, 1, 1), end_date=date(2021, 1, 3)
+                ),
+            )
+
+    latest, historical, series = asyncio.run(run())
+    assert latest == 2.0
+    assert historical == {
+        CurrencyPair("EUR", "USD"): 2.0,
+        CurrencyPair("GBP", "JPY"): 2.0,
+    }
+    assert len(series[CurrencyPair("EUR", "USD")]) == 3
+
+
+def test_async_api_with_exchangerate_host_provider(
+    stub_server: StubExchangeRateHostServer,
+):
+    pytest.importorskip("aiohttp")
+    as_of = date(2021, 1, 1)
+    pairs = [CurrencyPair("EUR", "USD"), CurrencyPair("GBP", "JPY")]
+
+    async def run():
+        provider = AsyncExchangeRateHostProvider(
+            requester=AsyncRequester(stub_server.url)
+        )
+        async with provider:
+            api = AsyncApi(provider=provider)
+            results = await asyncio.gather(
+                *(api.get_historical_rates(pairs, as_of=as_of) for _ in range(20))
+            )
+            series = await api.get_rates_time_series(
+                pairs, date_range=DateRange(date(2020, 1, 1), date(2021, 6, 30))
+            )
+        return results, series
+
+    results, series = asyncio.run(run())
+    for rates in results:
+        assert {pair: float(rate) for pair, rate in rates.items()} == {
+            pair: stub_rate(pair.domestic, pair.foreign, as_of) for pair in pairs
+        }
+    for pair in pairs:
+        assert len(series[pair]) == len(DateRange(date(2020, 1, 1), date(2021, 6, 30)))
+    assert stub_server.request_count == 20 * 2 + 2 * 2
+
+
+def test_async_triangulation(stub_server: StubExchangeRateHostServer):
+    pytest.importorskip("aiohttp")
+    as_of = date(2021, 1, 1)
+    pairs = [CurrencyPair("EUR", "USD"), CurrencyPair("GBP", "JPY")]
+
+    async def run():
+        provider = AsyncExchangeRateHostProvider(
+            requester=AsyncRequester(stub_server.url),
+            settings=Settings(triangulation_pivot="USD"),
+        )
+        async with provider:
+            api = AsyncApi(provider=provider)
+            rates = await api.get_historical_rates(pairs, as_of=as_of)
+            series = await api.get_rates_time_series(
+                pairs, date_range=DateRange(date(2020, 1, 1), date(2020, 1, 31))
+            )
+        return rates, series
+
+    rates, series = asyncio.run(run())
+    for pair in pairs:
+        exact_rate = stub_rate(pair.domestic, pair.foreign, as_of, places=12)
+        assert abs(float(rates[pair]) - exact_rate) <= 1e-6
+        assert len(series[pair]) == 31
+    assert stub_server.request_count == 2
+
+
+def test_async_streamed_time_series(stub_server: StubExchangeRateHostServer):
+    pytest.importorskip("aiohttp")
+    pairs = [CurrencyPair("EUR", "USD"), CurrencyPair("GBP", "JPY")]
+    date_range = DateRange(date(2020, 1, 1), date(2021, 6, 30))
+
+    async def run():
+        provider = AsyncExchangeRateHostProvider(
+            requester=AsyncRequester(stub_server.url),
+            settings=Settings(stream_time_series=True),
+        )
+        async with provider:
+            return await AsyncApi(provider=provider).get_rates_time_series(
+                pairs, date_range=date_range
+            )
+
+    series = asyncio.run(run())
+    for pair in pairs:
+        assert len(series[pair]) == len(date_range)
+        for dt in [date_range.start_date, date_range.end_date]:
+            assert float(series[pair][dt]) == stub_rate(pair.domestic, pair.foreign, dt)
+
+
+def test_async_api_mirrors_api():
+    def public_methods(cls) -> set[str]:
+        return {name for name in dir(cls) if not name.startswith("_")}
+
+    assert public_methods(Api) <= public_methods(AsyncApi)
+
+
+def test_async_get_rates_at_and_convert_many():
+    numpy = pytest.importorskip("numpy")
+    points = [("EUR/USD", date(2021, 1, 4)), (("USD", "JPY"), date(2020, 6, 1))]
+
+    async def run():
+        async with AsyncApi(provider_id="dummy", return_rate=2.0) as api:
+            return (
+                await api.get_rates_at(points),
+                await api.convert_many(
+                    [1.0, 2.0],
+                    ["USD", "EUR"],
+                    [date(2021, 1, 4), date(2021, 1, 5)],
+                    target="EUR",
+                ),
+            )
+
+    rates, converted = asyncio.run(run())
+    assert rates == {point: 2.0 for point in points}
+    assert isinstance(converted, numpy.ndarray)
+    assert converted.tolist() == [2.0, 2.0]
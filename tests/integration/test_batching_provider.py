@@ -0,0 +1,182 @@
+from datetime import date
+import threading
+import time
+
+import pytest
+
+import quickforex
+from quickforex.api import Api
+from quickforex.deadline import DeadlineExceededError, current_deadline, deadline_scope
+from quickforex.domain import CurrencyPair
+from quickforex.providers.batching import BatchingProvider, Settings
+from tests.counting_provider import CountingProvider
+
+
+AS_OF = date(2021, 1, 1)
+SYMBOLS = ["USD", "GBP", "JPY", "CHF", "CAD", "AUD", "NZD", "SEK", "NOK", "DKK"]
+
+
+def run_concurrently(fns: list) -> list:
+    barrier = threading.Barrier(len(fns))
+    outcomes = [None] * len(fns)
+
+    def run(index: int) -> None:
+        barrier.wait()
+        try:
+            outcomes[index] = fns[index]()
+        except Exception as e:
+            outcomes[index] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(fns))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+
+@pytest.fixture
+def wrapped() -> CountingProvider:
+    return CountingProvider(return_rate=1.5)
+
+
+def test_single_pair_lookups_are_batched(wrapped: CountingProvider):
+    api = Api(provider=BatchingProvider(wrapped, Settings(window=0.1)))
+    pairs = [CurrencyPair("EUR", symbol) for symbol in SYMBOLS]
+    outcomes = run_concurrently(
+        [lambda pair=pair: api.get_latest_rate(pair) for pair in pairs]
+        + [
+            lambda pair=pair: api.get_historical_rate(pair, as_of=AS_OF)
+            for pair in pairs
+        ]
+        + [lambda: api.get_historical_rate("EUR/USD", as_of=date(2021, 1, 2))]
+    )
+    assert outcomes == [1.5] * (2 * len(pairs) + 1)
+    assert sorted(wrapped.calls, key=lambda call: str(call[2])) == [
+        ("historical", frozenset(pairs), AS_OF),
+        ("historical", frozenset({CurrencyPair("EUR", "USD")}), date(2021, 1, 2)),
+        ("latest", frozenset(pairs), None),
+    ]
+
+
+def test_full_batch_is_sent_before_window_ends(wrapped: CountingProvider):
+    provider = BatchingProvider(wrapped, Settings(window=10.0, max_batch_size=5))
+    pairs = [CurrencyPair("EUR", symbol) for symbol in SYMBOLS]
+    start = time.perf_counter()
+    outcomes = run_concurrently(
+        [lambda pair=pair: provider.get_latest_rate(pair) for pair in pairs]
+    )
+    assert time.perf_counter() - start < 5.0
+    assert outcomes == [1.5] * len(pairs)
+    assert sorted(len(call[1]) for call in wrapped.calls) == [5, 5]
+
+
+def test_failed_batch_is_retried_per_currency_pair():
+    class PartiallyFailingProvider(CountingProvider):
+        def get_latest_rates(self, currency_pairs):
+            rates = super().get_latest_rates(currency_pairs)
+            if CurrencyPair("EUR", "XXX") in rates:
+                raise quickforex.QuickForexError("unknown currency XXX")
+            return rates
+
+    wrapped = PartiallyFailingProvider()
+    provider = BatchingProvider(wrapped, Settings(window=0.1))
+    outcomes = run_concurrently(
+        [
+            lambda: provider.get_latest_rate(CurrencyPair("EUR", "USD")),
+            lambda: provider.get_latest_rate(CurrencyPair("EUR", "XXX")),
+            lambda: provider.get_latest_rate(CurrencyPair("EUR", "GBP")),
+        ]
+    )
+    assert outcomes[0] == outcomes[2] == 1.0
+    assert isinstance(outcomes[1], quickforex.QuickForexError)
+    # The batch is retried in halves: {EURGBP} and {EURUSD, EURXXX}, then {EURUSD} and {EURXXX}
+    assert [len(call[1]) for call in wrapped.calls] == [3, 1, 2, 1, 1]
+
+
+class FailingProvider(CountingProvider):
+    def __init__(self, failed_calls: int):
+        super().__init__()
+        self._failed_calls = failed_calls
+
+    def get_latest_rates(self, currency_pairs):
+        rates = super().get_latest_rates(currency_pairs)
+        if len(self.calls) <= self._failed_calls:
+            raise quickforex.QuickForexError("service unavailable")
+        return rates
+
+
+@pytest.mark.parametrize(
+    "failed_calls,succeeded,expected_calls",
+    [(1, True, 3), (2, True, 5), (3, False, 3), (100, False, 3)],
+)
+def test_failed_batch_is_retried_once_for_all_lookups(
+    failed_calls, succeeded, expected_calls
+):
+    wrapped = FailingProvider(failed_calls)
+    provider = BatchingProvider(wrapped, Settings(window=0.1))
+    pairs = [CurrencyPair("EUR", symbol) for symbol in SYMBOLS]
+    outcomes = run_concurrently(
+        [lambda pair=pair: provider.get_latest_rate(pair) for pair in pairs]
+    )
+    if succeeded:
+        assert outcomes == [1.0] * len(pairs)
+    else:
+        assert all(
+            isinstance(outcome, quickforex.QuickForexError) for outcome in outcomes
+        )
+    # The batch is retried in two halves rather than once per lookup (when failed_calls is 2, the
+    # first half fails again and is itself retried in two halves)
+    assert len(wrapped.calls) == expected_calls
+
+
+def test_lookup_with_later_deadline_retries_expired_batch():
+    class SlowProvider(CountingProvider):
+        def get_latest_rates(self, currency_pairs):
+            rates = super().get_latest_rates(currency_pairs)
+            time.sleep(0.2)
+            deadline = current_deadline()
+            if deadline is not None:
+                deadline.check()
+            return rates
+
+    wrapped = SlowProvider(return_rate=1.5)
+    provider = BatchingProvider(wrapped, Settings(window=0.05))
+
+    def get_rate_with_deadline():
+        with deadline_scope(0.1):
+            return provider.get_latest_rate(CurrencyPair("EUR", "USD"))
+
+    def get_rate_later():
+        time.sleep(0.01)
+        return provider.get_latest_rate(CurrencyPair("EUR", "GBP"))
+
+    outcomes = run_concurrently([get_rate_with_deadline, get_rate_later])
+    assert isinstance(outcomes[0], DeadlineExceededError)
+    assert outcomes[1] == 1.5
+    assert wrapped.calls == [
+        (
+            "latest",
+            frozenset({CurrencyPair("EUR", "USD"), CurrencyPair("EUR", "GBP")}),
+            None,
+        ),
+        ("latest", frozenset({CurrencyPair("EUR", "GBP")}), None),
+    ]
+
+
+def test_multiple_pairs_lookups_are_passed_through(wrapped: CountingProvider):
+    provider = BatchingProvider(wrapped, Settings(window=10.0))
+    pairs = {CurrencyPair("EUR", "USD"), CurrencyPair("GBP", "JPY")}
+    provider.get_latest_rates(pairs)
+    provider.get_historical_rates(pairs, as_of=AS_OF)
+    assert [call[0] for call in wrapped.calls] == ["latest", "historical"]
+
+
+def test_install_batching_provider_with_id():
+    default_provider = quickforex.get_installed_provider()
+    try:
+        quickforex.install_provider_with_id("batching", {"provider_id": "dummy"})
+        assert isinstance(quickforex.get_installed_provider(), BatchingProvider)
+        assert quickforex.get_latest_rate("EUR/USD") == 1.0
+    finally:
+        quickforex.install_provider(default_provider)
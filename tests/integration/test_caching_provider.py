@@ -0,0 +1,210 @@
+from datetime import date, timedelta
+from decimal import Decimal
+import time
+
+import pytest
+
+import quickforex
+from quickforex.api import Api
+from quickforex.domain import CurrencyPair, DateRange
+from quickforex.numeric import NumericMode
+from quickforex.rate_series import RateSeries
+from quickforex.providers.caching import CachingProvider, Settings
+from tests.counting_provider import CountingProvider, WeekdaysProvider
+
+
+EURUSD = CurrencyPair("EUR", "USD")
+GBPJPY = CurrencyPair("GBP", "JPY")
+AS_OF = date(2021, 1, 1)
+
+
+@pytest.fixture
+def wrapped() -> CountingProvider:
+    return CountingProvider()
+
+
+def test_latest_rates_are_cached(wrapped: CountingProvider):
+    api = Api(provider=CachingProvider(wrapped))
+    for _ in range(10):
+        assert api.get_latest_rate("EUR/USD") == 1.0
+    api.get_latest_rates("EUR/USD", "GBP/JPY")
+    assert wrapped.calls == [
+        ("latest", frozenset({EURUSD}), None),
+        ("latest", frozenset({GBPJPY}), None),
+    ]
+
+
+def test_latest_rates_expire(wrapped: CountingProvider):
+    provider = CachingProvider(wrapped, Settings(latest_ttl=0.05))
+    provider.get_latest_rate(EURUSD)
+    provider.get_latest_rate(EURUSD)
+    time.sleep(0.1)
+    provider.get_latest_rate(EURUSD)
+    assert len(wrapped.calls) == 2
+
+
+def test_historical_rates_are_cached(wrapped: CountingProvider):
+    provider = CachingProvider(wrapped)
+    provider.get_historical_rates({EURUSD, GBPJPY}, as_of=AS_OF)
+    provider.get_historical_rate(EURUSD, as_of=AS_OF)
+    provider.get_historical_rate(EURUSD, as_of=AS_OF + timedelta(days=1))
+    provider.get_latest_rate(EURUSD)
+    assert [call[0] for call in wrapped.calls] == ["historical", "historical", "latest"]
+
+
+def test_time_series_are_cached(wrapped: CountingProvider):
+    provider = CachingProvider(wrapped)
+    date_range = DateRange(AS_OF, AS_OF + timedelta(days=30))
+    provider.get_rates_time_series({EURUSD}, date_range)
+    series = provider.get_rates_time_series(
+        {EURUSD, GBPJPY}, DateRange(AS_OF, AS_OF + timedelta(days=10))
+    )
+    provider.get_historical_rate(EURUSD, as_of=AS_OF + timedelta(days=5))
+    assert wrapped.calls == [
+        ("series", frozenset({EURUSD}), date_range),
+        ("series", frozenset({GBPJPY}), DateRange(AS_OF, AS_OF + timedelta(days=10))),
+    ]
+    assert len(series[EURUSD]) == len(series[GBPJPY]) == 11
+
+
+def test_time_series_days_without_rate_are_cached():
+    # 2021-01-01 is a Friday: the range has 3 weekends
+    wrapped = WeekdaysProvider()
+    provider = CachingProvider(wrapped)
+    date_range = DateRange(AS_OF, AS_OF + timedelta(days=16))
+    for _ in range(2):
+        series = provider.get_rates_time_series({EURUSD}, date_range)
+        assert set(series[EURUSD].items()) == {
+            (dt, dt.day) for dt in date_range if dt.weekday() < 5
+        }
+    assert wrapped.calls == [("series", frozenset({EURUSD}), date_range)]
+
+
+def test_time_series_only_fetch_missing_ranges(wrapped: CountingProvider):
+    def days(start: int, end: int) -> DateRange:
+        return DateRange(AS_OF + timedelta(days=start), AS_OF + timedelta(days=end))
+
+    provider = CachingProvider(wrapped)
+    provider.get_rates_time_series({EURUSD}, days(0, 9))
+    series = provider.get_rates_time_series({EURUSD, GBPJPY}, days(5, 14))
+    assert sorted(wrapped.calls[1:], key=str) == sorted(
+        [
+            ("series", frozenset({EURUSD}), days(10, 14)),
+            ("series", frozenset({GBPJPY}), days(5, 14)),
+        ],
+        key=str,
+    )
+    assert len(series[EURUSD]) == len(series[GBPJPY]) == 10
+
+
+def test_time_series_do_not_evict_rates(wrapped: CountingProvider):
+    provider = CachingProvider(
+        wrapped, Settings(max_entries=10, max_series_entries=100)
+    )
+    provider.get_latest_rate(EURUSD)
+    provider.get_rates_time_series(
+        {EURUSD, GBPJPY}, DateRange(AS_OF, AS_OF + timedelta(days=364))
+    )
+    provider.get_latest_rate(EURUSD)
+    assert len(provider.cache) == 1
+    assert len(provider.series_cache) == 2
+    assert [call[0] for call in wrapped.calls] == ["latest", "series"]
+
+
+def test_long_time_series_are_cached_as_blocks(wrapped: CountingProvider):
+    provider = CachingProvider(wrapped, Settings(max_series_entries=2))
+    date_range = DateRange(date(2011, 1, 1), date(2020, 12, 31))
+    for _ in range(2):
+        series = provider.get_rates_time_series({EURUSD, GBPJPY}, date_range)
+        assert len(series[EURUSD]) == len(series[GBPJPY]) == len(date_range)
+    provider.get_rates_time_series({EURUSD}, DateRange(AS_OF, date(2022, 1, 31)))
+    assert wrapped.calls == [
+        ("series", frozenset({EURUSD, GBPJPY}), date_range),
+        ("series", frozenset({EURUSD}), DateRange(date(2021, 1, 1), date(2022, 1, 31))),
+    ]
+    assert len(provider.series_cache) == 2
+
+
+def test_time_series_keep_their_numeric_mode():
+    class MixedModesProvider(CountingProvider):
+        def get_rates_time_series(self, currency_pairs, date_range):
+            super().get_rates_time_series(currency_pairs, date_range)
+            numeric_mode = (
+                NumericMode.INT64 if len(date_range) > 5 else NumericMode.FLOAT
+            )
+            return {
+                pair: RateSeries.from_rates(
+                    date_range,
+                    {dt: Decimal("1.25") for dt in date_range},
+                    numeric_mode=numeric_mode,
+                    decimal_places=4,
+                )
+                for pair in currency_pairs
+            }
+
+    provider = CachingProvider(MixedModesProvider())
+    provider.get_rates_time_series(
+        {EURUSD}, DateRange(AS_OF, AS_OF + timedelta(days=9))
+    )
+    provider.get_rates_time_series(
+        {GBPJPY}, DateRange(AS_OF, AS_OF + timedelta(days=1))
+    )
+    series = provider.get_rates_time_series(
+        {EURUSD, GBPJPY}, DateRange(AS_OF, AS_OF + timedelta(days=1))
+    )
+    assert series[EURUSD].numeric_mode is NumericMode.INT64
+    assert dict(series[EURUSD]) == {AS_OF: 12500, AS_OF + timedelta(days=1): 12500}
+    assert series[GBPJPY].numeric_mode is NumericMode.FLOAT
+    assert dict(series[GBPJPY]) == {AS_OF: 1.25, AS_OF + timedelta(days=1): 1.25}
+    # Blocks of different numeric modes are assembled in the mode of the last fetched block
+    series = provider.get_rates_time_series(
+        {GBPJPY}, DateRange(AS_OF, AS_OF + timedelta(days=9))
+    )[GBPJPY]
+    assert series.numeric_mode is NumericMode.INT64
+    assert set(series.values()) == {12500}
+    assert len(series) == 10
+
+
+def test_cache_is_bounded(wrapped: CountingProvider):
+    provider = CachingProvider(wrapped, Settings(max_entries=2))
+    for pair in [EURUSD, GBPJPY, CurrencyPair("USD", "CHF"), EURUSD]:
+        provider.get_latest_rate(pair)
+    assert len(provider.cache) == 2
+    assert len(wrapped.calls) == 4
+
+
+def test_install_caching_provider_with_id():
+    default_provider = quickforex.get_installed_provider()
+    try:
+        quickforex.install_provider_with_id("caching", {"provider_id": "dummy"})
+        assert isinstance(quickforex.get_installed_provider(), CachingProvider)
+        assert quickforex.get_latest_rate("EUR/USD") == 1.0
+    finally:
+        quickforex.install_provider(default_provider)
+
+
+def test_caching_provider_cannot_wrap_itself():
+    with pytest.raises(quickforex.QuickForexError):
+        CachingProvider(settings=Settings(provider_id="caching"))
+
+
+def test_hot_pairs_are_refreshed_ahead(wrapped: CountingProvider):
+    hot_pairs = {EURUSD, GBPJPY}
+    settings = Settings(latest_ttl=0.2, hot_set_size=2, refresh_interval=0.05)
+    with CachingProvider(wrapped, settings) as provider:
+        for _ in range(5):
+            provider.get_latest_rates(hot_pairs)
+        provider.get_latest_rate(CurrencyPair("USD", "CHF"))
+        time.sleep(0.1)
+        cold_calls = len(wrapped.calls)
+        deadline = time.monotonic() + 0.6
+        while time.monotonic() < deadline:
+            assert provider.get_latest_rate(EURUSD) == 1.0
+            assert provider.get_latest_rate(GBPJPY) == 1.0
+            time.sleep(0.01)
+    refresh_calls = wrapped.calls[cold_calls:]
+    assert len(refresh_calls) >= 5
+    assert all(call == ("latest", frozenset(hot_pairs), None) for call in refresh_calls)
+    calls_after_close = len(wrapped.calls)
+    time.sleep(0.1)
+    assert len(wrapped.calls) == calls_after_close
@@ -1,10 +1,13 @@
 from typing import Any
+from datetime import date
 
 import pytest
 import deepdiff
 import json
 
 from quickforex.command_line import command_line_entrypoint
+from quickforex.providers.exchangerate_host import API_URL_ENV_VAR
+from tests.stub_server import StubExchangeRateHostServer, stub_rate
 
 
 def assert_no_diff(expected: dict[Any, Any], outcome: dict[Any, Any]):
@@ -21,6 +24,178 @@ def assert_no_diff(expected: dict[Any, Any], outcome: dict[Any, Any]):
         (
             ["--format", "json:pretty", "providers"],
             {
+                "batching": {
+                    "description": "Provider batching the single currency pair lookups sent to another provider",
+                    "identifier": "batching",
+                    "settings_required": False,
+                    "settings_schema": [
+                        {
+                            "default_value": "exchangerate.host",
+                            "has_default": True,
+                            "name": "provider_id",
+                            "nullable": False,
+                            "required": False,
+                            "setting_type": "str",
+                        },
+                        {
+                            "default_value": 0.005,
+                            "has_default": True,
+                            "name": "window",
+                            "nullable": False,
+                            "required": False,
+                            "setting_type": "float",
+                        },
+                        {
+                            "default_value": 100,
+                            "has_default": True,
+                            "name": "max_batch_size",
+                            "nullable": False,
+                            "required": False,
+                            "setting_type": "int",
+                        },
+                    ],
+                },
+                "routing": {
+                    "description": "Provider routing each lookup to the fastest healthy provider among several providers",
+                    "identifier": "routing",
+                    "settings_required": False,
+                    "settings_schema": [
+                        {
+                            "default_value": "exchangerate.host",
+                            "has_default": True,
+                            "name": "provider_ids",
+                            "nullable": False,
+                            "required": False,
+                            "setting_type": "str",
+                        },
+                        {
+                            "default_value": False,
+                            "has_default": True,
+                            "name": "race",
+                            "nullable": False,
+                            "required": False,
+                            "setting_type": "bool",
+                        },
+                        {
+                            "default_value": 0.2,
+                            "has_default": True,
+                            "name": "smoothing",
+                            "nullable": False,
+                            "required": False,
+                            "setting_type": "float",
+                        },
+                        {
+                            "default_value": 0.5,
+                            "has_default": True,
+                            "name": "max_error_rate",
+                            "nullable": False,
+                            "required": False,
+                            "setting_type": "float",
+                        },
+                        {
+                            "default_value": 30.0,
+                            "has_default": True,
+                            "name": "probe_interval",
+                            "nullable": False,
+                            "required": False,
+                            "setting_type": "float",
+                        },
+                    ],
+                },
+                "sqlite": {
+                    "description": "Provider persisting the historical rates returned by another provider in a SQLite database",
+                    "identifier": "sqlite",
+                    "settings_required": True,
+                    "settings_schema": [
+                        {
+                            "default_value": None,
+                            "has_default": False,
+                            "name": "database_path",
+                            "nullable": False,
+                            "required": True,
+                            "setting_type": "str",
+                        },
+                        {
+                            "default_value": "exchangerate.host",
+                            "has_default": True,
+                            "name": "provider_id",
+                            "nullable": False,
+                            "required": False,
+                            "setting_type": "str",
+                        },
+                        {
+                            "default_value": 365,
+                            "has_default": True,
+                            "name": "fetch_chunk_days",
+                            "nullable": False,
+                            "required": False,
+                            "setting_type": "int",
+                        },
+                    ],
+                },
+                "caching": {
+                    "description": "Provider caching the rates returned by another provider in memory",
+                    "identifier": "caching",
+                    "settings_required": False,
+                    "settings_schema": [
+                        {
+                            "default_value": "exchangerate.host",
+                            "has_default": True,
+                            "name": "provider_id",
+                            "nullable": False,
+                            "required": False,
+                            "setting_type": "str",
+                        },
+                        {
+                            "default_value": 100000,
+                            "has_default": True,
+                            "name": "max_entries",
+                            "nullable": False,
+                            "required": False,
+                            "setting_type": "int",
+                        },
+                        {
+                            "default_value": 10000,
+                            "has_default": True,
+                            "name": "max_series_entries",
+                            "nullable": False,
+                            "required": False,
+                            "setting_type": "int",
+                        },
+                        {
+                            "default_value": 60.0,
+                            "has_default": True,
+                            "name": "latest_ttl",
+                            "nullable": False,
+                            "required": False,
+                            "setting_type": "float",
+                        },
+                        {
+                            "default_value": None,
+                            "has_default": True,
+                            "name": "historical_ttl",
+                            "nullable": True,
+                            "required": False,
+                            "setting_type": "float",
+                        },
+                        {
+                            "default_value": 0,
+                            "has_default": True,
+                            "name": "hot_set_size",
+                            "nullable": False,
+                            "required": False,
+                            "setting_type": "int",
+                        },
+                        {
+                            "default_value": 30.0,
+                            "has_default": True,
+                            "name": "refresh_interval",
+                            "nullable": False,
+                            "required": False,
+                            "setting_type": "float",
+                        },
+                    ],
+                },
                 "exchangerate.host": {
                     "description": "Provider backed by exchangerate.host",
                     "identifier": "exchangerate.host",
@@ -42,8 +217,128 @@ def assert_no_diff(expected: dict[Any, Any], outcome: dict[Any, Any]):
                             "required": False,
                             "setting_type": "str",
                         },
+                        {
+                            "default_value": 10,
+                            "has_default": True,
+                            "name": "pool_maxsize",
+                            "nullable": False,
+                            "required": False,
+                            "setting_type": "int",
+                        },
+                        {
+                            "default_value": True,
+                            "has_default": True,
+                            "name": "keep_alive",
+                            "nullable": False,
+                            "required": False,
+                            "setting_type": "bool",
+                        },
+                        {
+                            "default_value": 8,
+                            "has_default": True,
+                            "name": "max_concurrent_requests",
+                            "nullable": False,
+                            "required": False,
+                            "setting_type": "int",
+                        },
+                        {
+                            "default_value": 4,
+                            "has_default": True,
+                            "name": "max_concurrent_time_series_requests",
+                            "nullable": False,
+                            "required": False,
+                            "setting_type": "int",
+                        },
+                        {
+                            "default_value": 5.0,
+                            "has_default": True,
+                            "name": "connect_timeout",
+                            "nullable": False,
+                            "required": False,
+                            "setting_type": "float",
+                        },
+                        {
+                            "default_value": 30.0,
+                            "has_default": True,
+                            "name": "read_timeout",
+                            "nullable": False,
+                            "required": False,
+                            "setting_type": "float",
+                        },
+                        {
+                            "default_value": None,
+                            "has_default": True,
+                            "name": "hedge_percentile",
+                            "nullable": True,
+                            "required": False,
+                            "setting_type": "float",
+                        },
+                        {
+                            "default_value": None,
+                            "has_default": True,
+                            "name": "cache_directory",
+                            "nullable": True,
+                            "required": False,
+                            "setting_type": "str",
+                        },
+                        {
+                            "default_value": 256,
+                            "has_default": True,
+                            "name": "cache_max_size_mb",
+                            "nullable": False,
+                            "required": False,
+                            "setting_type": "int",
+                        },
+                        {
+                            "default_value": 60.0,
+                            "has_default": True,
+                            "name": "latest_cache_ttl",
+                            "nullable": False,
+                            "required": False,
+                            "setting_type": "float",
+                        },
+                        {
+                            "default_value": None,
+                            "has_default": True,
+                            "name": "triangulation_pivot",
+                            "nullable": True,
+                            "required": False,
+                            "setting_type": "str",
+                        },
+                        {
+                            "default_value": True,
+                            "has_default": True,
+                            "name": "coalesce_requests",
+                            "nullable": False,
+                            "required": False,
+                            "setting_type": "bool",
+                        },
+                        {
+                            "default_value": "decimal",
+                            "has_default": True,
+                            "name": "numeric_mode",
+                            "nullable": False,
+                            "required": False,
+                            "setting_type": "str",
+                        },
+                        {
+                            "default_value": False,
+                            "has_default": True,
+                            "name": "stream_time_series",
+                            "nullable": False,
+                            "required": False,
+                            "setting_type": "bool",
+                        },
+                        {
+                            "default_value": None,
+                            "has_default": True,
+                            "name": "time_series_chunk_days",
+                            "nullable": True,
+                            "required": False,
+                            "setting_type": "int",
+                        },
                     ],
-                }
+                },
             },
         ),
         (
@@ -57,6 +352,17 @@ def assert_no_diff(expected: dict[Any, Any], outcome: dict[Any, Any]):
             ],
             {"EUR": {"USD": 2.0}},
         ),
+        (
+            [
+                "--format",
+                "json:pretty",
+                "--provider",
+                "caching:provider_id:dummy",
+                "latest",
+                "EUR/USD",
+            ],
+            {"EUR": {"USD": 1.0}},
+        ),
         (
             [
                 "--format",
@@ -169,3 +475,53 @@ def assert_no_diff(expected: dict[Any, Any], outcome: dict[Any, Any]):
 def test_command_line(args: list[str], expected_output: dict[Any, Any]):
     output = json.loads(command_line_entrypoint(args))
     assert_no_diff(expected_output, output)
+
+
+@pytest.mark.parametrize("decimal_places", [6, 8])
+@pytest.mark.parametrize("numeric_mode", ["decimal", "float", "int64"])
+def test_command_line_outputs_unscaled_rates(
+    monkeypatch, numeric_mode: str, decimal_places: int
+):
+    provider_arg = (
+        f"exchangerate.host:numeric_mode:{numeric_mode}:decimal_places:{decimal_places}"
+    )
+    with StubExchangeRateHostServer() as server:
+        monkeypatch.setenv(API_URL_ENV_VAR, server.url)
+        historical = json.loads(
+            command_line_entrypoint(
+                [
+                    "--provider",
+                    provider_arg,
+                    "history",
+                    "--date",
+                    "2021-01-01",
+                    "EURUSD",
+                ]
+            )
+        )
+        series = json.loads(
+            command_line_entrypoint(
+                [
+                    "--provider",
+                    provider_arg,
+                    "series",
+                    "--from",
+                    "2021-01-01",
+                    "--to",
+                    "2021-01-02",
+                    "EURUSD",
+                ]
+            )
+        )
+    as_of = date(2021, 1, 1)
+    assert historical == {
+        "EUR": {"USD": stub_rate("EUR", "USD", as_of, decimal_places)}
+    }
+    assert series == {
+        "EUR": {
+            "USD": {
+                dt.isoformat(): stub_rate("EUR", "USD", dt, decimal_places)
+                for dt in [as_of, date(2021, 1, 2)]
+            }
+        }
+    }
@@ -0,0 +1,188 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+import quickforex
+from quickforex.api import Api
+from quickforex.conversion import MISSING_RATE_LOOKBACK_DAYS
+from quickforex.domain import CurrencyPair, DateRange
+from quickforex.providers.exchangerate_host import (
+    ExchangeRateHostProvider,
+    Requester,
+    Settings,
+)
+from tests.counting_provider import CountingProvider, WeekdaysProvider
+from tests.stub_server import StubExchangeRateHostServer, stub_rate
+
+
+numpy = pytest.importorskip("numpy")
+
+
+START_DATE = date(2021, 1, 1)
+
+
+def test_convert_many_fetches_all_pairs_at_once():
+    wrapped = CountingProvider(return_rate=2.0)
+    amounts = numpy.arange(1000, dtype="float64")
+    currencies = numpy.array(["USD", "GBP", "EUR", "JPY"] * 250)
+    dates = numpy.datetime64("2021-01-01") + numpy.arange(1000) % 30
+    dates[-1] = numpy.datetime64("2021-06-01")
+    converted = Api(provider=wrapped).convert_many(
+        amounts, currencies, dates, target="EUR"
+    )
+    assert converted.tolist() == [
+        amount * (1.0 if currency == "EUR" else 2.0)
+        for amount, currency in zip(amounts, currencies)
+    ]
+    assert wrapped.calls == [
+        (
+            "series",
+            frozenset(
+                {
+                    CurrencyPair("USD", "EUR"),
+                    CurrencyPair("GBP", "EUR"),
+                    CurrencyPair("JPY", "EUR"),
+                }
+            ),
+            DateRange(
+                START_DATE - timedelta(days=MISSING_RATE_LOOKBACK_DAYS),
+                date(2021, 6, 1),
+            ),
+        )
+    ]
+
+
+def test_convert_many_target_currency_only():
+    wrapped = CountingProvider()
+    converted = Api(provider=wrapped).convert_many(
+        [1.0, 2.0], ["EUR", "EUR"], [START_DATE, START_DATE], target="EUR"
+    )
+    assert converted.tolist() == [1.0, 2.0]
+    assert Api(provider=wrapped).convert_many([], [], [], target="EUR").tolist() == []
+    assert wrapped.calls == []
+
+
+def test_convert_many_target_currency_amounts_outside_of_the_date_range():
+    converted = Api(provider=CountingProvider(return_rate=2.0)).convert_many(
+        [1.0, 2.0, 3.0, 4.0],
+        ["EUR", "USD", "EUR", "EUR"],
+        [date(2020, 1, 1), START_DATE, date(2021, 1, 2), date(2022, 1, 1)],
+        target="EUR",
+    )
+    assert converted.tolist() == [1.0, 4.0, 3.0, 4.0]
+
+
+def test_convert_many_with_exchangerate_host_provider():
+    rows = [
+        (100.0, "USD", date(2021, 1, 4)),
+        (25.5, "GBP", date(2020, 6, 1)),
+        (12.0, "EUR", date(2021, 2, 1)),
+        (7.0, "USD", date(2021, 3, 1)),
+        (1000.0, "JPY", date(2021, 1, 20)),
+    ]
+    amounts, currencies, dates = zip(*rows)
+    with StubExchangeRateHostServer() as server:
+        provider = ExchangeRateHostProvider(requester=Requester(server.url))
+        converted = Api(provider=provider).convert_many(
+            amounts, currencies, dates, target="EUR"
+        )
+        assert server.request_count == 3
+    expected = [
+        amount * (1.0 if currency == "EUR" else stub_rate(currency, "EUR", dt))
+        for amount, currency, dt in rows
+    ]
+    assert converted == pytest.approx(expected, rel=1e-12)
+
+
+def test_convert_many_carries_last_rate_forward():
+    # 2021-01-01 is a Friday, 2021-01-04 a Monday
+    dates = [date(2021, 1, day) for day in [1, 2, 3, 4, 9, 10]]
+    provider = WeekdaysProvider()
+    converted = Api(provider=provider).convert_many(
+        [1.0] * len(dates), ["USD"] * len(dates), dates, target="EUR"
+    )
+    assert converted.tolist() == [1.0, 1.0, 1.0, 4.0, 8.0, 8.0]
+    # The first amount is dated on a Sunday: the rate of the Friday before is used
+    converted = Api(provider=provider).convert_many(
+        [1.0, 1.0], ["USD", "GBP"], [date(2021, 1, 3), date(2021, 1, 5)], target="EUR"
+    )
+    assert converted.tolist() == [1.0, 5.0]
+
+
+def test_convert_many_missing_rates_are_reported():
+    class IncompleteProvider(CountingProvider):
+        def get_rates_time_series(self, currency_pairs, date_range):
+            return {
+                pair: {
+                    dt: rate
+                    for dt, rate in series.items()
+                    if dt >= date(2021, 1, 2) or pair.domestic != "USD"
+                }
+                for pair, series in super()
+                .get_rates_time_series(currency_pairs, date_range)
+                .items()
+            }
+
+    with pytest.raises(
+        quickforex.QuickForexError, match=r"2 amount\(s\), first is row 1"
+    ):
+        Api(provider=IncompleteProvider()).convert_many(
+            [1.0, 2.0, 3.0, 4.0, 5.0],
+            ["GBP", "USD", "GBP", "USD", "USD"],
+            [
+                date(2020, 12, 1),
+                date(2020, 12, 31),
+                date(2021, 1, 1),
+                date(2021, 1, 1),
+                date(2021, 1, 3),
+            ],
+            target="EUR",
+        )
+
+
+def test_convert_many_validates_lengths():
+    with pytest.raises(ValueError):
+        Api(provider=CountingProvider()).convert_many(
+            [1.0], ["USD", "GBP"], [START_DATE], target="EUR"
+        )
+
+
+def test_convert_many_with_int64_rates():
+    rows = [(100.0, "USD", date(2021, 1, 4)), (10.0, "GBP", date(2021, 1, 6))]
+    amounts, currencies, dates = zip(*rows)
+    with StubExchangeRateHostServer() as server:
+        provider = ExchangeRateHostProvider(
+            requester=Requester(server.url), settings=Settings(numeric_mode="int64")
+        )
+        converted = Api(provider=provider).convert_many(
+            amounts, currencies, dates, target="EUR"
+        )
+    expected = [
+        amount * stub_rate(currency, "EUR", dt) for amount, currency, dt in rows
+    ]
+    assert converted == pytest.approx(expected, rel=1e-12)
+
+
+def test_convert_many_with_int64_rates_carries_last_rate_forward():
+    class WeekdaysServer(StubExchangeRateHostServer):
+        def handle(self, endpoint, params):
+            payload = super().handle(endpoint, params)
+            payload["rates"] = {
+                dt: rates
+                for dt, rates in payload["rates"].items()
+                if date.fromisoformat(dt).weekday() < 5
+            }
+            return payload
+
+    friday, sunday = date(2021, 1, 8), date(2021, 1, 10)
+    with WeekdaysServer() as server:
+        provider = ExchangeRateHostProvider(
+            requester=Requester(server.url),
+            settings=Settings(numeric_mode="int64", decimal_places=4),
+        )
+        converted = Api(provider=provider).convert_many(
+            [100.0, 100.0], ["USD", "USD"], [friday, sunday], target="EUR"
+        )
+    rate = stub_rate("USD", "EUR", friday, places=4)
+    assert converted.tolist() == pytest.approx([100.0 * rate] * 2, rel=1e-12)
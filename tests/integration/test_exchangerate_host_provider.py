@@ -0,0 +1,330 @@
+from datetime import date
+from decimal import Decimal
+import time
+
+import pytest
+import requests
+
+from quickforex.domain import CurrencyPair, DateRange
+from quickforex.providers.exchangerate_host import (
+    API_URL_ENV_VAR,
+    DECIMAL_PLACES,
+    ExchangeRateHostProvider,
+    Requester,
+    Settings,
+)
+from tests.stub_server import StubExchangeRateHostServer, stub_rate
+
+
+LATENCY = 0.1
+AS_OF = date(2021, 1, 1)
+BASES = ["EUR", "USD", "GBP", "JPY", "CHF", "CAD", "AUD", "NZD", "SEK", "NOK"]
+
+
+@pytest.fixture
+def slow_stub_server() -> StubExchangeRateHostServer:
+    with StubExchangeRateHostServer(latency=LATENCY) as server:
+        yield server
+
+
+def make_provider(server: StubExchangeRateHostServer, **settings):
+    return ExchangeRateHostProvider(
+        requester=Requester(server.url), settings=Settings(**settings)
+    )
+
+
+@pytest.mark.parametrize("max_concurrent_requests", [1, 4, 10])
+def test_get_rates_fans_out_per_base_currency(
+    slow_stub_server: StubExchangeRateHostServer, max_concurrent_requests: int
+):
+    pairs = {CurrencyPair(base, "BTC") for base in BASES} | {CurrencyPair("EUR", "USD")}
+    with make_provider(
+        slow_stub_server, max_concurrent_requests=max_concurrent_requests
+    ) as provider:
+        start = time.perf_counter()
+        rates = provider.get_historical_rates(pairs, as_of=AS_OF)
+        elapsed = time.perf_counter() - start
+    assert rates.keys() == pairs
+    for pair, rate in rates.items():
+        assert float(rate) == stub_rate(pair.domestic, pair.foreign, AS_OF)
+    assert slow_stub_server.request_count == len(BASES)
+    assert slow_stub_server.max_in_flight == max_concurrent_requests
+    expected_round_trips = -(-len(BASES) // max_concurrent_requests)
+    assert elapsed < (expected_round_trips + 1) * LATENCY
+
+
+def test_get_rates_missing_pairs_are_reported():
+    class IncompleteRequester(Requester):
+        def get(self, endpoint, params=None):
+            return {"success": True, "base": params["base"], "rates": {}}
+
+    provider = ExchangeRateHostProvider(
+        requester=IncompleteRequester("http://unused"),
+        settings=Settings(max_concurrent_requests=4),
+    )
+    with pytest.raises(Exception, match="EURUSD"):
+        provider.get_latest_rates(
+            {CurrencyPair("EUR", "USD"), CurrencyPair("GBP", "USD")}
+        )
+
+
+@pytest.mark.parametrize("max_concurrent_time_series_requests", [1, 6])
+def test_get_rates_time_series_downloads_chunks_concurrently(
+    slow_stub_server: StubExchangeRateHostServer,
+    max_concurrent_time_series_requests: int,
+):
+    pairs = {CurrencyPair("EUR", "USD"), CurrencyPair("EUR", "GBP")} | {
+        CurrencyPair("GBP", "JPY")
+    }
+    date_range = DateRange(date(2018, 1, 1), date(2020, 12, 31))
+    with make_provider(
+        slow_stub_server,
+        max_concurrent_time_series_requests=max_concurrent_time_series_requests,
+    ) as provider:
+        series = provider.get_rates_time_series(pairs, date_range)
+    assert slow_stub_server.request_count == 3 * 2
+    assert slow_stub_server.max_in_flight == max_concurrent_time_series_requests
+    assert series.keys() == pairs
+    for pair, pair_series in series.items():
+        assert list(pair_series.keys()) == list(date_range)
+        for dt, rate in pair_series.items():
+            assert float(rate) == stub_rate(pair.domestic, pair.foreign, dt)
+
+
+def test_disk_cache_serves_historical_responses(tmp_path):
+    pairs = {CurrencyPair("EUR", "USD"), CurrencyPair("GBP", "JPY")}
+    date_range = DateRange(date(2020, 1, 1), date(2020, 3, 1))
+    settings = Settings(cache_directory=str(tmp_path))
+    with StubExchangeRateHostServer() as server:
+        for _ in range(3):
+            provider = ExchangeRateHostProvider(
+                requester=Requester(server.url, cache=settings.create_cache()),
+                settings=settings,
+            )
+            historical_rates = provider.get_historical_rates(pairs, as_of=AS_OF)
+            series = provider.get_rates_time_series(pairs, date_range)
+            provider.close()
+        assert server.request_count == 4
+    assert all(len(pair_series) == len(date_range) for pair_series in series.values())
+    assert historical_rates.keys() == pairs
+
+
+@pytest.mark.parametrize(
+    "latest_cache_ttl,expected_request_count", [(60.0, 1), (0.0, 3)]
+)
+def test_disk_cache_latest_ttl(
+    tmp_path, latest_cache_ttl: float, expected_request_count: int
+):
+    cache = Settings(cache_directory=str(tmp_path)).create_cache()
+    with StubExchangeRateHostServer() as server:
+        provider = ExchangeRateHostProvider(
+            requester=Requester(
+                server.url, cache=cache, latest_cache_ttl=latest_cache_ttl
+            )
+        )
+        for _ in range(3):
+            provider.get_latest_rate(CurrencyPair("EUR", "USD"))
+        assert server.request_count == expected_request_count
+
+
+def test_triangulation_fetches_all_pairs_in_one_request():
+    pairs = {
+        CurrencyPair("EUR", "USD"),
+        CurrencyPair("GBP", "JPY"),
+        CurrencyPair("CHF", "CAD"),
+        CurrencyPair("CAD", "CHF"),
+        CurrencyPair("USD", "USD"),
+    }
+    date_range = DateRange(date(2020, 1, 1), date(2020, 3, 1))
+    with StubExchangeRateHostServer() as server:
+        with make_provider(server, triangulation_pivot="EUR") as provider:
+            rates = provider.get_historical_rates(pairs, as_of=AS_OF)
+            assert server.request_count == 1
+            series = provider.get_rates_time_series(pairs, date_range)
+            assert server.request_count == 2
+            assert provider.get_latest_rate(CurrencyPair("JPY", "JPY")) == 1
+            assert server.request_count == 2
+    assert rates.keys() == series.keys() == pairs
+    for pair, rate in rates.items():
+        exact_rate = stub_rate(pair.domestic, pair.foreign, AS_OF, places=12)
+        assert abs(float(rate) - exact_rate) <= 1e-6
+    for pair, pair_series in series.items():
+        assert list(pair_series.keys()) == list(date_range)
+        for dt, rate in pair_series.items():
+            exact_rate = stub_rate(pair.domestic, pair.foreign, dt, places=12)
+            assert abs(float(rate) - exact_rate) <= 1e-6
+
+
+def test_triangulation_falls_back_to_direct_requests():
+    class NoBitcoinRequester(Requester):
+        def get(self, endpoint, params=None):
+            response = super().get(endpoint, params)
+            if params["base"] == "EUR":
+                response["rates"].pop("BTC", None)
+            return response
+
+    pairs = {CurrencyPair("EUR", "USD"), CurrencyPair("GBP", "BTC")}
+    with StubExchangeRateHostServer() as server:
+        provider = ExchangeRateHostProvider(
+            requester=NoBitcoinRequester(server.url),
+            settings=Settings(triangulation_pivot="EUR"),
+        )
+        rates = provider.get_historical_rates(pairs, as_of=AS_OF)
+        assert server.request_count == 2
+    assert float(rates[CurrencyPair("GBP", "BTC")]) == stub_rate("GBP", "BTC", AS_OF)
+
+
+def test_get_rates_time_series_single_day():
+    with StubExchangeRateHostServer() as server:
+        with make_provider(server) as provider:
+            series = provider.get_rates_time_series(
+                {CurrencyPair("EUR", "USD")}, DateRange(AS_OF, AS_OF)
+            )
+    assert series == {
+        CurrencyPair("EUR", "USD"): {
+            AS_OF: Decimal(str(stub_rate("EUR", "USD", AS_OF)))
+        }
+    }
+
+
+@pytest.mark.parametrize("triangulation_pivot", [None, "EUR"])
+def test_numeric_modes(triangulation_pivot):
+    pairs = {CurrencyPair("EUR", "USD"), CurrencyPair("GBP", "JPY")}
+    date_range = DateRange(date(2020, 1, 1), date(2020, 1, 10))
+    with StubExchangeRateHostServer() as server:
+        with make_provider(
+            server, numeric_mode="float", triangulation_pivot=triangulation_pivot
+        ) as provider:
+            float_rates = provider.get_historical_rates(pairs, as_of=AS_OF)
+            float_series = provider.get_rates_time_series(pairs, date_range)
+        with make_provider(
+            server, numeric_mode="int64", triangulation_pivot=triangulation_pivot
+        ) as provider:
+            int_rates = provider.get_historical_rates(pairs, as_of=AS_OF)
+            int_series = provider.get_rates_time_series(pairs, date_range)
+    for pair in pairs:
+        assert type(float_rates[pair]) is float
+        assert type(int_rates[pair]) is int
+        assert int_rates[pair] == round(float_rates[pair] * 10**6)
+        for dt in date_range:
+            assert type(float_series[pair][dt]) is float
+            assert type(int_series[pair][dt]) is int
+            assert int_series[pair][dt] == round(float_series[pair][dt] * 10**6)
+    if triangulation_pivot is None:
+        rate = stub_rate("EUR", "USD", AS_OF)
+        assert float_rates[CurrencyPair("EUR", "USD")] == rate
+        assert int_rates[CurrencyPair("EUR", "USD")] == round(rate * 10**6)
+
+
+def test_decimal_rates_are_parsed_exactly():
+    with StubExchangeRateHostServer() as server:
+        with make_provider(server) as provider:
+            rate = provider.get_historical_rate(CurrencyPair("EUR", "USD"), AS_OF)
+    assert rate == Decimal(str(stub_rate("EUR", "USD", AS_OF)))
+
+
+@pytest.mark.parametrize("stream_time_series", [False, True])
+def test_decimal_time_series_rates_match_historical_rates(stream_time_series: bool):
+    pairs = {CurrencyPair("EUR", "USD"), CurrencyPair("GBP", "JPY")}
+    date_range = DateRange(date(2020, 12, 1), date(2021, 1, 31))
+    with StubExchangeRateHostServer() as server:
+        with make_provider(server, stream_time_series=stream_time_series) as provider:
+            series = provider.get_rates_time_series(pairs, date_range)
+            for dt in [date(2020, 12, 1), AS_OF, date(2021, 1, 31)]:
+                historical_rates = provider.get_historical_rates(pairs, as_of=dt)
+                for pair in pairs:
+                    assert series[pair][dt] == historical_rates[pair]
+                    assert str(series[pair][dt]) == str(historical_rates[pair])
+
+
+class PlacesRecordingServer(StubExchangeRateHostServer):
+    def __init__(self):
+        super().__init__()
+        self.places: list[str] = []
+
+    def handle(self, endpoint: str, params: dict[str, str]) -> dict:
+        self.places.append(params["places"])
+        return super().handle(endpoint, params)
+
+
+@pytest.mark.parametrize("decimal_places", [None, 4, 8])
+def test_requested_places_follow_decimal_places(decimal_places):
+    pair = CurrencyPair("EUR", "USD")
+    date_range = DateRange(date(2021, 1, 1), date(2021, 1, 10))
+    settings = {} if decimal_places is None else {"decimal_places": decimal_places}
+    places = DECIMAL_PLACES if decimal_places is None else decimal_places
+    with PlacesRecordingServer() as server:
+        with make_provider(server, **settings) as provider:
+            rate = provider.get_historical_rate(pair, AS_OF)
+            series = provider.get_rates_time_series([pair], date_range)
+    assert server.places == [str(places)] * 2
+    assert rate == Decimal(str(stub_rate("EUR", "USD", AS_OF, places)))
+    assert series[pair][date_range.end_date] == Decimal(
+        str(stub_rate("EUR", "USD", date_range.end_date, places))
+    )
+
+
+def test_streamed_time_series():
+    pairs = {
+        CurrencyPair("EUR", "USD"),
+        CurrencyPair("EUR", "GBP"),
+        CurrencyPair("JPY", "CHF"),
+    }
+    date_range = DateRange(date(2019, 6, 1), date(2021, 1, 10))
+    with StubExchangeRateHostServer() as server:
+        with make_provider(server, numeric_mode="int64") as provider:
+            expected = provider.get_rates_time_series(pairs, date_range)
+        with make_provider(
+            server, numeric_mode="int64", stream_time_series=True
+        ) as provider:
+            series = provider.get_rates_time_series(pairs, date_range)
+    assert series.keys() == pairs
+    assert series == expected
+
+
+def test_get_rates_time_series_fixed_chunk_size():
+    date_range = DateRange(date(2021, 1, 1), date(2021, 3, 31))
+    with StubExchangeRateHostServer() as server:
+        with make_provider(server, time_series_chunk_days=30) as provider:
+            series = provider.get_rates_time_series(
+                {CurrencyPair("EUR", "USD")}, date_range
+            )
+        assert server.request_count == 3
+    assert list(series[CurrencyPair("EUR", "USD")].keys()) == list(date_range)
+
+
+def test_get_rates_time_series_chunk_size_adapts_to_basket_size():
+    date_range = DateRange(date(2021, 1, 1), date(2021, 12, 31))
+    large_basket = {CurrencyPair("EUR", f"X{index:02d}") for index in range(100)}
+    with StubExchangeRateHostServer() as server:
+        with make_provider(server, max_concurrent_time_series_requests=4) as provider:
+            provider.get_rates_time_series({CurrencyPair("EUR", "USD")}, date_range)
+            assert server.request_count == 1
+            series = provider.get_rates_time_series(large_basket, date_range)
+        assert 1 < server.request_count - 1 <= 4
+    assert series.keys() == large_basket
+    for pair, pair_series in series.items():
+        assert list(pair_series.keys()) == list(date_range)
+        assert float(pair_series[date(2021, 7, 1)]) == stub_rate(
+            pair.domestic, pair.foreign, date(2021, 7, 1)
+        )
+
+
+def test_api_url_can_be_set_from_environment(monkeypatch):
+    with StubExchangeRateHostServer() as server:
+        monkeypatch.setenv(API_URL_ENV_VAR, server.url)
+        with ExchangeRateHostProvider() as provider:
+            rates = provider.get_historical_rates({CurrencyPair("EUR", "USD")}, AS_OF)
+        assert server.request_count == 1
+    assert float(rates[CurrencyPair("EUR", "USD")]) == stub_rate("EUR", "USD", AS_OF)
+
+
+def test_server_errors_are_raised():
+    with StubExchangeRateHostServer(
+        failure_rate=lambda request_index: request_index == 1
+    ) as server:
+        with make_provider(server) as provider:
+            with pytest.raises(requests.HTTPError):
+                provider.get_latest_rates({CurrencyPair("EUR", "USD")})
+            assert provider.get_latest_rates({CurrencyPair("EUR", "USD")})
+        assert server.failure_count == 1
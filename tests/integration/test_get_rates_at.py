@@ -0,0 +1,74 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from quickforex.api import Api
+from quickforex.domain import CurrencyPair, DateRange
+from quickforex.errors import QuickForexError
+from quickforex.providers.exchangerate_host import ExchangeRateHostProvider, Requester
+from tests.counting_provider import CountingProvider, WeekdaysProvider
+from tests.stub_server import StubExchangeRateHostServer, stub_rate
+
+
+def test_get_rates_at_sends_planned_requests():
+    provider = CountingProvider(return_rate=2.0)
+    points = [
+        ("EUR/USD", date(2021, 1, 4)),
+        ("EURGBP", date(2021, 1, 6)),
+        (CurrencyPair("EUR", "USD"), date(2021, 1, 8)),
+        (("USD", "JPY"), date(2020, 6, 1)),
+    ]
+    rates = Api(provider=provider).get_rates_at(points)
+    assert rates == {point: Decimal(2) for point in points}
+    assert sorted(provider.calls, key=str) == sorted(
+        [
+            (
+                "series",
+                frozenset({CurrencyPair("EUR", "USD"), CurrencyPair("EUR", "GBP")}),
+                DateRange(date(2021, 1, 4), date(2021, 1, 8)),
+            ),
+            ("historical", frozenset({CurrencyPair("USD", "JPY")}), date(2020, 6, 1)),
+        ],
+        key=str,
+    )
+
+
+def test_get_rates_at_with_exchangerate_host_provider():
+    points = [
+        (CurrencyPair("EUR", "USD"), date(2021, 1, 4)),
+        (CurrencyPair("EUR", "USD"), date(2021, 1, 20)),
+        (CurrencyPair("GBP", "CHF"), date(2019, 3, 1)),
+        (CurrencyPair("GBP", "CHF"), date(2021, 3, 1)),
+    ]
+    with StubExchangeRateHostServer() as server:
+        provider = ExchangeRateHostProvider(requester=Requester(server.url))
+        rates = Api(provider=provider).get_rates_at(points)
+        assert server.request_count == 3
+    for (pair, dt), rate in rates.items():
+        assert float(rate) == stub_rate(pair.domestic, pair.foreign, dt)
+
+
+def test_get_rates_at_points_without_time_series_rate():
+    # 2021-01-09 is a Saturday: the time series has no rate for it
+    provider = WeekdaysProvider()
+    eurusd = CurrencyPair("EUR", "USD")
+    points = [(eurusd, date(2021, 1, 8)), (eurusd, date(2021, 1, 9))]
+    rates = Api(provider=provider).get_rates_at(points)
+    assert rates == {
+        points[0]: Decimal(8),
+        points[1]: provider.get_historical_rate(eurusd, date(2021, 1, 9)),
+    }
+    assert provider.calls[:2] == [
+        ("series", frozenset({eurusd}), DateRange(date(2021, 1, 8), date(2021, 1, 9))),
+        ("historical", frozenset({eurusd}), date(2021, 1, 9)),
+    ]
+
+
+def test_get_rates_at_missing_points_are_reported():
+    class IncompleteProvider(CountingProvider):
+        def get_historical_rates(self, currency_pairs, as_of):
+            return {}
+
+    with pytest.raises(QuickForexError, match="EUR/USD on 2021-01-04"):
+        Api(provider=IncompleteProvider()).get_rates_at([("EUR/USD", date(2021, 1, 4))])
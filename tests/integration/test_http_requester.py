@@ -0,0 +1,168 @@
+from datetime import date
+import threading
+
+import pytest
+
+from quickforex.domain import CurrencyPair
+from quickforex.errors import QuickForexError
+from quickforex.http_requester import (
+    HttpRequesterBase,
+    HttpSession,
+    SessionSettings,
+    get_shared_session,
+)
+from quickforex.http_cache import DiskCache
+from quickforex.providers import factory as providers_factory
+from quickforex.providers.exchangerate_host import ExchangeRateHostProvider, Requester
+from tests.stub_server import StubExchangeRateHostServer, stub_rate
+
+
+@pytest.fixture
+def stub_server() -> StubExchangeRateHostServer:
+    with StubExchangeRateHostServer() as server:
+        yield server
+
+
+def test_pooled_session_reuses_connections(stub_server: StubExchangeRateHostServer):
+    with HttpRequesterBase(stub_server.url) as requester:
+        for _ in range(10):
+            requester.get("latest", params={"base": "EUR", "symbols": "USD"})
+    assert stub_server.request_count == 10
+    assert stub_server.connection_count == 1
+
+
+def test_session_without_keep_alive(stub_server: StubExchangeRateHostServer):
+    session = HttpSession(SessionSettings(keep_alive=False))
+    with HttpRequesterBase(stub_server.url, session=session) as requester:
+        for _ in range(3):
+            requester.get("latest", params={"base": "EUR", "symbols": "USD"})
+    assert stub_server.connection_count == 3
+
+
+def test_shared_session_is_not_closed_by_requester(
+    stub_server: StubExchangeRateHostServer,
+):
+    session = get_shared_session()
+    with Requester(stub_server.url, session=session) as requester:
+        requester.get("latest", params={"base": "EUR", "symbols": "USD"})
+    with Requester(stub_server.url, session=session) as requester:
+        requester.get("latest", params={"base": "EUR", "symbols": "USD"})
+    assert stub_server.connection_count == 1
+
+
+def test_factory_providers_share_session():
+    first = providers_factory.create_provider("exchangerate.host")
+    second = providers_factory.create_provider("exchangerate.host")
+    assert first._requester.session is second._requester.session
+    third = providers_factory.create_provider(
+        "exchangerate.host", settings_overrides={"pool_maxsize": 2}
+    )
+    assert third._requester.session is not first._requester.session
+
+
+def test_provider_with_stub_server(stub_server: StubExchangeRateHostServer):
+    with ExchangeRateHostProvider(requester=Requester(stub_server.url)) as provider:
+        rate = provider.get_historical_rate(
+            CurrencyPair("EUR", "USD"), as_of=date(2021, 1, 1)
+        )
+    assert float(rate) == stub_rate("EUR", "USD", date(2021, 1, 1))
+
+
+def test_concurrent_identical_requests_are_coalesced():
+    barrier = threading.Barrier(200)
+    results = []
+    with StubExchangeRateHostServer(latency=0.2) as server:
+        with Requester(server.url) as requester:
+
+            def get_rate() -> None:
+                barrier.wait()
+                results.append(
+                    requester.get("latest", params={"base": "EUR", "symbols": "USD"})
+                )
+
+            threads = [threading.Thread(target=get_rate) for _ in range(200)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        assert server.request_count == 1
+    assert len(results) == 200
+    assert all(result == results[0] for result in results)
+
+
+def test_coalesced_request_error_is_shared():
+    class FailingRequester(HttpRequesterBase):
+        def response_check_hook(self, response_payload) -> None:
+            raise QuickForexError("invalid response")
+
+    errors = []
+    barrier = threading.Barrier(20)
+    with StubExchangeRateHostServer(latency=0.2) as server:
+        with FailingRequester(server.url) as requester:
+
+            def get() -> None:
+                barrier.wait()
+                try:
+                    requester.get("latest", params={"base": "EUR"})
+                except QuickForexError as e:
+                    errors.append(e)
+
+            threads = [threading.Thread(target=get) for _ in range(20)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        assert server.request_count == 1
+    assert len(errors) == 20
+
+
+def test_streamed_request(stub_server: StubExchangeRateHostServer):
+    entries = []
+    params = {
+        "start_date": "2021-01-01",
+        "end_date": "2021-01-10",
+        "base": "EUR",
+        "symbols": "USD,GBP",
+    }
+    with Requester(stub_server.url) as requester:
+        payload = requester.get_streamed(
+            "timeseries", params, "rates", lambda *entry: entries.append(entry)
+        )
+        expected = requester.get("timeseries", params=params)
+    assert payload == {key: expected[key] for key in expected if key != "rates"}
+    assert entries == list(expected["rates"].items())
+
+
+def test_streamed_request_error_is_checked():
+    class FailingServer(StubExchangeRateHostServer):
+        def handle(self, endpoint, params):
+            return {"success": False, "rates": {"2021-01-01": {}}}
+
+    with FailingServer() as server:
+        with Requester(server.url) as requester:
+            with pytest.raises(QuickForexError):
+                requester.get_streamed("timeseries", {}, "rates", lambda *_: None)
+
+
+def test_response_observers(tmp_path, stub_server: StubExchangeRateHostServer):
+    observed = []
+    params = {"base": "EUR", "symbols": "USD,GBP"}
+    with Requester(stub_server.url, cache=DiskCache(str(tmp_path))) as requester:
+        requester.add_response_observer(
+            lambda endpoint, params, size, latency: observed.append(
+                (endpoint, params, size, latency)
+            )
+        )
+        requester.get("2021-01-01", params=params)
+        requester.get("2021-01-01", params=params)
+        requester.get_streamed(
+            "timeseries",
+            {"start_date": "2021-01-01", "end_date": "2021-01-10", **params},
+            "rates",
+            lambda *_: None,
+        )
+    assert [entry[0] for entry in observed] == ["2021-01-01", "timeseries"]
+    assert observed[0][1] == params
+    for _, _, size, latency in observed:
+        assert size > 0
+        assert latency > 0
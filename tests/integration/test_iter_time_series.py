@@ -0,0 +1,87 @@
+from datetime import date
+import asyncio
+
+import pytest
+
+from quickforex.api import Api
+from quickforex.async_api import AsyncApi
+from quickforex.domain import CurrencyPair, DateRange
+from quickforex.providers.exchangerate_host import (
+    AsyncExchangeRateHostProvider,
+    AsyncRequester,
+    ExchangeRateHostProvider,
+    Requester,
+)
+from tests.counting_provider import CountingProvider
+from tests.stub_server import StubExchangeRateHostServer, stub_rate
+
+
+PAIRS = {CurrencyPair("EUR", "USD"), CurrencyPair("GBP", "JPY")}
+DATE_RANGE = DateRange(date(2019, 1, 1), date(2021, 3, 31))
+
+
+def test_iter_rates_time_series_with_provider_without_iterator():
+    provider = CountingProvider(return_rate=2.0)
+    blocks = Api(provider=provider).iter_rates_time_series(
+        PAIRS, date_range=DATE_RANGE, chunk_days=365
+    )
+    assert provider.calls == []
+    first_block = next(blocks)
+    assert provider.calls == [
+        ("series", frozenset(PAIRS), DateRange(date(2019, 1, 1), date(2019, 12, 31)))
+    ]
+    assert first_block.keys() == PAIRS
+    assert [len(first_block[pair]) for pair in PAIRS] == [365, 365]
+    assert len(list(blocks)) == 2
+    assert [call[2] for call in provider.calls] == list(DATE_RANGE.chunks(365))
+
+
+def test_iter_rates_time_series_with_exchangerate_host_provider():
+    with StubExchangeRateHostServer() as server:
+        provider = ExchangeRateHostProvider(requester=Requester(server.url))
+        with provider:
+            api = Api(provider=provider)
+            blocks = list(
+                api.iter_rates_time_series(PAIRS, date_range=DATE_RANGE, chunk_days=100)
+            )
+            records = list(
+                api.iter_rates_time_series(
+                    PAIRS, date_range=DATE_RANGE, chunk_days=100, records=True
+                )
+            )
+            expected = provider.get_rates_time_series(PAIRS, DATE_RANGE)
+    assert len(blocks) == 9
+    for pair in PAIRS:
+        merged = {dt: rate for block in blocks for dt, rate in block[pair].items()}
+        assert merged == expected[pair]
+    assert len(records) == len(DATE_RANGE) * len(PAIRS)
+    assert records[0] == (
+        CurrencyPair("EUR", "USD"),
+        DATE_RANGE.start_date,
+        expected[CurrencyPair("EUR", "USD")][DATE_RANGE.start_date],
+    )
+    assert {(pair, dt) for pair, dt, _ in records} == {
+        (pair, dt) for pair in PAIRS for dt in DATE_RANGE
+    }
+
+
+def test_async_iter_rates_time_series():
+    pytest.importorskip("aiohttp")
+
+    async def run(server_url: str):
+        provider = AsyncExchangeRateHostProvider(requester=AsyncRequester(server_url))
+        async with provider:
+            api = AsyncApi(provider=provider)
+            return [
+                record
+                async for record in api.iter_rates_time_series(
+                    PAIRS, date_range=DATE_RANGE, chunk_days=200, records=True
+                )
+            ]
+
+    with StubExchangeRateHostServer() as server:
+        records = asyncio.run(run(server.url))
+        assert server.request_count == 5 * 2
+    assert len(records) == len(DATE_RANGE) * len(PAIRS)
+    for pair, dt, rate in records[:10]:
+        assert float(rate) == stub_rate(pair.domestic, pair.foreign, dt)
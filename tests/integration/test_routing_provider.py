@@ -0,0 +1,153 @@
+import threading
+import time
+
+import pytest
+
+from quickforex.api import Api
+from quickforex.domain import CurrencyPair
+from quickforex.providers.dummy import DummyProvider
+from quickforex.providers.routing import RoutingProvider, Settings
+from tests.counting_provider import CountingProvider
+
+
+PAIR = CurrencyPair("EUR", "USD")
+
+
+class FlakyProvider(CountingProvider):
+    """Counting provider answering after a delay, or failing while `failing` is set"""
+
+    def __init__(self, return_rate: float, delay: float = 0.0, failing: bool = False):
+        super().__init__(return_rate)
+        self.delay = delay
+        self.failing = failing
+
+    def get_latest_rates(self, currency_pairs):
+        time.sleep(self.delay)
+        result = super().get_latest_rates(currency_pairs)
+        if self.failing:
+            raise RuntimeError("provider unavailable")
+        return result
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def test_lookups_are_routed_to_the_fastest_provider():
+    slow = FlakyProvider(1.0, delay=0.05)
+    fast = FlakyProvider(2.0)
+    with RoutingProvider([slow, fast]) as provider:
+        api = Api(provider=provider)
+        rates = [api.get_latest_rate(PAIR) for _ in range(10)]
+        stats = provider.stats
+    assert rates[2:] == [2.0] * 8
+    assert len(slow.calls) == 1
+    assert len(fast.calls) == 9
+    assert [entry.identifier for entry in stats] == ["dummy", "dummy"]
+    assert stats[0].latency > stats[1].latency
+
+
+def test_failed_lookups_are_sent_to_the_next_provider():
+    failing = FlakyProvider(1.0, failing=True)
+    healthy = FlakyProvider(2.0)
+    clock = FakeClock()
+    settings = Settings(probe_interval=30.0)
+    with RoutingProvider([failing, healthy], settings, clock=clock) as provider:
+        assert [provider.get_latest_rates([PAIR])[PAIR] for _ in range(3)] == [2.0] * 3
+        assert provider.stats[0].error_rate > 0
+        # The error rate exceeds max_error_rate after the 4th failure
+        for _ in range(10):
+            provider.get_latest_rates([PAIR])
+        assert len(failing.calls) == 4
+        assert not provider.stats[0].healthy
+        clock.advance(29.0)
+        for _ in range(10):
+            provider.get_latest_rates([PAIR])
+        assert len(failing.calls) == 4
+        failing.failing = False
+        clock.advance(1.0)
+        assert provider.get_latest_rates([PAIR])[PAIR] == 1.0
+        assert len(failing.calls) == 5
+        assert provider.stats[0].healthy
+
+
+def test_unhealthy_provider_is_probed_by_a_single_lookup():
+    class GatedProvider(FlakyProvider):
+        def __init__(self, return_rate: float):
+            super().__init__(return_rate, failing=True)
+            self.lookups = 0
+            self.entered = threading.Event()
+            self.release = threading.Event()
+            self.release.set()
+
+        def get_latest_rates(self, currency_pairs):
+            self.lookups += 1
+            self.entered.set()
+            self.release.wait(timeout=5.0)
+            return super().get_latest_rates(currency_pairs)
+
+    failing = GatedProvider(1.0)
+    healthy = FlakyProvider(2.0)
+    clock = FakeClock()
+    settings = Settings(probe_interval=30.0)
+    with RoutingProvider([failing, healthy], settings, clock=clock) as provider:
+        for _ in range(10):
+            provider.get_latest_rates([PAIR])
+        assert failing.lookups == 4
+        clock.advance(30.0)
+        failing.entered.clear()
+        failing.release.clear()
+        probe = threading.Thread(target=provider.get_latest_rates, args=([PAIR],))
+        probe.start()
+        assert failing.entered.wait(timeout=5.0)
+        # Lookups sent while the probe is in flight go to the healthy provider
+        for _ in range(5):
+            assert provider.get_latest_rates([PAIR])[PAIR] == 2.0
+        assert failing.lookups == 5
+        failing.release.set()
+        probe.join()
+        assert not provider.stats[0].healthy
+
+
+def test_error_is_raised_when_all_providers_fail():
+    providers = [FlakyProvider(1.0, failing=True), FlakyProvider(2.0, failing=True)]
+    with RoutingProvider(providers) as provider:
+        with pytest.raises(RuntimeError, match="unavailable"):
+            provider.get_latest_rates([PAIR])
+    assert [len(p.calls) for p in providers] == [1, 1]
+
+
+@pytest.mark.parametrize("slow_fails", [False, True])
+def test_race_returns_the_first_successful_response(slow_fails: bool):
+    slow = FlakyProvider(1.0, delay=0.5, failing=slow_fails)
+    fast = FlakyProvider(2.0, delay=0.01)
+    with RoutingProvider([slow, fast], Settings(race=True)) as provider:
+        start = time.perf_counter()
+        rates = provider.get_latest_rates([PAIR])
+        elapsed = time.perf_counter() - start
+    assert rates[PAIR] == 2.0
+    assert elapsed < 0.4
+    assert len(fast.calls) == 1
+
+
+def test_race_falls_back_to_remaining_providers():
+    providers = [
+        FlakyProvider(1.0, failing=True),
+        FlakyProvider(2.0, failing=True),
+        FlakyProvider(3.0),
+    ]
+    with RoutingProvider(providers, Settings(race=True)) as provider:
+        assert provider.get_latest_rates([PAIR])[PAIR] == 3.0
+
+
+def test_providers_are_created_from_settings():
+    provider = RoutingProvider(settings=Settings(provider_ids="dummy, batching"))
+    assert [p.identifier for p in provider.providers] == ["dummy", "batching"]
+    assert isinstance(provider.providers[0], DummyProvider)
@@ -0,0 +1,165 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+import quickforex
+from quickforex.domain import CurrencyPair, DateRange
+from quickforex.numeric import NumericMode
+from quickforex.providers import exchangerate_host
+from quickforex.providers.exchangerate_host import ExchangeRateHostProvider, Requester
+from quickforex.providers.sqlite_store import SqliteStoreProvider, Settings
+from tests.counting_provider import CountingProvider, WeekdaysProvider
+from tests.stub_server import StubExchangeRateHostServer
+
+
+EURUSD = CurrencyPair("EUR", "USD")
+GBPJPY = CurrencyPair("GBP", "JPY")
+AS_OF = date(2021, 1, 1)
+
+
+def days(start: int, end: int) -> DateRange:
+    return DateRange(AS_OF + timedelta(days=start), AS_OF + timedelta(days=end))
+
+
+@pytest.fixture
+def wrapped() -> CountingProvider:
+    return CountingProvider(return_rate=1.5)
+
+
+@pytest.fixture
+def settings(tmp_path) -> Settings:
+    return Settings(database_path=str(tmp_path / "rates.sqlite3"))
+
+
+def test_time_series_only_fetches_missing_ranges(
+    wrapped: CountingProvider, settings: Settings
+):
+    settings.fetch_chunk_days = 10
+    provider = SqliteStoreProvider(wrapped, settings)
+    provider.get_rates_time_series({EURUSD}, days(10, 20))
+    series = provider.get_rates_time_series({EURUSD, GBPJPY}, days(0, 30))
+    assert set(wrapped.calls) == {
+        ("series", frozenset({EURUSD}), days(10, 20)),
+        ("series", frozenset({EURUSD}), days(0, 9)),
+        ("series", frozenset({EURUSD}), days(21, 30)),
+        ("series", frozenset({GBPJPY}), days(0, 30)),
+    }
+    assert (
+        series[EURUSD] == series[GBPJPY] == {dt: Decimal("1.5") for dt in days(0, 30)}
+    )
+    provider.get_rates_time_series({EURUSD, GBPJPY}, days(5, 25))
+    assert len(wrapped.calls) == 4
+
+
+def test_time_series_gaps_are_merged(wrapped: CountingProvider, settings: Settings):
+    provider = SqliteStoreProvider(wrapped, settings)
+    provider.get_rates_time_series({EURUSD}, days(10, 20))
+    provider.get_rates_time_series({EURUSD, GBPJPY}, days(0, 30))
+    assert wrapped.calls == [
+        ("series", frozenset({EURUSD}), days(10, 20)),
+        ("series", frozenset({EURUSD, GBPJPY}), days(0, 30)),
+    ]
+
+
+def test_days_without_rate_are_not_fetched_again(settings: Settings):
+    # 2021-01-01 is a Friday: the range has 9 weekends
+    wrapped = WeekdaysProvider()
+    provider = SqliteStoreProvider(wrapped, settings)
+    for _ in range(2):
+        series = provider.get_rates_time_series({EURUSD, GBPJPY}, days(0, 60))
+        for pair in [EURUSD, GBPJPY]:
+            assert set(series[pair].items()) == {
+                (dt, dt.day) for dt in days(0, 60) if dt.weekday() < 5
+            }
+    assert wrapped.calls == [("series", frozenset({EURUSD, GBPJPY}), days(0, 60))]
+    # 2021-01-02 and 2021-01-03 are a weekend: pairs without rate are left out (as by the
+    # exchangerate.host provider)
+    assert provider.get_rates_time_series({EURUSD}, days(1, 2)) == {}
+    assert len(wrapped.calls) == 1
+
+
+def test_historical_rates_are_stored(wrapped: CountingProvider, settings: Settings):
+    provider = SqliteStoreProvider(wrapped, settings)
+    provider.get_rates_time_series({EURUSD}, days(0, 10))
+    assert provider.get_historical_rate(EURUSD, AS_OF) == Decimal("1.5")
+    provider.get_historical_rates({EURUSD, GBPJPY}, AS_OF)
+    provider.get_historical_rates({EURUSD, GBPJPY}, AS_OF)
+    assert wrapped.calls[1:] == [("historical", frozenset({GBPJPY}), AS_OF)]
+
+
+def test_recent_rates_are_not_stored(wrapped: CountingProvider, settings: Settings):
+    provider = SqliteStoreProvider(wrapped, settings)
+    today = date.today()
+    date_range = DateRange(today - timedelta(days=3), today)
+    for _ in range(2):
+        assert len(provider.get_rates_time_series({EURUSD}, date_range)[EURUSD]) == 4
+        provider.get_historical_rate(EURUSD, today)
+        provider.get_latest_rate(EURUSD)
+    assert wrapped.calls == [
+        (
+            "series",
+            frozenset({EURUSD}),
+            DateRange(today - timedelta(days=3), today - timedelta(days=1)),
+        ),
+        ("series", frozenset({EURUSD}), DateRange(today, today)),
+        ("historical", frozenset({EURUSD}), today),
+        ("latest", frozenset({EURUSD}), None),
+        ("series", frozenset({EURUSD}), DateRange(today, today)),
+        ("historical", frozenset({EURUSD}), today),
+        ("latest", frozenset({EURUSD}), None),
+    ]
+
+
+def test_rates_persist_across_providers(wrapped: CountingProvider, settings: Settings):
+    with_store = SqliteStoreProvider(wrapped, settings)
+    with_store.get_rates_time_series({EURUSD}, days(0, 10))
+    with_store.close()
+    other_wrapped = CountingProvider()
+    series = SqliteStoreProvider(other_wrapped, settings).get_rates_time_series(
+        {EURUSD}, days(0, 10)
+    )
+    assert other_wrapped.calls == []
+    assert set(series[EURUSD].values()) == {Decimal("1.5")}
+
+
+@pytest.mark.parametrize(
+    "numeric_mode, decimal_places",
+    [(NumericMode.INT64, 6), (NumericMode.INT64, 8), (NumericMode.FLOAT, 6)],
+)
+def test_rates_are_restored_in_the_numeric_mode_of_the_wrapped_provider(
+    settings: Settings, numeric_mode: NumericMode, decimal_places: int
+):
+    wrapped_settings = exchangerate_host.Settings(
+        numeric_mode=numeric_mode.value, decimal_places=decimal_places
+    )
+    with StubExchangeRateHostServer() as server:
+        wrapped = ExchangeRateHostProvider(
+            requester=Requester(server.url), settings=wrapped_settings
+        )
+        expected_series = wrapped.get_rates_time_series({EURUSD}, days(0, 10))[EURUSD]
+        expected_rate = wrapped.get_historical_rate(EURUSD, AS_OF)
+        provider = SqliteStoreProvider(wrapped, settings)
+        # The second calls read the rates from the store
+        for _ in range(2):
+            series = provider.get_rates_time_series({EURUSD}, days(0, 10))[EURUSD]
+            assert series.numeric_mode is numeric_mode
+            assert series.decimal_places == decimal_places
+            assert dict(series) == dict(expected_series)
+            rate = provider.get_historical_rate(EURUSD, AS_OF)
+            assert type(rate) is type(expected_rate)
+            assert rate == expected_rate
+        assert type(series[AS_OF]) is type(expected_rate)
+        provider.close()
+
+
+def test_install_sqlite_provider_with_id(settings: Settings):
+    default_provider = quickforex.get_installed_provider()
+    try:
+        quickforex.install_provider_with_id(
+            "sqlite", {"database_path": settings.database_path, "provider_id": "dummy"}
+        )
+        assert isinstance(quickforex.get_installed_provider(), SqliteStoreProvider)
+        assert quickforex.get_historical_rate("EUR/USD", as_of=AS_OF) == 1.0
+    finally:
+        quickforex.install_provider(default_provider)
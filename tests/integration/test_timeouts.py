@@ -0,0 +1,114 @@
+from datetime import date
+import time
+
+import pytest
+import requests
+
+from quickforex.api import Api
+from quickforex.deadline import DeadlineExceededError, deadline_scope
+from quickforex.domain import CurrencyPair, DateRange
+from quickforex.http_requester import (
+    HedgingPolicy,
+    HttpSession,
+    SessionSettings,
+)
+from quickforex.providers.exchangerate_host import (
+    ExchangeRateHostProvider,
+    Requester,
+    Settings,
+)
+from tests.stub_server import StubExchangeRateHostServer
+
+
+PARAMS = {"base": "EUR", "symbols": "USD"}
+
+
+def test_read_timeout():
+    with StubExchangeRateHostServer(latency=1.0) as server:
+        session = HttpSession(SessionSettings(read_timeout=0.1))
+        with Requester(server.url, session=session) as requester:
+            start = time.perf_counter()
+            with pytest.raises(requests.Timeout):
+                requester.get("latest", params=PARAMS)
+            assert time.perf_counter() - start < 0.5
+
+
+def test_api_deadline_applies_to_all_sub_requests():
+    with StubExchangeRateHostServer(latency=0.3) as server:
+        provider = ExchangeRateHostProvider(
+            requester=Requester(server.url),
+            settings=Settings(max_concurrent_time_series_requests=1),
+        )
+        api = Api(provider=provider)
+        start = time.perf_counter()
+        with pytest.raises(DeadlineExceededError):
+            api.get_rates_time_series(
+                "EUR/USD",
+                start_date=date(2015, 1, 1),
+                end_date=date(2020, 1, 1),
+                timeout=0.5,
+            )
+        assert time.perf_counter() - start < 0.8
+        assert server.request_count == 2
+        provider.close()
+
+
+def test_api_deadline_not_exceeded():
+    with StubExchangeRateHostServer(latency=0.05) as server:
+        api = Api(provider=ExchangeRateHostProvider(requester=Requester(server.url)))
+        rates = api.get_latest_rates("EUR/USD", "GBP/USD", timeout=5.0)
+        assert rates.keys() == {CurrencyPair("EUR", "USD"), CurrencyPair("GBP", "USD")}
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_deadline_applies_to_trickled_response_body(stream: bool):
+    # Each piece of the body arrives well within the read timeout, but the whole body takes
+    # about 1s to be received
+    with StubExchangeRateHostServer(
+        trickle_interval=0.05, payload_padding=300
+    ) as server:
+        with Requester(server.url) as requester:
+            start = time.perf_counter()
+            with pytest.raises(DeadlineExceededError):
+                with deadline_scope(0.2):
+                    if stream:
+                        requester.get_streamed(
+                            "latest", PARAMS, "rates", lambda key, value: None
+                        )
+                    else:
+                        requester.get("latest", params=PARAMS)
+            assert time.perf_counter() - start < 0.5
+
+
+def test_nested_deadline_scopes_keep_earliest_deadline():
+    with deadline_scope(0.1) as outer:
+        with deadline_scope(10.0) as inner:
+            assert inner is outer
+        with deadline_scope(0.01) as inner:
+            assert inner is not outer
+    with deadline_scope(None) as no_deadline:
+        assert no_deadline is None
+
+
+def test_hedged_request_returns_first_response():
+    slow_request_index = 21
+    with StubExchangeRateHostServer(
+        latency=lambda index: 2.0 if index == slow_request_index else 0.01
+    ) as server:
+        with Requester(server.url, hedging=HedgingPolicy(percentile=0.9)) as requester:
+            for _ in range(slow_request_index - 1):
+                requester.get("latest", params=PARAMS)
+            start = time.perf_counter()
+            response = requester.get("latest", params=PARAMS)
+            elapsed = time.perf_counter() - start
+        assert response["base"] == "EUR"
+        assert elapsed < 1.0
+        assert server.request_count == slow_request_index + 1
+
+
+def test_no_hedged_request_before_enough_samples():
+    with StubExchangeRateHostServer(latency=0.05) as server:
+        with Requester(server.url, hedging=HedgingPolicy()) as requester:
+            for _ in range(5):
+                requester.get("latest", params=PARAMS)
+        assert server.request_count == 5
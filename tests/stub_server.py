@@ -0,0 +1,199 @@
+from typing import Any, Optional, Union, Callable
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import threading
+import random
+import json
+import time
+
+
+def _currency_value(symbol: str, as_of: date) -> float:
+    seed = sum(ord(c) * (i + 1) for i, c in enumerate(symbol))
+    drift = 1.0 + ((as_of.toordinal() + seed) % 30) / 1000.0
+    return (0.5 + (seed % 97) / 50.0) * drift
+
+
+def stub_rate(base: str, symbol: str, as_of: date, places: int = 6) -> float:
+    """Deterministic rate served by the stub server (rates are consistent across crosses)."""
+    return round(_currency_value(symbol, as_of) / _currency_value(base, as_of), places)
+
+
+# Number of bytes of each piece of the response bodies written by a trickling server
+TRICKLE_PIECE_SIZE = 16
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: "_Server"
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.stub.on_connection()
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        endpoint = url.path.strip("/")
+        status, payload = self.server.stub.handle_request(endpoint, params)
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        trickle_interval = self.server.stub.trickle_interval
+        if trickle_interval <= 0:
+            self.wfile.write(body)
+            return
+        for offset in range(0, len(body), TRICKLE_PIECE_SIZE):
+            self.wfile.write(body[offset : offset + TRICKLE_PIECE_SIZE])
+            time.sleep(trickle_interval)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, stub: "StubExchangeRateHostServer"):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.stub = stub
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        pass
+
+
+class StubExchangeRateHostServer(object):
+    """Local HTTP server mimicking the exchangerate.host 'latest', historical and 'timeseries' endpoints."""
+
+    def __init__(
+        self,
+        today: Optional[date] = None,
+        latency: Union[float, Callable[[int], float]] = 0.0,
+        payload_padding: int = 0,
+        failure_rate: Union[float, Callable[[int], bool]] = 0.0,
+        seed: int = 0,
+        trickle_interval: float = 0.0,
+    ):
+        """
+        :param today: Date of the rates served by the 'latest' endpoint
+        :param latency: Time (in seconds) spent by the server before responding to each request, or
+            function returning that time given the (1-based) index of the request
+        :param payload_padding: Number of bytes added to each response payload (as a 'motd' member)
+        :param failure_rate: Fraction of the requests answered with a 503 error (picked at random),
+            or function returning whether to fail the request given its (1-based) index
+        :param seed: Seed of the random failures
+        :param trickle_interval: When set, response bodies are written in pieces of
+            TRICKLE_PIECE_SIZE bytes, waiting this time (in seconds) after each piece
+        """
+        self._today = today or date.today()
+        self.latency = latency
+        self.payload_padding = payload_padding
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self.trickle_interval = trickle_interval
+        self.failure_count = 0
+        self._lock = threading.Lock()
+        self._server: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+        self.request_count = 0
+        self.connection_count = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    @property
+    def url(self) -> str:
+        assert self._server is not None
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def on_connection(self) -> None:
+        with self._lock:
+            self.connection_count += 1
+
+    def _rates(self, base: str, symbols: list[str], as_of: date, places: int):
+        return {symbol: stub_rate(base, symbol, as_of, places) for symbol in symbols}
+
+    def _should_fail(self, request_index: int) -> bool:
+        if callable(self.failure_rate):
+            return self.failure_rate(request_index)
+        return self.failure_rate > 0 and self._random.random() < self.failure_rate
+
+    def handle_request(
+        self, endpoint: str, params: dict[str, str]
+    ) -> tuple[int, dict[str, Any]]:
+        with self._lock:
+            self.request_count += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            request_index = self.request_count
+            fail = self._should_fail(request_index)
+            if fail:
+                self.failure_count += 1
+        try:
+            latency = (
+                self.latency(request_index) if callable(self.latency) else self.latency
+            )
+            if latency > 0:
+                time.sleep(latency)
+            if fail:
+                return 503, {"success": False, "error": "service unavailable"}
+            payload = self.handle(endpoint, params)
+            if self.payload_padding > 0:
+                payload = {**payload, "motd": "x" * self.payload_padding}
+            return 200, payload
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def handle(self, endpoint: str, params: dict[str, str]) -> dict[str, Any]:
+        base = params.get("base", "EUR")
+        symbols = [s for s in params.get("symbols", "").split(",") if s]
+        places = int(params.get("places", 6))
+        if endpoint == "timeseries":
+            start_date = date.fromisoformat(params["start_date"])
+            end_date = date.fromisoformat(params["end_date"])
+            rates = {}
+            current_date = start_date
+            while current_date <= end_date:
+                rates[current_date.isoformat()] = self._rates(
+                    base, symbols, current_date, places
+                )
+                current_date += timedelta(days=1)
+            return {
+                "success": True,
+                "timeseries": True,
+                "base": base,
+                "start_date": params["start_date"],
+                "end_date": params["end_date"],
+                "rates": rates,
+            }
+        as_of = self._today if endpoint == "latest" else date.fromisoformat(endpoint)
+        return {
+            "success": True,
+            "base": base,
+            "date": as_of.isoformat(),
+            "rates": self._rates(base, symbols, as_of, places),
+        }
+
+    def start(self) -> "StubExchangeRateHostServer":
+        self._server = _Server(self)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "StubExchangeRateHostServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
@@ -0,0 +1,51 @@
+import math
+
+import pytest
+
+from quickforex.chunk_sizing import ChunkSizer
+
+
+def test_small_basket_uses_the_largest_chunks():
+    sizer = ChunkSizer(max_days=366)
+    assert sizer.chunk_days(366, symbols_count=1, max_concurrency=4) == 366
+    assert sizer.chunk_days(1000, symbols_count=1, max_concurrency=4) == 334
+
+
+def test_large_basket_is_split_across_concurrent_requests():
+    sizer = ChunkSizer(max_days=366)
+    chunk_days = sizer.chunk_days(366, symbols_count=200, max_concurrency=4)
+    assert chunk_days < 366
+    assert math.ceil(366 / chunk_days) <= 4
+
+
+@pytest.mark.parametrize("days", [1, 2, 365, 366, 367, 5000])
+@pytest.mark.parametrize("symbols_count", [1, 30, 1000])
+def test_chunks_never_exceed_the_provider_limit(days: int, symbols_count: int):
+    sizer = ChunkSizer(max_days=366)
+    chunk_days = sizer.chunk_days(days, symbols_count, max_concurrency=4)
+    assert 1 <= chunk_days <= min(days, 366)
+
+
+def test_latency_model_is_fitted_on_observations():
+    sizer = ChunkSizer(decay=0.9)
+    for rates_count in [100, 1000, 10000] * 30:
+        size = rates_count * 40
+        sizer.observe(rates_count, size, 0.5 + 1e-5 * size)
+    overhead, rate_latency = sizer.latency_model()
+    assert overhead == pytest.approx(0.5, rel=0.05)
+    assert rate_latency == pytest.approx(40 * 1e-5, rel=0.05)
+
+
+def test_observations_shift_the_chunk_size():
+    def observed_sizer(byte_latency: float) -> ChunkSizer:
+        sizer = ChunkSizer(max_days=366)
+        for rates_count in [500, 5000, 50000] * 30:
+            size = rates_count * 20
+            sizer.observe(rates_count, size, 0.3 + byte_latency * size)
+        return sizer
+
+    baseline = ChunkSizer(max_days=366).chunk_days(1095, 10, max_concurrency=4)
+    fast_transfer = observed_sizer(1e-8).chunk_days(366, 50, max_concurrency=4)
+    slow_transfer = observed_sizer(1e-5).chunk_days(1095, 10, max_concurrency=4)
+    assert fast_transfer == 366
+    assert slow_transfer < baseline
@@ -0,0 +1,173 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from quickforex.concurrency import (
+    BoundedExecutor,
+    SingleFlight,
+    gather_bounded,
+    iter_prefetched,
+    aiter_prefetched,
+)
+from quickforex.deadline import DeadlineExceededError, deadline_scope
+
+
+@pytest.mark.parametrize("max_workers", [0, 1, 3])
+def test_bounded_executor_map_preserves_order(max_workers: int):
+    executor = BoundedExecutor(max_workers)
+    assert executor.map(lambda x: x * 2, range(10)) == [x * 2 for x in range(10)]
+    executor.shutdown()
+
+
+def test_bounded_executor_map_raises_first_error():
+    def fn(x: int) -> int:
+        if x in {3, 5}:
+            raise ValueError(str(x))
+        return x
+
+    executor = BoundedExecutor(4)
+    with pytest.raises(ValueError, match="3"):
+        executor.map(fn, range(10))
+    executor.shutdown()
+
+
+def test_bounded_executor_limits_concurrency():
+    lock = threading.Lock()
+    state = {"running": 0, "max_running": 0}
+    barrier = threading.Barrier(2)
+
+    def fn(_):
+        with lock:
+            state["running"] += 1
+            state["max_running"] = max(state["max_running"], state["running"])
+        barrier.wait(timeout=5)
+        with lock:
+            state["running"] -= 1
+
+    executor = BoundedExecutor(2)
+    executor.map(fn, range(6))
+    executor.shutdown()
+    assert state["max_running"] == 2
+
+
+def test_gather_bounded():
+    state = {"running": 0, "max_running": 0}
+
+    async def task(x: int) -> int:
+        state["running"] += 1
+        state["max_running"] = max(state["max_running"], state["running"])
+        await asyncio.sleep(0.01)
+        state["running"] -= 1
+        return x
+
+    results = asyncio.run(gather_bounded((task(x) for x in range(10)), 3))
+    assert results == list(range(10))
+    assert state["max_running"] == 3
+
+
+def run_concurrently(count: int, fn) -> list:
+    outcomes = [None] * count
+
+    def run(index: int) -> None:
+        try:
+            outcomes[index] = fn()
+        except Exception as e:
+            outcomes[index] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+
+def test_single_flight_shares_result():
+    single_flight = SingleFlight()
+    calls = []
+
+    def fn() -> object:
+        calls.append(None)
+        time.sleep(0.1)
+        return object()
+
+    outcomes = run_concurrently(20, lambda: single_flight.do("key", fn))
+    assert len(calls) == 1
+    assert all(outcome is outcomes[0] for outcome in outcomes)
+    assert single_flight.in_flight() == 0
+    single_flight.do("key", fn)
+    assert len(calls) == 2
+
+
+def test_single_flight_shares_error():
+    single_flight = SingleFlight()
+    calls = []
+
+    def fn() -> None:
+        calls.append(None)
+        time.sleep(0.1)
+        raise ValueError("failed")
+
+    outcomes = run_concurrently(20, lambda: single_flight.do("key", fn))
+    assert len(calls) == 1
+    assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+    assert single_flight.in_flight() == 0
+
+
+def test_single_flight_waiter_deadline():
+    single_flight = SingleFlight()
+    leader = threading.Thread(
+        target=single_flight.do, args=("key", lambda: time.sleep(0.5))
+    )
+    leader.start()
+    time.sleep(0.05)
+    with deadline_scope(0.05):
+        with pytest.raises(DeadlineExceededError):
+            single_flight.do("key", lambda: None)
+    leader.join()
+
+
+@pytest.mark.parametrize("max_ahead", [0, 1, 3])
+def test_iter_prefetched_bounds_lookahead(max_ahead: int):
+    started = []
+    lock = threading.Lock()
+
+    def task(x: int) -> int:
+        with lock:
+            started.append(x)
+        return x * 2
+
+    results = []
+    for result in iter_prefetched(task, range(10), max_ahead):
+        time.sleep(0.01)
+        with lock:
+            assert len(started) <= len(results) + 1 + max_ahead
+        results.append(result)
+    assert results == [x * 2 for x in range(10)]
+
+
+def test_iter_prefetched_close_cancels_pending_tasks():
+    started = []
+    iterator = iter_prefetched(started.append, range(100), max_ahead=2)
+    next(iterator)
+    iterator.close()
+    assert len(started) <= 4
+
+
+def test_aiter_prefetched():
+    state = {"running": 0, "max_running": 0}
+
+    async def task(x: int) -> int:
+        state["running"] += 1
+        state["max_running"] = max(state["max_running"], state["running"])
+        await asyncio.sleep(0.01)
+        state["running"] -= 1
+        return x
+
+    async def run():
+        return [x async for x in aiter_prefetched(task, range(10), 3)]
+
+    assert asyncio.run(run()) == list(range(10))
+    assert state["max_running"] == 3
@@ -1,7 +1,11 @@
 from datetime import date, timedelta
+import dataclasses
+import pickle
+import copy
 
 import pytest
 
+from quickforex import domain
 from quickforex.domain import CurrencyPair, DateRange
 
 
@@ -60,6 +64,13 @@ def test_parse_currency_pair_bad_inputs(bad_pair_str):
         CurrencyPair.parse(bad_pair_str)
 
 
+def test_parse_currency_pair_is_memoized():
+    assert CurrencyPair.parse("EUR/NOK") is CurrencyPair.parse("EUR/NOK")
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            CurrencyPair.parse("EUR/NOK/USD")
+
+
 @pytest.mark.parametrize(
     "start_date,end_date",
     [(yesterday, today), (today, today + timedelta(days=365)), (today, today)],
@@ -94,3 +105,78 @@ def test_iter_date_range(date_range: DateRange):
     assert len(all_dates) == (date_range.end_date - date_range.start_date).days + 1
     for i in range(len(all_dates) - 1):
         assert all_dates[i] + timedelta(days=1) == all_dates[i + 1]
+
+
+@pytest.mark.parametrize("days", [1, 2, 7, 365, 1000])
+def test_date_range_chunks(days: int):
+    date_range = DateRange(date(2020, 1, 1), date(2021, 12, 31))
+    chunks = list(date_range.chunks(days))
+    assert chunks[0].start_date == date_range.start_date
+    assert chunks[-1].end_date == date_range.end_date
+    assert all(len(chunk) == days for chunk in chunks[:-1])
+    assert 0 < len(chunks[-1]) <= days
+    assert [dt for chunk in chunks for dt in chunk] == list(date_range)
+    with pytest.raises(ValueError):
+        next(date_range.chunks(0))
+
+
+def test_currency_pairs_are_interned():
+    pair = CurrencyPair("EUR", "USD")
+    assert CurrencyPair(domestic="EUR", foreign="USD") is pair
+    assert CurrencyPair.interned("EUR", "USD") is pair
+    assert CurrencyPair.parse("EURUSD") is pair
+    assert pair.reversed().reversed() is pair
+    assert pickle.loads(pickle.dumps(pair)) is pair
+    assert copy.deepcopy(pair) is pair
+    assert len({pair, CurrencyPair("EUR", "USD"), CurrencyPair("USD", "EUR")}) == 2
+
+
+def test_currency_pairs_are_compared_by_value(monkeypatch):
+    monkeypatch.setattr(
+        domain, "MAX_INTERNED_CURRENCY_PAIRS", len(domain._INTERNED_CURRENCY_PAIRS)
+    )
+    pair = CurrencyPair("CHF", "NZD")
+    same_pair = CurrencyPair("CHF", "NZD")
+    assert pair is not same_pair
+    assert pair == same_pair
+    assert hash(pair) == hash(same_pair) == hash(("CHF", "NZD"))
+    assert pair != CurrencyPair("NZD", "CHF")
+    assert ("CHF", "NZD") not in domain._INTERNED_CURRENCY_PAIRS
+
+
+def test_value_objects_are_dataclasses():
+    pair = CurrencyPair("EUR", "USD")
+    assert [field.name for field in dataclasses.fields(pair)] == ["domestic", "foreign"]
+    assert dataclasses.asdict(pair) == {"domestic": "EUR", "foreign": "USD"}
+    assert dataclasses.replace(pair, foreign="GBP") is CurrencyPair("EUR", "GBP")
+    date_range = DateRange(date(2021, 1, 1), date(2021, 1, 31))
+    assert dataclasses.astuple(date_range) == (date(2021, 1, 1), date(2021, 1, 31))
+    assert dataclasses.replace(date_range, end_date=date(2021, 1, 2)) == DateRange(
+        date(2021, 1, 1), date(2021, 1, 2)
+    )
+    with pytest.raises(ValueError):
+        dataclasses.replace(date_range, end_date=date(2020, 1, 1))
+
+
+def test_currency_pair_is_immutable():
+    pair = CurrencyPair("EUR", "USD")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        pair.domestic = "GBP"
+    with pytest.raises(AttributeError):
+        pair.__dict__
+    assert repr(pair) == "CurrencyPair(domestic='EUR', foreign='USD')"
+
+
+def test_date_range_value_semantics():
+    date_range = DateRange(date(2021, 1, 1), date(2021, 1, 31))
+    same_range = DateRange(start_date=date(2021, 1, 1), end_date=date(2021, 1, 31))
+    assert date_range == same_range
+    assert hash(date_range) == hash(same_range)
+    assert date_range != DateRange(date(2021, 1, 1), date(2021, 1, 30))
+    assert pickle.loads(pickle.dumps(date_range)) == date_range
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        date_range.end_date = date(2021, 2, 1)
+    assert (
+        repr(date_range)
+        == "DateRange(start_date=datetime.date(2021, 1, 1), end_date=datetime.date(2021, 1, 31))"
+    )
@@ -0,0 +1,44 @@
+import time
+
+from quickforex.http_cache import DiskCache, NEVER_EXPIRES, make_cache_key
+
+
+def test_make_cache_key_ignores_params_order():
+    assert make_cache_key("url", {"a": 1, "b": "2"}) == make_cache_key(
+        "url", {"b": 2, "a": "1"}
+    )
+    assert make_cache_key("url", {"a": 1}) != make_cache_key("url", {"a": 2})
+    assert make_cache_key("url1", None) != make_cache_key("url2", None)
+
+
+def test_disk_cache_get_put(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    assert cache.get("key") is None
+    cache.put("key", {"rates": {"USD": 1.1}})
+    assert cache.get("key") == {"rates": {"USD": 1.1}}
+    assert DiskCache(str(tmp_path)).get("key") == {"rates": {"USD": 1.1}}
+
+
+def test_disk_cache_expiry(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.put("expired", "payload", ttl=-1.0)
+    cache.put("alive", "payload", ttl=60.0)
+    cache.put("immutable", "payload", ttl=NEVER_EXPIRES)
+    assert cache.get("expired") is None
+    assert cache.get("alive") == "payload"
+    assert cache.get("immutable") == "payload"
+
+
+def test_disk_cache_evicts_least_recently_used_entries(tmp_path):
+    payload = "x" * 1000
+    cache = DiskCache(str(tmp_path), max_size_bytes=3500)
+    for key in ["k0", "k1", "k2"]:
+        cache.put(key, payload)
+        time.sleep(0.01)
+    cache.get("k0")
+    time.sleep(0.01)
+    cache.put("k3", payload)
+    assert cache.size_bytes <= 3500
+    assert cache.get("k1") is None
+    assert cache.get("k0") == payload
+    assert cache.get("k3") == payload
@@ -0,0 +1,80 @@
+import subprocess
+import sys
+
+import pytest
+
+
+# Maximum cumulative time (in microseconds) spent importing quickforex, as reported by
+# 'python -X importtime' (best of 3 runs). The import takes about 50ms on a recent machine, or
+# about 175ms when the providers and their dependencies are imported eagerly.
+IMPORT_TIME_BUDGET_US = 120_000
+
+
+def _run_python(code: str, *options: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _imported_modules(code: str) -> set[str]:
+    output = _run_python(f"{code}\nimport sys\nprint(' '.join(sys.modules))").stdout
+    return set(output.split())
+
+
+def _cumulative_import_time_us(module: str) -> int:
+    output = _run_python(f"import {module}", "-X", "importtime").stderr
+    for line in output.splitlines():
+        # import time: self [us] | cumulative | imported package
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1])
+    raise AssertionError(f"'{module}' not found in the import time report")
+
+
+@pytest.mark.parametrize("module", ["quickforex", "quickforex.command_line"])
+def test_import_does_not_load_providers(module: str):
+    imported = _imported_modules(f"import {module}")
+    for heavy_module in [
+        "requests",
+        "aiohttp",
+        "asyncio",
+        "quickforex.http_requester",
+        "quickforex.providers.exchangerate_host",
+        "quickforex.providers.sqlite_store",
+    ]:
+        assert heavy_module not in imported
+
+
+def test_providers_are_loaded_on_first_use():
+    imported = _imported_modules(
+        "import quickforex\n"
+        "from quickforex.providers import factory\n"
+        "assert factory.provider_exists('routing')\n"
+        "assert quickforex.get_default_provider_type().identifier == 'exchangerate.host'\n"
+        "assert quickforex.CachingProvider.identifier == 'caching'\n"
+        "assert quickforex.RoutingProvider.identifier == 'routing'\n"
+        "assert quickforex.DummyProvider.identifier == 'dummy'"
+    )
+    assert "quickforex.providers.routing" in imported
+    assert "quickforex.providers.dummy" in imported
+    assert "quickforex.providers.exchangerate_host" in imported
+    assert "quickforex.providers.caching" in imported
+    assert "quickforex.providers.sqlite_store" not in imported
+
+
+def test_import_time_budget():
+    import_time_us = min(_cumulative_import_time_us("quickforex") for _ in range(3))
+    assert import_time_us <= IMPORT_TIME_BUDGET_US
+
+
+def test_providers_are_exported_by_both_packages():
+    import quickforex
+    import quickforex.providers
+
+    assert quickforex._LAZY_PROVIDER_EXPORTS == set(quickforex.providers._LAZY_EXPORTS)
+    for name in quickforex._LAZY_PROVIDER_EXPORTS:
+        assert name in quickforex.__all__
+        assert getattr(quickforex, name) is getattr(quickforex.providers, name)
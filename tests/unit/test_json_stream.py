@@ -0,0 +1,107 @@
+import json
+
+import pytest
+
+from quickforex.json_stream import StreamedObjectParser
+
+
+DOCUMENT = {
+    "success": True,
+    "base": "EUR",
+    "rates": {
+        "2021-01-01": {"USD": 1.217582, "GBP": 0.89, "JPY": 125},
+        "2021-01-02": {"USD": 1.5e-05, "GBP": -0.5, "JPY": None},
+        "2021-01-03": {},
+    },
+    "motd": {"msg": "café €", "values": [1, 2.5, "x"]},
+}
+
+
+def parse(chunks: list[bytes], stream_key: str = "rates", **kwargs):
+    entries = []
+    parser = StreamedObjectParser(
+        stream_key, lambda key, value: entries.append((key, value)), **kwargs
+    )
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.close(), entries
+
+
+def split(data: bytes, size: int) -> list[bytes]:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 20])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_streamed_members_are_reported_in_order(chunk_size: int, indent):
+    data = json.dumps(DOCUMENT, indent=indent).encode()
+    payload, entries = parse(split(data, chunk_size))
+    assert entries == list(DOCUMENT["rates"].items())
+    assert payload == {key: DOCUMENT[key] for key in DOCUMENT if key != "rates"}
+
+
+def test_streamed_members_are_decoded_with_decoder():
+    data = json.dumps(DOCUMENT).encode()
+    _, entries = parse(split(data, 5), decoder=json.JSONDecoder(parse_float=str))
+    assert entries[0] == ("2021-01-01", {"USD": "1.217582", "GBP": "0.89", "JPY": 125})
+
+
+@pytest.mark.parametrize(
+    "chunks, count",
+    [
+        ([b'{"rates": {}, "count": 12', b"34}"], 1234),
+        ([b'{"rates": {}, "count": 1.', b"5}"], 1.5),
+        ([b'{"rates": {}, "count": 2e', b"-3", b"}"], 2e-3),
+    ],
+)
+def test_top_level_number_split_across_chunks(chunks: list[bytes], count):
+    payload, entries = parse(chunks)
+    assert payload == {"count": count}
+    assert entries == []
+
+
+def test_stream_key_which_is_not_an_object():
+    payload, entries = parse([b'{"rates": null, "nested": {"rates": {"a": 1}}}'])
+    assert payload == {"rates": None, "nested": {"rates": {"a": 1}}}
+    assert entries == []
+
+
+@pytest.mark.parametrize(
+    "data",
+    [b"", b'{"rates": {"a": 1}', b'{"rates": {"a": 1}}}', b"[1, 2]", b'{"a" 1}'],
+)
+def test_invalid_documents_are_rejected(data: bytes):
+    with pytest.raises(json.JSONDecodeError):
+        parse(split(data, 3))
+
+
+class CountingDecoder(json.JSONDecoder):
+    def __init__(self):
+        super().__init__()
+        self.decoded_chars = 0
+
+    def raw_decode(self, s, idx=0):
+        self.decoded_chars += len(s) - idx
+        return super().raw_decode(s, idx)
+
+
+def test_values_spanning_chunks_are_decoded_once():
+    motd = {"msg": 'a "quoted" {brace} \\ [bracket]', "values": list(range(2000))}
+    data = json.dumps({"rates": {"a": motd}, "motd": motd}).encode()
+    decoder = CountingDecoder()
+    payload, entries = parse(split(data, 3), decoder=decoder)
+    assert payload == {"motd": motd}
+    assert entries == [("a", motd)]
+    # Each value is decoded once its end is received (and tried once with its first chunk)
+    assert decoder.decoded_chars < 3 * len(data)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5])
+def test_escapes_and_nesting_split_across_chunks(chunk_size: int):
+    document = {
+        "motd": ['\\"}]', {"a": ["{", "]", {"b": "\\\\"}]}, "\\", "é "],
+        "count": -12.5e-3,
+        "ok": False,
+    }
+    payload, _ = parse(split(json.dumps(document).encode(), chunk_size))
+    assert payload == document
@@ -0,0 +1,34 @@
+import time
+
+from quickforex.memory_cache import LruCache
+
+
+def test_lru_cache_get_put():
+    cache = LruCache(max_entries=10)
+    assert cache.get("key") is None
+    assert cache.get("key", default=0) == 0
+    cache.put("key", 1)
+    assert cache.get("key") == 1
+    assert cache.hits == 1
+    assert cache.misses == 2
+
+
+def test_lru_cache_expiry():
+    cache = LruCache(max_entries=10)
+    cache.put("short", 1, ttl=0.01)
+    cache.put("long", 2, ttl=60)
+    time.sleep(0.02)
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+    assert len(cache) == 1
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LruCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
@@ -0,0 +1,61 @@
+from decimal import Decimal
+
+import pytest
+
+from quickforex.errors import QuickForexError
+from quickforex.numeric import NumericMode, rate_converter, rate_parser
+
+
+@pytest.mark.parametrize(
+    "mode_str,expected",
+    [
+        ("decimal", NumericMode.DECIMAL),
+        ("Float", NumericMode.FLOAT),
+        (" int64 ", NumericMode.INT64),
+    ],
+)
+def test_parse_numeric_mode(mode_str: str, expected: NumericMode):
+    assert NumericMode.parse(mode_str) is expected
+
+
+def test_parse_invalid_numeric_mode():
+    with pytest.raises(QuickForexError):
+        NumericMode.parse("float32")
+
+
+@pytest.mark.parametrize(
+    "numeric_mode,rate,expected",
+    [
+        (NumericMode.DECIMAL, 1.25, Decimal("1.25")),
+        (NumericMode.FLOAT, Decimal("1.25"), 1.25),
+        (NumericMode.INT64, 1.234567, 1234567),
+        (NumericMode.INT64, Decimal("0.000001"), 1),
+        (NumericMode.INT64, 1234567, 1234567),
+    ],
+)
+def test_rate_converter(numeric_mode: NumericMode, rate, expected):
+    converted = rate_converter(numeric_mode, 6)(rate)
+    assert converted == expected
+    assert type(converted) is type(expected)
+    assert NumericMode.of(converted) is numeric_mode
+
+
+@pytest.mark.parametrize(
+    "numeric_mode,rate,expected",
+    [
+        (NumericMode.DECIMAL, "0.1", Decimal("0.1")),
+        (NumericMode.DECIMAL, 0.1, Decimal("0.1")),
+        (NumericMode.FLOAT, "1.25", 1.25),
+        (NumericMode.INT64, "1.234567", 1234567),
+        (NumericMode.INT64, "-0.5", -500000),
+        (NumericMode.INT64, "2", 2000000),
+        (NumericMode.INT64, 2, 2000000),
+        (NumericMode.INT64, "1.5e-05", 15),
+        (NumericMode.INT64, "1.2345675", 1234568),
+        (NumericMode.INT64, 0.25, 250000),
+    ],
+)
+def test_rate_parser(numeric_mode: NumericMode, rate, expected):
+    parsed = rate_parser(numeric_mode, 6)(rate)
+    assert parsed == expected
+    assert type(parsed) is type(expected)
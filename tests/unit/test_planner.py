@@ -0,0 +1,70 @@
+from datetime import date, timedelta
+
+import pytest
+
+from quickforex.domain import CurrencyPair, DateRange
+from quickforex.planner import CostModel, PlannedRequest, plan_requests
+
+
+EUR_USD = CurrencyPair("EUR", "USD")
+EUR_GBP = CurrencyPair("EUR", "GBP")
+USD_JPY = CurrencyPair("USD", "JPY")
+START_DATE = date(2021, 1, 1)
+
+
+def d(day: int) -> date:
+    return START_DATE + timedelta(days=day - 1)
+
+
+def test_plan_single_point():
+    assert plan_requests([(EUR_USD, d(1))]) == [
+        PlannedRequest(frozenset({EUR_USD}), DateRange(d(1), d(1)))
+    ]
+
+
+def test_plan_merges_close_dates_into_time_series():
+    points = [(EUR_USD, d(day)) for day in range(1, 31, 3)] + [(EUR_GBP, d(15))]
+    requests = plan_requests(points)
+    assert requests == [
+        PlannedRequest(frozenset({EUR_USD, EUR_GBP}), DateRange(d(1), d(28)))
+    ]
+    assert requests[0].is_time_series
+
+
+def test_plan_groups_points_by_base_currency():
+    requests = plan_requests([(EUR_USD, d(1)), (USD_JPY, d(1)), (EUR_GBP, d(1))])
+    assert requests == [
+        PlannedRequest(frozenset({EUR_USD, EUR_GBP}), DateRange(d(1), d(1))),
+        PlannedRequest(frozenset({USD_JPY}), DateRange(d(1), d(1))),
+    ]
+
+
+@pytest.mark.parametrize(
+    "cost_model,expected_ranges",
+    [
+        (CostModel(), [DateRange(d(1), d(300))]),
+        (CostModel(rate_cost=0.01), [DateRange(d(1), d(1)), DateRange(d(300), d(300))]),
+        (
+            CostModel(max_window_days=100),
+            [DateRange(d(1), d(1)), DateRange(d(300), d(300))],
+        ),
+    ],
+)
+def test_plan_follows_cost_model(cost_model: CostModel, expected_ranges):
+    requests = plan_requests([(EUR_USD, d(1)), (EUR_USD, d(300))], cost_model)
+    assert [request.date_range for request in requests] == expected_ranges
+
+
+def test_plan_is_cheapest_partition():
+    cost_model = CostModel(rate_cost=0.05)
+    points = [(EUR_USD, d(day)) for day in [1, 2, 3, 4, 40, 80, 81, 82, 200]]
+    requests = plan_requests(points, cost_model)
+    assert [request.date_range for request in requests] == [
+        DateRange(d(1), d(4)),
+        DateRange(d(40), d(40)),
+        DateRange(d(80), d(82)),
+        DateRange(d(200), d(200)),
+    ]
+    assert sum(request.cost(cost_model) for request in requests) == pytest.approx(
+        4 + 0.05 * (4 + 1 + 3 + 1)
+    )
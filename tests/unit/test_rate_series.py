@@ -0,0 +1,134 @@
+from array import array
+from datetime import date, timedelta
+from decimal import Decimal
+import pickle
+import math
+
+import pytest
+
+from quickforex.domain import DateRange
+from quickforex.numeric import NumericMode
+from quickforex.rate_series import RateSeries, RateSeriesBuilder
+
+
+START_DATE = date(2021, 1, 1)
+
+
+def d(day: int) -> date:
+    return START_DATE + timedelta(days=day - 1)
+
+
+@pytest.fixture
+def series() -> RateSeries:
+    builder = RateSeriesBuilder(DateRange(d(1), d(10)))
+    for day in [1, 2, 3, 5, 8, 10]:
+        builder.set(d(day), Decimal(day) / 4)
+    builder.set(d(11), 1.0)
+    return builder.build()
+
+
+def test_rate_series_mapping(series: RateSeries):
+    assert len(series) == 6
+    assert list(series) == [d(1), d(2), d(3), d(5), d(8), d(10)]
+    assert series[d(5)] == Decimal("1.25")
+    assert d(4) not in series and d(5) in series and d(11) not in series
+    assert series.get(d(4)) is None
+    with pytest.raises(KeyError):
+        series[d(0)]
+    assert series == {dt: Decimal(dt.day) / 4 for dt in series}
+    assert {dt: Decimal(dt.day) / 4 for dt in series} == series
+    assert dict(series.items()) == {dt: Decimal(dt.day) / 4 for dt in series}
+
+
+def test_rate_series_buffers(series: RateSeries):
+    assert series.date_range == DateRange(d(1), d(10))
+    assert len(series.buffer) == len(series.mask) == 10
+    assert series.buffer.readonly and series.mask.readonly
+    assert series.buffer[4] == 1.25
+    assert math.isnan(series.buffer[3])
+    assert list(series.mask) == [1, 1, 1, 0, 1, 0, 0, 1, 0, 1]
+
+
+@pytest.mark.parametrize(
+    "date_range,expected_range,expected_dates",
+    [
+        (DateRange(d(2), d(5)), DateRange(d(2), d(5)), [d(2), d(3), d(5)]),
+        (DateRange(d(-5), d(2)), DateRange(d(1), d(2)), [d(1), d(2)]),
+        (DateRange(d(9), d(20)), DateRange(d(9), d(10)), [d(10)]),
+        (DateRange(d(6), d(7)), DateRange(d(6), d(7)), []),
+    ],
+)
+def test_rate_series_slicing(
+    series: RateSeries,
+    date_range: DateRange,
+    expected_range: DateRange,
+    expected_dates: list[date],
+):
+    sliced = series[date_range]
+    assert sliced.date_range == expected_range
+    assert list(sliced) == expected_dates
+    assert all(sliced[dt] == series[dt] for dt in expected_dates)
+    assert sliced.buffer.obj is series.buffer.obj
+
+
+def test_rate_series_from_buffer():
+    values = array("d", [1.0, 2.0, 3.0])
+    series = RateSeries(START_DATE, values)
+    assert series == {d(1): 1, d(2): 2, d(3): 3}
+    with pytest.raises(TypeError):
+        RateSeries(START_DATE, array("f", [1.0]))
+    with pytest.raises(ValueError):
+        RateSeries(START_DATE, values, b"\x01")
+
+
+def test_rate_series_pickle(series: RateSeries):
+    assert pickle.loads(pickle.dumps(series)) == series
+
+
+def test_rate_series_to_numpy(series: RateSeries):
+    numpy = pytest.importorskip("numpy")
+    values = series.to_numpy()
+    assert values.shape == (10,)
+    assert numpy.shares_memory(values, numpy.frombuffer(series.buffer))
+    assert numpy.isnan(values).sum() == 4
+
+
+def test_rate_series_int64_mode():
+    builder = RateSeriesBuilder(
+        DateRange(d(1), d(3)), NumericMode.INT64, decimal_places=4
+    )
+    builder.set(d(1), Decimal("1.2345"))
+    builder.set(d(3), 0.5)
+    series = builder.build()
+    assert series.numeric_mode is NumericMode.INT64
+    assert series == {d(1): 12345, d(3): 5000}
+    assert series.buffer.format == "q"
+    assert series[DateRange(d(2), d(3))].numeric_mode is NumericMode.INT64
+    assert pickle.loads(pickle.dumps(series)) == series
+    assert RateSeries.from_rates(DateRange(d(1), d(3)), series).decimal_places == 4
+    with pytest.raises(TypeError):
+        RateSeries(START_DATE, array("d", [1.0]), numeric_mode=NumericMode.INT64)
+
+
+def test_rate_series_float_mode():
+    series = RateSeries.from_rates(DateRange(d(1), d(2)), {d(1): 0.5, d(2): 2.0})
+    assert series.numeric_mode is NumericMode.FLOAT
+    assert series == {d(1): 0.5, d(2): 2.0}
+    assert all(type(rate) is float for rate in series.values())
+
+
+def test_rate_series_decimal_rates_are_exact():
+    builder = RateSeriesBuilder(DateRange(d(1), d(2)))
+    builder.set(d(1), Decimal("1.218917"))
+    builder.set_value(d(2).toordinal(), float("0.000123"))
+    series = builder.build()
+    assert str(series[d(1)]) == "1.218917"
+    assert series[d(2)] == Decimal("0.000123")
+    assert str(pickle.loads(pickle.dumps(series))[d(1)]) == "1.218917"
+
+
+def test_rate_series_builder_set_value():
+    builder = RateSeriesBuilder(DateRange(d(1), d(3)))
+    builder.set_value(d(2).toordinal(), 1.5)
+    builder.set_value(d(4).toordinal(), 2.0)
+    assert builder.build() == {d(2): Decimal("1.5")}
@@ -0,0 +1,89 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from quickforex.domain import CurrencyPair, DateRange
+from quickforex.rate_store import RateStore, find_missing_ranges, merge_ranges
+
+
+def d(day: int) -> date:
+    return date(2021, 1, day)
+
+
+@pytest.mark.parametrize(
+    "available_days,expected_ranges",
+    [
+        ([], [(1, 10)]),
+        (range(1, 11), []),
+        ([1, 2, 3], [(4, 10)]),
+        ([8, 9, 10], [(1, 7)]),
+        ([3, 4, 7], [(1, 2), (5, 6), (8, 10)]),
+        ([0, 11], [(1, 10)]),
+    ],
+)
+def test_find_missing_ranges(available_days, expected_ranges):
+    available_dates = [d(1) + timedelta(days=day - 1) for day in available_days]
+    assert find_missing_ranges(DateRange(d(1), d(10)), available_dates) == [
+        DateRange(d(start), d(end)) for start, end in expected_ranges
+    ]
+
+
+@pytest.mark.parametrize(
+    "ranges,max_days,expected_ranges",
+    [
+        ([], 10, []),
+        ([(1, 2), (5, 6), (8, 10)], 10, [(1, 10)]),
+        ([(8, 10), (1, 2), (5, 6)], 6, [(1, 6), (8, 10)]),
+        ([(1, 2), (5, 6)], 2, [(1, 2), (5, 6)]),
+        ([(1, 20), (22, 23)], 5, [(1, 20), (22, 23)]),
+    ],
+)
+def test_merge_ranges(ranges, max_days, expected_ranges):
+    assert merge_ranges(
+        [DateRange(d(start), d(end)) for start, end in ranges], max_days
+    ) == [DateRange(d(start), d(end)) for start, end in expected_ranges]
+
+
+def test_rate_store_coverage():
+    pair = CurrencyPair("EUR", "USD")
+    store = RateStore(":memory:")
+    store.put_rates(pair, {d(2): Decimal("1.1")}, DateRange(d(1), d(3)))
+    store.put_rates(pair, {}, DateRange(d(7), d(8)))
+    store.put_rates(pair, {d(10): Decimal("1.2")})
+    assert store.find_missing_ranges(pair, DateRange(d(1), d(12))) == [
+        DateRange(d(4), d(6)),
+        DateRange(d(9), d(9)),
+        DateRange(d(11), d(12)),
+    ]
+    # Overlapping and adjacent ranges are merged
+    store.put_rates(pair, {}, DateRange(d(4), d(5)))
+    store.put_rates(pair, {}, DateRange(d(6), d(7)))
+    assert store.get_covered_ranges(pair, DateRange(d(2), d(31))) == [
+        DateRange(d(2), d(8))
+    ]
+    assert store.find_missing_ranges(pair, DateRange(d(1), d(9))) == [
+        DateRange(d(9), d(9))
+    ]
+    assert store.find_missing_ranges(pair.reversed(), DateRange(d(1), d(2))) == [
+        DateRange(d(1), d(2))
+    ]
+
+
+def test_rate_store_roundtrip(tmp_path):
+    pair = CurrencyPair("EUR", "USD")
+    store = RateStore(str(tmp_path / "rates.sqlite3"))
+    store.put_rates(pair, {d(1): Decimal("1.123456"), d(3): Decimal("1.2")})
+    store.close()
+    store = RateStore(str(tmp_path / "rates.sqlite3"))
+    assert store.get_rates(pair, DateRange(d(1), d(5))) == {
+        d(1): Decimal("1.123456"),
+        d(3): Decimal("1.2"),
+    }
+    assert store.get_rate(pair, d(3)) == Decimal("1.2")
+    assert store.get_rate(pair, d(2)) is None
+    assert store.get_rate(pair.reversed(), d(1)) is None
+    assert store.find_missing_ranges(pair, DateRange(d(1), d(5))) == [
+        DateRange(d(2), d(2)),
+        DateRange(d(4), d(5)),
+    ]
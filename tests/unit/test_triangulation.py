@@ -0,0 +1,87 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from quickforex.domain import CurrencyPair
+from quickforex.triangulation import (
+    cross_rate,
+    pivot_symbols,
+    triangulate,
+    triangulate_time_series,
+)
+
+
+PIVOT_RATES = {
+    "USD": Decimal("1.2345678901"),
+    "GBP": Decimal("0.8765432101"),
+    "JPY": Decimal("130.1234567891"),
+    "BTC": Decimal("0.0000251234"),
+}
+
+
+def test_pivot_symbols():
+    pairs = [
+        CurrencyPair("EUR", "USD"),
+        CurrencyPair("GBP", "JPY"),
+        CurrencyPair("JPY", "GBP"),
+        CurrencyPair("CHF", "CHF"),
+    ]
+    assert pivot_symbols(pairs, "EUR") == ["GBP", "JPY", "USD"]
+
+
+@pytest.mark.parametrize(
+    "pair,expected_rate",
+    [
+        (CurrencyPair("EUR", "EUR"), Decimal("1.000000")),
+        (CurrencyPair("CHF", "CHF"), Decimal("1.000000")),
+        (CurrencyPair("EUR", "USD"), Decimal("1.234568")),
+        (CurrencyPair("USD", "EUR"), Decimal("0.810000")),
+        (CurrencyPair("GBP", "JPY"), Decimal("148.450704")),
+        (CurrencyPair("JPY", "GBP"), Decimal("0.006736")),
+    ],
+)
+def test_cross_rate(pair: CurrencyPair, expected_rate: Decimal):
+    assert cross_rate(pair, "EUR", PIVOT_RATES, 10, 6) == expected_rate
+
+
+@pytest.mark.parametrize(
+    "pair",
+    [
+        CurrencyPair("EUR", "CHF"),
+        CurrencyPair("CHF", "USD"),
+        CurrencyPair("BTC", "JPY"),
+    ],
+)
+def test_cross_rate_cannot_be_triangulated(pair: CurrencyPair):
+    assert cross_rate(pair, "EUR", PIVOT_RATES, 10, 6) is None
+
+
+def test_cross_rate_accuracy():
+    exact_usd, exact_gbp = Decimal(1) / 3, Decimal(2) / 7
+    quoted_rates = {"USD": round(exact_usd, 10), "GBP": round(exact_gbp, 10)}
+    rate = cross_rate(CurrencyPair("USD", "GBP"), "EUR", quoted_rates, 10, 6)
+    assert abs(rate - exact_gbp / exact_usd) <= Decimal("0.000001")
+
+
+def test_triangulate():
+    pairs = {CurrencyPair("USD", "GBP"), CurrencyPair("BTC", "GBP")}
+    rates, unresolved_pairs = triangulate(pairs, "EUR", PIVOT_RATES, 10, 6)
+    assert rates == {CurrencyPair("USD", "GBP"): Decimal("0.710000")}
+    assert unresolved_pairs == {CurrencyPair("BTC", "GBP")}
+
+
+def test_triangulate_time_series():
+    pairs = {CurrencyPair("EUR", "USD"), CurrencyPair("EUR", "GBP")}
+    pivot_series = {
+        date(2021, 1, 1): {"USD": Decimal("1.2"), "GBP": Decimal("0.9")},
+        date(2021, 1, 2): {"USD": Decimal("1.3")},
+    }
+    series, unresolved_pairs = triangulate_time_series(pairs, "EUR", pivot_series, 6, 6)
+    assert series == {
+        CurrencyPair("EUR", "USD"): {
+            date(2021, 1, 1): Decimal("1.200000"),
+            date(2021, 1, 2): Decimal("1.300000"),
+        }
+    }
+    assert unresolved_pairs == {CurrencyPair("EUR", "GBP")}
@@ -120,6 +120,24 @@ def test_parse_currency_pairs_args(args, expected):
     assert parse_currency_pairs_args(*args) == expected
 
 
+@pytest.mark.parametrize("collection_type", [set, frozenset, list])
+def test_parse_currency_pairs_args_normalized_collection(collection_type):
+    pairs = collection_type([CurrencyPair("EUR", "USD"), CurrencyPair("EUR", "GBP")])
+    parsed = parse_currency_pairs_args(pairs)
+    assert parsed == set(pairs)
+    assert parsed is not pairs
+    parsed.add(CurrencyPair("GBP", "JPY"))
+    assert len(pairs) == 2
+
+
+@pytest.mark.parametrize(
+    "bad_args", [([CurrencyPair("EUR", "USD"), 1],), ({"EUR/USD", "EURUS"},)]
+)
+def test_parse_currency_pairs_args_bad_inputs(bad_args):
+    with pytest.raises(ValueError):
+        parse_currency_pairs_args(*bad_args)
+
+
 @pytest.mark.parametrize(
     "kwargs,expected",
     [